@@ -1,86 +1,122 @@
 import pygame
 import time
 
+# Oyunun yayınladığı sinyaller. Her başarım sadece bağlı olduğu sinyallerde kontrol edilir.
+SIGNALS = ("kill", "money_changed", "purchase", "boss_killed", "shot_fired", "ulti_resolved", "healed")
+
 class Achievement:
-    def __init__(self, id, title, description, condition_func):
+    def __init__(self, id, title, description, signals, condition_func, deadline_func=None):
         self.id = id
         self.title = title
         self.description = description
+        self.signals = signals
         self.condition_func = condition_func
+        # Zamana bağlı başarımlar: koşulun en erken ne zaman (simülasyon saniyesi) sağlanabileceği
+        self.deadline_func = deadline_func
         self.unlocked = False
         self.unlock_time = 0
 
 class AchievementManager:
+    """Sinyal güdümlü başarım motoru.
+
+    Başarımlar bağlı oldukları sinyallere göre indekslenir; oyun bir sinyal yayınladığında
+    (emit) sadece o sinyale bağlı, henüz açılmamış başarımlar kontrol edilir. Açılan başarım
+    indeksten çıkar. Zamana bağlı koşullar (ör. 60 sn ateş etmeme) duvar saati yerine oyunun
+    simülasyon zamanını (game.run_time, duraklatmada ilerlemez) kullanır: sinyal geldiğinde
+    bir sonraki kontrol anı hesaplanır, update() karede sadece en yakın anı karşılaştırır.
+    """
     def __init__(self):
         self.achievements = []
+        self.by_signal = {signal: [] for signal in SIGNALS}
+        self.deadlines = {} # başarım -> kontrol edileceği simülasyon zamanı
+        self.next_deadline = float("inf")
         self.queue = [] 
         self.notification_duration = 3
         
         # --- BAŞARIMLAR ---
-        self.add("first_blood", "ACEMİ AVCI", "İlk düşmanını yok et.", 
+        self.add("first_blood", "ACEMİ AVCI", "İlk düşmanını yok et.", ("kill", "ulti_resolved"),
                  lambda game: game.kill_counter >= 1)
         
-        self.add("sniper_elite", "SABIRLI SAVAŞÇI", "1000 skor yap.",
+        self.add("sniper_elite", "SABIRLI SAVAŞÇI", "1000 skor yap.", ("kill", "boss_killed", "ulti_resolved", "healed"),
                  lambda game: game.score >= 1000 and game.player.hp >= game.player.max_hp)
         
-        self.add("money_maker", "PARA BABASI", "Cüzdanında 1000$ biriktir.",
+        self.add("money_maker", "PARA BABASI", "Cüzdanında 1000$ biriktir.", ("money_changed",),
                  lambda game: game.money >= 1000)
         
-        self.add("combo_master", "KOMBO USTASI", "25x Kombo yap.",
+        self.add("combo_master", "KOMBO USTASI", "25x Kombo yap.", ("kill",),
                  lambda game: game.combo_count >= 25)
         
         # KIL PAYI (Near Death Experience)
         # Şart: Canın %20'nin altındayken Boss'u yok et.
-        # Mantık: Boss yeni öldüyse (flag) ve Can < MaxCan * 0.20 ise
-        self.add("near_death", "KIL PAYI", "Canın %20 altındayken Boss yok et.",
-                 lambda game: getattr(game, 'boss_just_killed', False) and \
-                              game.player.hp < (game.player.max_hp * 0.20))
+        self.add("near_death", "KIL PAYI", "Canın %20 altındayken Boss yok et.", ("boss_killed",),
+                 lambda game: game.player.hp < (game.player.max_hp * 0.20))
 
         # PASİFİST (Pacifist)
         # Şart: 60 saniye boyunca hiç ateş etmeden hayatta kal.
-        # Mantık: Oyun zamanı - Son ateş zamanı > 60
-        self.add("pacifist", "PASİFİST", "60sn boyunca ateş etmeden hayatta kal.",
-                 lambda game: (time.time() - getattr(game, 'last_shot_time', time.time())) > 60)
+        # Mantık: Her atışta kontrol anı 60 sn ileri kayar; süre simülasyon zamanıyla ölçülür
+        self.add("pacifist", "PASİFİST", "60sn boyunca ateş etmeden hayatta kal.", ("shot_fired",),
+                 lambda game: game.run_time - game.last_shot_time >= 60,
+                 lambda game: game.last_shot_time + 60)
 
         # ULTİ USTASI (Ulti Master)
         # Şart: Tek bir ulti ile 5 veya daha fazla düşmanı yok et.
-        # Mantık: Son ulti ile öldürülen > 5
-        self.add("ulti_master", "ULTİ USTASI", "Tek Ulti ile 5+ düşman yok et.",
-                 lambda game: getattr(game, 'last_ulti_kill_count', 0) >= 5)
+        self.add("ulti_master", "ULTİ USTASI", "Tek Ulti ile 5+ düşman yok et.", ("ulti_resolved",),
+                 lambda game: game.last_ulti_kill_count >= 5)
 
         # TAM TEÇHİZAT (Fully Loaded)
         # Şart: Double Shot, Drone ve Füzelerin hepsi açık olsun.
-        self.add("fully_loaded", "TAM TEÇHİZAT", "Tüm silah sistemlerini satın al.",
+        self.add("fully_loaded", "TAM TEÇHİZAT", "Tüm silah sistemlerini satın al.", ("purchase",),
                  lambda game: game.stats['double_shot'] and game.stats['has_drone'] and game.stats['has_missiles'])
 
         # IŞIK HIZI (Light Speed)
         # Şart: Hız geliştirmesini 5. seviyeye (veya belli bir değere) çıkar.
-        self.add("light_speed", "IŞIK HIZI", "Hızını maksimum seviyeye çıkar.",
+        self.add("light_speed", "IŞIK HIZI", "Hızını maksimum seviyeye çıkar.", ("purchase",),
                  lambda game: game.stats['upgrade_speed'] >= 5) # 5 kez satın alınca
 
         # SİBER MİLYONER (Cyber Millionaire)
         # Şart: 5000$ biriktir. (Para Babası'nın bir üstü)
-        self.add("cyber_millionaire", "SİBER MİLYONER", "Cüzdanında 5000$ biriktir.",
+        self.add("cyber_millionaire", "SİBER MİLYONER", "Cüzdanında 5000$ biriktir.", ("money_changed",),
                  lambda game: game.money >= 5000)
 
 
-    def add(self, id, title, desc, condition):
-        self.achievements.append(Achievement(id, title, desc, condition))
+    def add(self, id, title, desc, signals, condition, deadline=None):
+        ach = Achievement(id, title, desc, signals, condition, deadline)
+        self.achievements.append(ach)
+        for signal in signals: self.by_signal[signal].append(ach)
 
-    def update(self, game):
+    def start(self, game):
+        """Oyun başında (kayıt yüklendikten sonra): indeksi kurar, tüm koşulları bir kez kontrol eder."""
+        for signal in SIGNALS: self.by_signal[signal] = [a for a in self.achievements if signal in a.signals and not a.unlocked]
+        self.deadlines = {}
         for ach in self.achievements:
-            if not ach.unlocked:
-                try:
-                    if ach.condition_func(game):
-                        self.unlock(ach, game)
-                except Exception as e:
-                    # Hata olursa sessizce geçer oyun çökmez
-                    pass
+            if not ach.unlocked: self.check(ach, game)
+        self.next_deadline = min(self.deadlines.values(), default=float("inf"))
+
+    def emit(self, signal, game):
+        """Sinyali yayınlar: sadece bu sinyale bağlı kilitli başarımlar kontrol edilir."""
+        waiting = self.by_signal[signal]
+        if not waiting: return
+        for ach in list(waiting):
+            if not ach.unlocked: self.check(ach, game)
+        self.next_deadline = min(self.deadlines.values(), default=float("inf"))
+
+    def update(self, game):
+        """Karede bir kez: sadece zamanı gelmiş zamanlı başarımlar kontrol edilir."""
+        if game.run_time < self.next_deadline: return
+        for ach in [a for a, t in self.deadlines.items() if t <= game.run_time]: self.check(ach, game)
+        self.next_deadline = min(self.deadlines.values(), default=float("inf"))
+
+    def check(self, ach, game):
+        if ach.condition_func(game): self.unlock(ach, game)
+        elif ach.deadline_func: self.deadlines[ach] = ach.deadline_func(game)
 
     def unlock(self, achievement, game):
         achievement.unlocked = True
         achievement.unlock_time = time.time()
+        for signal in achievement.signals: self.by_signal[signal].remove(achievement)
+        self.deadlines.pop(achievement, None)
         self.queue.append(achievement)
+        if hasattr(game, 'journal'): game.journal.record("ach", id=achievement.id)
         if hasattr(game, 'sound'): game.sound.play("powerup")
 
     def draw_notification(self, screen, width, height):
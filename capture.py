@@ -0,0 +1,181 @@
+import os
+import time
+import queue
+import multiprocessing
+import pygame
+
+# Kayıt halka tamponu NumPy + paylaşımlı bellek ister; yoksa kayıt kapalı kalır
+CAPTURE_AVAILABLE = False
+try:
+    import numpy as np
+    from multiprocessing import shared_memory, resource_tracker
+    CAPTURE_AVAILABLE = True
+except ImportError:
+    pass
+
+# GIF için Pillow opsiyonel; yoksa PNG dizisi yazılır
+try:
+    from PIL import Image
+    GIF_AVAILABLE = True
+except ImportError:
+    GIF_AVAILABLE = False
+
+
+class ClipRecorder:
+    """Oynanıştan "son N saniye" kaydı.
+
+    Ana döngü her `step` karede bir ekranı küçültüp (transform.scale) paylaşımlı bellekteki
+    halka tampona surfarray.pixels2d görünümüyle kopyalar; kare başına maliyet tek bir
+    küçültme + bellek kopyasıdır. Kaydetmek istendiğinde ana süreç sadece küçük bir mesaj
+    gönderir: kareleri tampondan kopyalamak ve PNG/GIF'e sıkıştırmak ayrı bir işçi süreçte
+    yapılır, oyun döngüsü hiçbir zaman sıkıştırmayı beklemez.
+    """
+    def __init__(self, out_dir, seconds=15, fps=15, game_fps=60, scale=0.5, fmt=None):
+        self.out_dir = out_dir
+        self.seconds = seconds
+        self.fps = fps
+        self.step = max(1, round(game_fps / fps))
+        self.scale = scale
+        self.fmt = fmt or ("gif" if GIF_AVAILABLE else "png")
+        self.recording = False
+        self.shm = None; self.ring = None; self.small = None
+        self.count = 0 # Tampona yazılmış toplam kare (halka konumu = count % kapasite)
+        self.frame = 0
+        self.worker = None; self.jobs = None; self.results = None; self.copied = None
+        self.grab_ms = 0.0 # Ana iş parçacığındaki kare başı maliyet (üstel ortalama)
+
+    @property
+    def capacity(self):
+        return self.seconds * self.fps
+
+    def start(self, surface):
+        """Halka tamponu ayırır ve işçi süreci başlatır. Başlayamazsa hata mesajı döner."""
+        if not CAPTURE_AVAILABLE: return "NUMPY REQUIRED"
+        if surface.get_bytesize() != 4: return "32-BIT DISPLAY REQUIRED"
+        w, h = surface.get_size()
+        size = (max(1, int(w * self.scale)), max(1, int(h * self.scale)))
+        if self.small is None or self.small.get_size() != size:
+            self.release_buffer()
+            self.small = pygame.Surface(size, 0, surface)
+            self.shm = shared_memory.SharedMemory(create=True, size=self.capacity * size[0] * size[1] * 4)
+            self.ring = np.ndarray((self.capacity, size[0], size[1]), dtype=np.uint32, buffer=self.shm.buf)
+        self.count = 0; self.frame = 0
+        self.recording = True
+        self._start_worker()
+        return None
+
+    def stop(self):
+        self.recording = False
+
+    def _start_worker(self):
+        if self.worker is not None and self.worker.is_alive(): return
+        # spawn: pencere/SDL durumu olan süreci fork'lamak yerine temiz bir yorumlayıcı
+        ctx = multiprocessing.get_context("spawn")
+        self.jobs = ctx.Queue(); self.results = ctx.Queue(); self.copied = ctx.Event()
+        self.copied.set()
+        self.worker = ctx.Process(target=encode_worker, args=(self.jobs, self.results, self.copied), daemon=True)
+        self.worker.start()
+
+    def grab(self, surface):
+        """Her karede çağrılır; sadece `step` karede bir ve işçi tamponu okumuyorken kopyalar."""
+        if not self.recording: return
+        self.frame += 1
+        if self.frame % self.step or not self.copied.is_set(): return
+        start = time.perf_counter()
+        pygame.transform.scale(surface, self.small.get_size(), self.small)
+        pixels = pygame.surfarray.pixels2d(self.small)
+        try:
+            self.ring[self.count % self.capacity] = pixels
+        finally:
+            del pixels # Yüzey kilidini bırak
+        self.count += 1
+        self.grab_ms += ((time.perf_counter() - start) * 1000 - self.grab_ms) * 0.1
+
+    def save(self):
+        """Son `seconds` saniyeyi işçiye gönderir; dosya yolu poll() ile döner."""
+        if not self.recording or self.count == 0: return False
+        n = min(self.count, self.capacity)
+        first = self.count - n
+        order = [(first + i) % self.capacity for i in range(n)]
+        os.makedirs(self.out_dir, exist_ok=True)
+        name = time.strftime("clip_%Y%m%d_%H%M%S")
+        self.copied.clear() # İşçi kareleri kopyalayana kadar tampona yazılmaz
+        self.jobs.put({
+            "shm": self.shm.name, "shape": self.ring.shape, "order": order,
+            "masks": self.small.get_masks()[:3], "shifts": self.small.get_shifts()[:3],
+            "fps": self.fps, "fmt": self.fmt, "path": os.path.join(self.out_dir, name),
+        })
+        return True
+
+    def poll(self):
+        """Biten kayıtların (yol veya hata) listesi; beklemez."""
+        done = []
+        if self.results is None: return done
+        while True:
+            try: done.append(self.results.get_nowait())
+            except queue.Empty: return done
+
+    def release_buffer(self):
+        self.ring = None
+        if self.shm is not None:
+            self.shm.close(); self.shm.unlink(); self.shm = None
+
+    def close(self):
+        self.recording = False
+        if self.worker is not None:
+            self.jobs.put(None)
+            self.worker.join(timeout=5) # Süren bir kodlama varsa bitirmesine kısa süre tanı
+            if self.worker.is_alive(): self.worker.terminate()
+            self.worker = None
+        self.release_buffer()
+
+
+def unpack_rgb(frames, masks, shifts):
+    """pixels2d'nin paketlenmiş uint32 pikselleri -> (kare, yükseklik, genişlik, 3) uint8."""
+    out = np.empty(frames.shape[:1] + (frames.shape[2], frames.shape[1], 3), dtype=np.uint8)
+    for c, (mask, shift) in enumerate(zip(masks, shifts)):
+        out[..., c] = ((frames & mask) >> shift).transpose(0, 2, 1)
+    return out
+
+def attach_shared(name):
+    """Ana sürecin bloğuna bağlanır ama resource_tracker'a kaydetmez: bloğun sahibi ana süreç.
+
+    Kaydedilirse 3.13 öncesinde işçi çıkışında "leaked shared_memory" uyarısı ve çifte unlink
+    olur; sonradan unregister() da çözüm değil, spawn ile izleyici ana süreçle ortak olduğundan
+    onun kaydını da siler. 3.13+ bunun için track=False sunar.
+    """
+    try: return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None # İşçi tek iş parçacıklı: geçici değişim güvenli
+    try: return shared_memory.SharedMemory(name=name)
+    finally: resource_tracker.register = register
+
+def encode_worker(jobs, results, copied):
+    """İşçi süreç: kareleri paylaşımlı bellekten kopyalar, sonra PNG dizisi veya GIF yazar."""
+    while True:
+        job = jobs.get()
+        if job is None: break
+        try:
+            shm = attach_shared(job["shm"])
+            try:
+                ring = np.ndarray(job["shape"], dtype=np.uint32, buffer=shm.buf)
+                frames = ring[job["order"]] # Kopya: ana süreç hemen yazmaya devam edebilir
+                del ring
+            finally:
+                shm.close()
+                copied.set()
+            rgb = unpack_rgb(frames, job["masks"], job["shifts"])
+            path = job["path"]
+            if job["fmt"] == "gif" and GIF_AVAILABLE:
+                images = [Image.fromarray(f).convert("P", palette=Image.ADAPTIVE) for f in rgb]
+                path += ".gif"
+                images[0].save(path, save_all=True, append_images=images[1:], duration=int(1000 / job["fps"]), loop=0)
+            else:
+                os.makedirs(path, exist_ok=True)
+                for i, f in enumerate(rgb):
+                    pygame.image.save(pygame.surfarray.make_surface(f.transpose(1, 0, 2)), os.path.join(path, f"frame_{i:04d}.png"))
+            results.put(("ok", path))
+        except Exception as e:
+            copied.set()
+            results.put(("error", str(e)))
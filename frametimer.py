@@ -0,0 +1,122 @@
+import csv
+import time
+import pygame
+
+# Game.run içindeki aşamalar, karede geçtikleri sırayla. Her lap() bir önceki lap()'ten beri
+# geçen süreyi verilen aşamaya yazar; bekleme (clock.tick) hiçbir aşamaya dahil değildir.
+# "gc" bir lap() ile değil carve() ile dolar: toplama süresi içinde geçtiği aşamadan düşülür.
+PHASES = ("events", "logic", "player", "enemies", "movement", "achievements", "autosave", "collisions",
+          "background", "sprites", "bloom", "hud", "audio", "flip", "gc")
+COLORS = ((90, 90, 255), (120, 120, 120), (50, 150, 255), (255, 50, 50), (255, 165, 0), (255, 215, 0),
+          (160, 82, 45), (255, 0, 255), (60, 60, 160), (50, 255, 50), (0, 255, 255), (255, 255, 255),
+          (150, 255, 150), (255, 120, 180), (255, 255, 0))
+
+
+class FrameTimer:
+    """Aşama başına kare süresi ölçer.
+
+    Son `size` karenin aşama süreleri (ms) sabit boyutlu bir halka tamponda tutulur; kaplama
+    (overlay) son karelerin yığılmış çubuklarını ve toplam kare süresinin p50/p95/p99
+    değerlerini gösterir, dump_csv() tamponu kare kare CSV'ye yazar. Kapalıyken begin/lap/end
+    sadece bir bayrak kontrolüdür.
+    """
+    def __init__(self, size=600, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.column = {phase: i for i, phase in enumerate(PHASES)}
+        self.frames = [[0.0] * len(PHASES) for _ in range(size)]
+        self.count = 0 # Tampona yazılmış toplam kare
+        self.current = self.frames[0]
+        self.last = 0.0
+        self.carved = 0.0 # Son lap()'ten beri başka aşamaya aktarılan süre
+        self.panel = None; self.panel_frame = -1
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.count = 0; self.panel = None
+        # Kare ortasında açıldıysa (F3) bu karenin begin()'i atlanmıştı: satır ve başlangıç burada kurulur
+        row = self.current = self.frames[0]
+        for i in range(len(row)): row[i] = 0.0
+        self.carved = 0.0
+        self.last = time.perf_counter()
+
+    def begin(self):
+        if not self.enabled: return
+        row = self.current = self.frames[self.count % self.size]
+        for i in range(len(row)): row[i] = 0.0
+        self.carved = 0.0
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.current[self.column[phase]] += (now - self.last) * 1000 - self.carved
+        self.last = now; self.carved = 0.0
+
+    def carve(self, phase, ms):
+        """Devam eden aşamanın içinde geçen `ms` süreyi ayrı bir aşamaya yazar (ör. GC duraklaması)."""
+        if not self.enabled: return
+        self.current[self.column[phase]] += ms
+        self.carved += ms
+
+    def end(self):
+        """Kareyi tampona kaydeder. end() çağrılmayan kare (ör. duraklatma) bir sonraki begin() ile silinir."""
+        if self.enabled: self.count += 1
+
+    def recent(self):
+        """Tampondaki kareler, eskiden yeniye."""
+        n = min(self.count, self.size)
+        return [self.frames[(self.count - n + i) % self.size] for i in range(n)]
+
+    def percentiles(self, frames):
+        totals = sorted(sum(row) for row in frames)
+        if not totals: return 0.0, 0.0, 0.0
+        return tuple(totals[min(len(totals) - 1, int(len(totals) * q))] for q in (0.5, 0.95, 0.99))
+
+    def dump_csv(self, path):
+        frames = self.recent()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + PHASES + ("total",))
+            first = self.count - len(frames)
+            for i, row in enumerate(frames):
+                writer.writerow([first + i] + [f"{ms:.3f}" for ms in row] + [f"{sum(row):.3f}"])
+        return len(frames)
+
+    def draw(self, surface, pos=(10, 110), bars=120, scale=4, every=15):
+        """Kaplamayı çizer; panel `every` karede bir yeniden oluşturulur (kaplamanın kendisi de ölçülür)."""
+        if not self.enabled: return None
+        if self.panel is None or self.count - self.panel_frame >= every:
+            self.panel = self.build_panel(bars, scale)
+            self.panel_frame = self.count
+        return surface.blit(self.panel, pos)
+
+    def build_panel(self, bars, scale):
+        if self.font is None: self.font = pygame.font.SysFont("Verdana", 11)
+        frames = self.recent()
+        graph_h = 100; legend_h = 14 * ((len(PHASES) + 1) // 2)
+        w = bars * 2 + 20
+        panel = pygame.Surface((w, graph_h + legend_h + 34), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        # Bütçe çizgisi: 60 FPS için 16.7 ms
+        budget_y = graph_h - int(1000 / 60 * scale) + 4
+        if budget_y > 4: pygame.draw.line(panel, (255, 50, 50), (10, budget_y), (w - 10, budget_y))
+        for x, row in enumerate(frames[-bars:]):
+            y = graph_h + 4
+            for ms, color in zip(row, COLORS):
+                h = ms * scale
+                if h < 0.5: continue
+                top = max(4, int(y - h))
+                pygame.draw.line(panel, color, (10 + x * 2, top), (10 + x * 2, int(y)), 2)
+                y -= h
+                if y <= 4: break
+        p50, p95, p99 = self.percentiles(frames)
+        panel.blit(self.font.render(f"p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f} ms", True, (255, 255, 255)), (10, graph_h + 8))
+        n = max(1, len(frames))
+        for i, (phase, color) in enumerate(zip(PHASES, COLORS)):
+            avg = sum(row[i] for row in frames) / n
+            x = 10 + (i % 2) * (w // 2); y = graph_h + 26 + (i // 2) * 14
+            pygame.draw.rect(panel, color, (x, y + 3, 8, 8))
+            panel.blit(self.font.render(f"{phase} {avg:.2f}", True, (220, 220, 220)), (x + 12, y))
+        return panel
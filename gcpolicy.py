@@ -0,0 +1,122 @@
+import gc
+import time
+from collections import deque
+
+# Savaş sırasında (GAME) eşikler: kare başına yüzlerce Bullet/Particle/FloatingText ve rect
+# demeti oluşup yok olur, varsayılan 700 ayırmalık gen0 eşiği birkaç karede bir dolar. Döngüsel
+# çöpün çoğu zaten kill() ile kırılır; toplama işi kare sonundaki boşluğa kaydırılır, tam
+# toplama (gen2) savaş boyunca otomatik tetiklenmez.
+GAME_THRESHOLDS = (20000, 50, 100000)
+# Planlı toplama, sayaç eşiğin bu oranına gelince (otomatik toplamadan önce) yapılır
+SCHEDULE_AT = 0.5
+# Giriş anında tam toplama yapılan durumlar: kare bütçesinin önemi yok (PAUSED: GAME içinde duraklatma)
+QUIET_STATES = ("PAUSED", "MENU", "DYING", "GAMEOVER", "SLOT_MENU", "MARKET_MENU", "MARKET_INGAME", "LEADERBOARD",
+                "SETTINGS", "SETTINGS_AUDIO", "SETTINGS_CONTROLS", "SELECT")
+
+
+class GCPolicy:
+    """Çöp toplayıcı (GC) duraklamalarının zamanlaması ve ölçümü.
+
+    "managed" kipinde: açılışta yüklenen her şey gc.freeze() ile kalıcı nesillere taşınır
+    (sonraki tam toplamalar onları taramaz), GAME durumunda eşikler yükseltilir ve toplamalar
+    kare işi bittikten sonra, kalan süre ölçülen maliyete yetiyorsa idle() ile yapılır. Duraklatma,
+    menü, DYING ve GAMEOVER'a girildiğinde bekleyen her şey tek bir tam toplamayla temizlenir.
+    "default" kipinde Python'un kendi davranışı korunur, sadece ölçüm yapılır.
+
+    Her toplama gc.callbacks ile ölçülür: süre, nesil, planlı/otomatik. Süre FrameTimer'da "gc"
+    aşamasına aktarılır; bütçeyi aşan kare bir toplama içeriyorsa GC'ye atfedilir.
+    """
+    MODES = ("managed", "default")
+
+    def __init__(self, mode="managed", fps=60, timer=None, log_size=50):
+        self.mode = mode
+        self.budget_ms = 1000 / fps
+        self.timer = timer
+        self.default_thresholds = gc.get_threshold()
+        self.cost_ms = [0.2, 1.0, 10.0] # Nesil başına ölçülen toplama maliyeti (üstel ortalama)
+        self.started = 0.0
+        self.scheduled = False # Şu anki toplama bizim tetiklediğimiz mi
+        self.frame_start = 0.0
+        self.in_frame = False # begin() ile end() arası; dışındaki toplama bekleme (throttle) sırasındadır
+        self.frame_gc_ms = 0.0; self.frame_gc_gens = []
+        self.state = None
+        self.full_pending = False
+        self.collections = {"auto": [0, 0, 0], "scheduled": [0, 0, 0]}
+        self.total_ms = 0.0; self.max_ms = 0.0
+        self.frames_over = 0; self.frames_over_gc = 0
+        self.hitches = deque(maxlen=log_size) # (durum, kare ms, gc ms, nesiller)
+        gc.callbacks.append(self._callback)
+
+    def _callback(self, phase, info):
+        # GC hangi iş parçacığında tetiklenirse orada çalışır ama GIL'i tutar: ana döngü de durur
+        if phase == "start":
+            self.started = time.perf_counter(); return
+        ms = (time.perf_counter() - self.started) * 1000
+        generation = info["generation"]
+        self.collections["scheduled" if self.scheduled else "auto"][generation] += 1
+        self.cost_ms[generation] += (ms - self.cost_ms[generation]) * 0.2
+        self.total_ms += ms; self.max_ms = max(self.max_ms, ms)
+        # Bekleme sırasındaki toplama hiçbir kareye atfedilmez: kaydedilmiş satırı bozar, bekleme süresini yer
+        if not self.in_frame: return
+        self.frame_gc_ms += ms; self.frame_gc_gens.append(generation if self.scheduled else f"{generation}!")
+        if self.timer: self.timer.carve("gc", ms)
+
+    def freeze(self):
+        """Açılış bitti: mevcut nesneler (fontlar, sesler, modüller) bundan sonra taranmaz."""
+        if self.mode != "managed": return
+        self.collect(2)
+        gc.freeze()
+
+    def collect(self, generation):
+        self.scheduled = True
+        try: gc.collect(generation)
+        finally: self.scheduled = False
+
+    def set_state(self, state):
+        if state == self.state or self.mode != "managed": return
+        self.state = state
+        if state == "GAME": gc.set_threshold(*GAME_THRESHOLDS)
+        else:
+            gc.set_threshold(*self.default_thresholds)
+            if state in QUIET_STATES: self.full_pending = True
+
+    def begin(self):
+        self.frame_start = time.perf_counter()
+        self.frame_gc_ms = 0.0; self.frame_gc_gens = []
+        self.in_frame = True
+
+    def idle(self):
+        """Kare işi bitti, beklemeden önce: süre artıyorsa en fazla bir planlı toplama yapar."""
+        if self.mode != "managed": return
+        if self.full_pending:
+            self.full_pending = False; self.collect(2)
+            return
+        if self.state != "GAME": return
+        slack = self.budget_ms - (time.perf_counter() - self.frame_start) * 1000
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        for generation in (1, 0):
+            if counts[generation] >= thresholds[generation] * SCHEDULE_AT and self.cost_ms[generation] * 1.5 < slack:
+                self.collect(generation)
+                return
+
+    def end(self, state):
+        """Kare sonu (bekleme dahil değil): bütçeyi aşan kareleri GC'ye atfeder."""
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.in_frame = False
+        if frame_ms <= self.budget_ms: return
+        self.frames_over += 1
+        if self.frame_gc_ms:
+            self.frames_over_gc += 1
+            self.hitches.append((state, frame_ms, self.frame_gc_ms, tuple(self.frame_gc_gens)))
+
+    def summary(self):
+        auto, scheduled = self.collections["auto"], self.collections["scheduled"]
+        return (f"GC ({self.mode}): otomatik {auto}, planlı {scheduled}, toplam {self.total_ms:.0f} ms, en uzun {self.max_ms:.1f} ms; "
+                f"bütçeyi aşan {self.frames_over} karenin {self.frames_over_gc} tanesinde GC vardı")
+
+    def write_log(self, path):
+        """Özet ve GC'ye atfedilen son bütçe aşımları (nesil sonundaki "!" otomatik toplama demek)."""
+        with open(path, "w") as f:
+            f.write(self.summary() + "\n")
+            for state, frame_ms, gc_ms, gens in self.hitches:
+                f.write(f"{state}: kare {frame_ms:.1f} ms, GC {gc_ms:.1f} ms (nesil {', '.join(map(str, gens))})\n")
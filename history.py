@@ -0,0 +1,102 @@
+import time
+import queue
+import sqlite3
+import threading
+
+# Biten her oyun bir satır. Sıralama sorguları indekslerden okunur: (ship, score) gemiye göre,
+# (score) genel, (ended_at) son oyunlar için. Satır sayısı ne olursa olsun ilk N satır
+# indeksin başından okunur, tablo taranmaz.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    ship INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    max_combo INTEGER NOT NULL,
+    bosses INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    level_mult REAL NOT NULL,
+    purchases INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_ship_score ON runs (ship, score DESC);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_ended ON runs (ended_at DESC);
+"""
+COLUMNS = ("ended_at", "ship", "score", "max_combo", "bosses", "duration", "level_mult", "purchases")
+
+
+class RunHistory:
+    """Yerel SQLite oyun geçmişi ve skor tablosu.
+
+    record() sadece satırı kuyruğa koyar; yazıcı iş parçacığı kuyrukta biriken tüm satırları
+    tek bir işlemde (transaction) ekler. Okuma ana iş parçacığındaki ayrı bağlantıdan yapılır;
+    WAL kipinde okuyucu yazıcıyı beklemez. top() sonuçları yeni bir satır eklenene kadar önbellekte kalır.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.rows = queue.Queue()
+        self.version = 0 # Eklenen her grup sonrası artar (önbellek geçersizleşir)
+        self.cache = {}
+        self.inserted = 0; self.batches = 0
+        self.error = None
+        try:
+            self.db = self.connect()
+            self.db.executescript(SCHEMA)
+            self.db.commit()
+        except sqlite3.Error as e:
+            self.db = None; self.error = str(e) # Geçmiş olmadan da oyun çalışır
+            return
+        self.thread = threading.Thread(target=self._worker, name="run-history", daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=5)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL") # WAL ile çökmeye dayanıklı, commit başına fsync yok
+        return db
+
+    def record(self, **run):
+        if self.db is None: return
+        run.setdefault("ended_at", time.time())
+        self.rows.put(tuple(run[c] for c in COLUMNS))
+
+    def top(self, ship=None, limit=10, recent=False):
+        """İlk `limit` oyun: skora göre (isteğe bağlı gemi filtresiyle) ya da recent=True ise tarihe göre."""
+        if self.db is None: return []
+        key = (ship, limit, recent, self.version)
+        rows = self.cache.get(key)
+        if rows is None:
+            if recent: sql, args = "SELECT * FROM runs ORDER BY ended_at DESC LIMIT ?", (limit,)
+            elif ship is None: sql, args = "SELECT * FROM runs ORDER BY score DESC LIMIT ?", (limit,)
+            else: sql, args = "SELECT * FROM runs WHERE ship = ? ORDER BY score DESC LIMIT ?", (ship, limit)
+            cur = self.db.execute(sql, args)
+            names = [d[0] for d in cur.description]
+            rows = [dict(zip(names, r)) for r in cur.fetchall()]
+            if len(self.cache) > 32: self.cache.clear()
+            self.cache[key] = rows
+        return rows
+
+    def _worker(self):
+        db = self.connect() # sqlite3 bağlantıları iş parçacığına bağlıdır
+        while True:
+            row = self.rows.get()
+            if row is None: break
+            batch = [row]
+            while True: # Kuyrukta bekleyen her şey aynı işlemde
+                try: row = self.rows.get_nowait()
+                except queue.Empty: break
+                if row is None: self.rows.put(None); break
+                batch.append(row)
+            try:
+                with db: # Tek transaction: ya hepsi ya hiçbiri
+                    db.executemany(f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", batch)
+                self.inserted += len(batch); self.batches += 1
+                self.version += 1
+            except sqlite3.Error as e: self.error = str(e)
+        db.close()
+
+    def close(self):
+        if self.db is None: return
+        self.rows.put(None)
+        self.thread.join(timeout=5) # Bekleyen satırlar yazılsın
+        self.db.close()
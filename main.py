@@ -2,10 +2,23 @@ import pygame
 import random
 import math
 import sys
-import json
 import os
 import time
+import hashlib
+import argparse
+import multiprocessing
 from achievements import AchievementManager
+from capture import ClipRecorder
+from saves import SaveWriter, SlotIndex, EconomyJournal
+from history import RunHistory
+from frametimer import FrameTimer
+from profiler import SamplingProfiler
+from memwatch import MemoryMonitor
+from gcpolicy import GCPolicy
+import synth
+from voices import VoiceManager
+from music import Soundtrack
+from render import DirtyRects, RenderTarget, TextureTarget, Camera, RenderLayers, Bloom, QualityGovernor
 
 def resource_path(relative_path):
     """ PyInstaller ile paketlenince geçici klasör yolunu, normalde ise mevcut yolu döner """
@@ -28,10 +41,25 @@ except ImportError:
     print("UYARI: numpy kütüphanesi yok. Sesler kapalı.")
 
 # --- AYARLAR ---
+# Mantıksal çözünürlük: oyun hep bu boyutta çizilir, pencereye ölçeklenerek sunulur
 WIDTH = 800
 HEIGHT = 600
+# Oyun alanı (dünya) boyutu: varsayılan olarak ekranla aynı, daha büyükse kamera oyuncuyu takip eder
+ARENA_WIDTH = WIDTH
+ARENA_HEIGHT = HEIGHT
 FPS = 60
 
+# Boşta (idle) modu: hiçbir şey değişmiyorsa CPU yakmamak için
+IDLE_DELAY = 3.0   # Menüde bu kadar saniye girdi yoksa boşta sayılır
+IDLE_FPS = 10      # Boştaki menülerin kare hızı
+# Sadece girdiyle değişen (simülasyonu olmayan) ekranlar
+MENU_STATES = ("MENU", "LEADERBOARD", "SETTINGS", "SETTINGS_AUDIO", "SETTINGS_CONTROLS", "BINDING_KEY", "MARKET_MENU",
+               "MARKET_INGAME", "SLOT_MENU", "SELECT", "CONFIRM_OVERWRITE", "CONFIRM_DELETE")
+SHIP_NAMES = ("INTERCEPTOR", "DESTROYER", "SPEEDER", "SNIPER")
+# Skor tablosu sekmeleri: tüm gemiler, gemi başına, son oyunlar
+LEADERBOARD_VIEWS = ("ALL SHIPS",) + SHIP_NAMES + ("RECENT RUNS",)
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL)
+
 # Renkler
 BLACK = (5, 5, 10)
 WHITE = (255, 255, 255)
@@ -75,135 +103,233 @@ def draw_lightning_bolt(surface, p1, p2):
     pygame.draw.lines(surface, ELECTRIC_CYAN, False, points, 4)
     pygame.draw.lines(surface, WHITE, False, points, 2)
 
+BAKED_IMAGES = {}
+def solid_image(size, color):
+    """Düz renkli mermi/parçacık görüntüleri bir kez üretilir ve paylaşılır (doku arka ucunda bir kez yüklenir)."""
+    key = (tuple(size), tuple(color))
+    image = BAKED_IMAGES.get(key)
+    if image is None:
+        image = BAKED_IMAGES[key] = pygame.Surface(size)
+        image.fill(color)
+    return image
+
+def missile_image():
+    image = BAKED_IMAGES.get("missile")
+    if image is None:
+        image = BAKED_IMAGES["missile"] = pygame.Surface((10, 10))
+        pygame.draw.circle(image, RED, (5, 5), 5)
+        image.set_colorkey(BLACK)
+    return image
+
 # --- SES MOTORU ---
+SOUND_CACHE_VERSION = 2 # Sentez kodu değişirse artırılır: eski önbellek dosyaları kullanılmaz
+
+# Ses efektleri veri olarak tanımlanır (synth.py); yeni efekt = yeni satır
+SFX_PATCHES = {
+    "laser": synth.tone("square", 400, 0.1, slide=-150),
+    "sniper": synth.tone("sawtooth", 150, 0.3, slide=-50),
+    "enemy_shoot": synth.tone("sine", 600, 0.1, slide=-200),
+    "explosion": synth.patch(synth.decay(synth.noise(1), "exp", 5), 0.4, level=0.5),
+    "coin": synth.tone("sine", 1500, 0.2, level=0.2),
+    "select": synth.tone("sine", 880, 0.1),
+    "hover": synth.tone("sine", 440, 0.05),
+    "powerup": synth.patch(synth.decay(synth.mix(synth.osc("sine", 600), synth.osc("sine", 1200))), 0.4),
+    "shield_get": synth.tone("sine", 500, 0.2, slide=200),
+    "boss_hit": synth.tone("sawtooth", 80, 0.05),
+    "dash": synth.patch(synth.decay(synth.noise(2), "exp", 5), 0.2, level=0.5),
+    "shield_hit": synth.tone("sine", 300, 0.1, slide=50),
+    "combo": synth.tone("square", 600, 0.15, slide=200),
+    "ulti": synth.tone("sawtooth", 100, 0.8, slide=400),
+    "drone": synth.tone("sine", 800, 0.05),
+    "missile": synth.tone("sawtooth", 200, 0.3, slide=100),
+    "crit": synth.tone("square", 800, 0.1, slide=100),
+    "error": synth.tone("sawtooth", 150, 0.2, slide=-20),
+}
+# Sık tekrarlanan efektlerin varyasyon bankaları: perde, uzunluk ve gürültü tohumu farklı.
+# Açılışta bir kez render edilir, çalarken sırayla (round-robin) seçilir: oyun sırasında DSP yok
+SFX_BANKS = {
+    "laser": [synth.tone("square", 400 * k, 0.1 * d, slide=-150 * k) for k, d in ((1, 1), (1.06, 0.9), (0.94, 1.1), (1.12, 0.95))],
+    "drone": [synth.tone("sine", 800 * k, 0.05 * d) for k, d in ((1, 1), (1.12, 0.9), (0.89, 1.1))],
+    "enemy_shoot": [synth.tone("sine", 600 * k, 0.1 * d, slide=-200 * k) for k, d in ((1, 1), (1.08, 0.9), (0.92, 1.1), (0.85, 1.05))],
+    "explosion": [synth.patch(synth.decay(synth.noise(seed), "exp", 5), 0.4 * d, level=0.5) for seed, d in ((1, 1), (11, 0.85), (12, 1.15), (13, 0.95))],
+}
+INTRO_PATCHES = [
+    synth.tone("square", 261.63, 0.2),
+    synth.tone("square", 329.63, 0.2),
+    synth.tone("square", 392.00, 0.2),
+    synth.tone("square", 523.25, 0.4),
+]
+
 class SoundEngine:
-    def __init__(self):
+    def __init__(self, cache_dir=None, music=True):
         self.enabled = DSP_AVAILABLE
+        self.music = None
         self.volume = 1.0
         self.sounds = {}
+        self.banks = {}; self.bank_pos = {}
+        # Sentezlenen PCM tamponları diskte tutulur (parametre + mikser ayarına göre anahtarlı)
+        self.cache_dir = cache_dir
+        self.cache_used = set()
+        self.cache_hits = 0; self.cache_misses = 0
         
         if self.enabled:
             try:
                 if pygame.mixer.get_init() is None:
                     pygame.mixer.pre_init(44100, -16, 2, 512)
                     pygame.mixer.init()
+                # Mikser farklı başlatılmış olabilir: gerçek değerler kullanılır
+                self.sample_rate, self.format, self.channels = pygame.mixer.get_init()
             except Exception as e:
                 print(f"Ses Hatası: {e}")
                 self.enabled = False
         
         if self.enabled:
             self.generate_sounds()
+            self.prune_cache()
+            # Çalma istekleri doğrudan Sound.play() yerine ses yöneticisinden geçer
+            self.voices = VoiceManager()
+            # Prosedürel müzik kendi ayrılmış kanalında, arka plan iş parçacığında üretilir
+            if music: self.music = Soundtrack(self.voices.reserved["music"], self.sample_rate, self.channels)
 
     def set_master_volume(self, vol):
         self.volume = max(0.0, min(1.0, vol))
         for s in self.sounds.values():
             s.set_volume(self.volume)
+        for bank in self.banks.values():
+            for s in bank: s.set_volume(self.volume)
+        if self.music: self.music.set_volume(self.volume * 0.5)
 
     def _apply_channels(self, audio_array):
-        try:
-            mixer_settings = pygame.mixer.get_init()
-            if not mixer_settings: return audio_array
-            channels = mixer_settings[2]
-            if channels == 2 and audio_array.ndim == 1:
-                return np.column_stack((audio_array, audio_array))
-        except: pass
+        if self.channels == 2 and audio_array.ndim == 1:
+            return np.column_stack((audio_array, audio_array))
         return audio_array
 
+    def cache_path(self, patch):
+        """Anahtar: patch verisi + mikser frekansı/formatı/kanal sayısı. Biri değişirse dosya adı da değişir."""
+        mixer = (self.sample_rate, self.format, self.channels)
+        digest = hashlib.sha1(repr((SOUND_CACHE_VERSION, mixer, patch)).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.npy")
+
+    def load_patches(self, patches):
+        """{isim: patch} -> {isim: PCM}. Önbellektekiler np.load(mmap) ile yüklenir,
+        kalanlar tek bir toplu render'da (ortak alt grafikler bir kez) üretilip diske yazılır."""
+        arrays = {}; missing = {}
+        ndim = 2 if self.channels == 2 else 1
+        for name, p in patches.items():
+            if self.cache_dir:
+                path = self.cache_path(p)
+                self.cache_used.add(os.path.basename(path))
+                try:
+                    audio = np.load(path, mmap_mode="r")
+                    if audio.ndim == ndim and audio.dtype == np.int16:
+                        arrays[name] = audio; self.cache_hits += 1
+                        continue
+                except (OSError, ValueError): pass # Yok ya da bozuk: yeniden üret
+            missing[name] = p
+
+        for name, audio in synth.render_batch(missing, self.sample_rate).items():
+            audio = arrays[name] = self._apply_channels(audio)
+            self.cache_misses += 1
+            if not self.cache_dir: continue
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                path = self.cache_path(missing[name]); tmp = path + ".tmp"
+                with open(tmp, "wb") as f: np.save(f, audio)
+                os.replace(tmp, path) # Yarım yazılmış dosya hiçbir zaman okunmaz
+            except OSError as e:
+                print(f"Ses önbelleği yazılamadı: {e}")
+        return arrays
+
+    def prune_cache(self):
+        """Bu çalıştırmada kullanılmayan (parametresi/mikseri değişmiş) önbellek dosyalarını siler."""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir): return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".npy", ".tmp")) and name not in self.cache_used:
+                try: os.remove(os.path.join(self.cache_dir, name))
+                except OSError: pass
+
     def generate_sounds(self):
-        self.sounds["laser"] = self._make_sound("square", 400, 0.1, slide=-150)
-        self.sounds["sniper"] = self._make_sound("sawtooth", 150, 0.3, slide=-50)
-        self.sounds["enemy_shoot"] = self._make_sound("sine", 600, 0.1, slide=-200)
-        self.sounds["explosion"] = self._make_noise(0.4)
-        self.sounds["coin"] = self._make_coin_sound()
-        self.sounds["select"] = self._make_sound("sine", 880, 0.1)
-        self.sounds["hover"] = self._make_sound("sine", 440, 0.05)
-        self.sounds["powerup"] = self._make_powerup()
-        self.sounds["shield_get"] = self._make_sound("sine", 500, 0.2, slide=200)
-        self.sounds["boss_hit"] = self._make_sound("sawtooth", 80, 0.05)
-        self.sounds["dash"] = self._make_noise(0.2)
-        self.sounds["shield_hit"] = self._make_sound("sine", 300, 0.1, slide=50)
-        self.sounds["combo"] = self._make_sound("square", 600, 0.15, slide=200)
-        self.sounds["ulti"] = self._make_sound("sawtooth", 100, 0.8, slide=400)
-        self.sounds["drone"] = self._make_sound("sine", 800, 0.05)
-        self.sounds["missile"] = self._make_sound("sawtooth", 200, 0.3, slide=100)
-        self.sounds["crit"] = self._make_sound("square", 800, 0.1, slide=100)
-        self.sounds["error"] = self._make_sound("sawtooth", 150, 0.2, slide=-20)
-        
-        self.intro_notes = [
-            self._make_sound("square", 261.63, 0.2),
-            self._make_sound("square", 329.63, 0.2),
-            self._make_sound("square", 392.00, 0.2),
-            self._make_sound("square", 523.25, 0.4),
-        ]
+        patches = dict(SFX_PATCHES)
+        patches.update((f"intro_{i}", p) for i, p in enumerate(INTRO_PATCHES))
+        for name, bank in SFX_BANKS.items():
+            patches.update((f"{name}#{i}", p) for i, p in enumerate(bank))
+        arrays = self.load_patches(patches)
+        for name in SFX_PATCHES: self.sounds[name] = pygame.sndarray.make_sound(arrays[name])
+        for name, bank in SFX_BANKS.items():
+            self.banks[name] = [pygame.sndarray.make_sound(arrays[f"{name}#{i}"]) for i in range(len(bank))]
+            self.bank_pos[name] = 0
+        self.intro_notes = [pygame.sndarray.make_sound(arrays[f"intro_{i}"]) for i in range(len(INTRO_PATCHES))]
         self.set_master_volume(self.volume)
 
-    def _make_sound(self, wave_type, freq, duration, slide=0):
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration)
-        freqs = np.linspace(freq, freq + slide, n_samples)
-        phase = 2 * np.pi * np.cumsum(freqs) / sample_rate
-        if wave_type == "sine": waveform = np.sin(phase)
-        elif wave_type == "square": waveform = np.sign(np.sin(phase))
-        elif wave_type == "sawtooth": waveform = 2 * (phase / (2 * np.pi) - np.floor(0.5 + phase / (2 * np.pi)))
-        envelope = np.linspace(1, 0, n_samples)
-        audio = (waveform * envelope * 32767 * 0.3).astype(np.int16)
-        audio = self._apply_channels(audio)
-        return pygame.sndarray.make_sound(audio)
-
-    def _make_noise(self, duration):
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration)
-        noise = np.random.uniform(-1, 1, n_samples)
-        decay = np.exp(-np.linspace(0, 5, n_samples))
-        audio = (noise * decay * 32767 * 0.5).astype(np.int16)
-        audio = self._apply_channels(audio)
-        return pygame.sndarray.make_sound(audio)
-
-    def _make_powerup(self):
-        sample_rate = 44100
-        n_samples = int(sample_rate * 0.4)
-        t = np.linspace(0, 0.4, n_samples, False)
-        waveform = np.sin(2 * np.pi * 600 * t) + np.sin(2 * np.pi * 1200 * t)
-        envelope = np.linspace(1, 0, n_samples)
-        audio = (waveform * envelope * 32767 * 0.3).astype(np.int16)
-        audio = self._apply_channels(audio)
-        return pygame.sndarray.make_sound(audio)
-
-    def _make_coin_sound(self):
-        sample_rate = 44100
-        n_samples = int(sample_rate * 0.2)
-        t = np.linspace(0, 0.2, n_samples, False)
-        waveform = np.sin(2 * np.pi * 1500 * t)
-        envelope = np.linspace(1, 0, n_samples)
-        audio = (waveform * envelope * 32767 * 0.2).astype(np.int16)
-        audio = self._apply_channels(audio)
-        return pygame.sndarray.make_sound(audio)
-
-    def play(self, name):
-        if self.enabled and name in self.sounds:
-            self.sounds[name].play()
+    def play(self, name, pan=None):
+        """pan: -1 (sol) .. 1 (sağ), None ise ortada. Bankası olan seslerde sıradaki varyasyon çalar."""
+        if not self.enabled: return
+        bank = self.banks.get(name)
+        if bank:
+            i = self.bank_pos[name]; self.bank_pos[name] = (i + 1) % len(bank)
+            self.voices.request(name, bank[i], pan)
+        elif name in self.sounds:
+            self.voices.request(name, self.sounds[name], pan)
             
     def play_intro(self, step):
         if self.enabled and 0 <= step < len(self.intro_notes):
             self.intro_notes[step].set_volume(self.volume)
-            self.intro_notes[step].play()
+            self.voices.request("intro", self.intro_notes[step])
+
+    def update(self):
+        """Karede bir kez: bu karede istenen sesleri (tekilleştirilmiş, öncelikli) çalar, müziği besler."""
+        if not self.enabled: return
+        self.voices.update()
+        if self.music: self.music.update()
+
+    def set_music_intensity(self, intensity):
+        """Müzik ilk çağrıda başlar; yoğunluk bir sonraki üretilen parçadan itibaren geçerlidir."""
+        if not self.music: return
+        self.music.intensity = intensity
+        if not self.music.running: self.music.set_volume(self.volume * 0.5); self.music.start()
+
+    def close(self):
+        if not self.music: return
+        self.music.stop()
+        if self.music.underruns: print(f"Müzik: {self.music.chunks} parça üretildi, {self.music.underruns} kesinti (underrun)")
 
 # --- GÖRSEL EFEKTLER ---
 class CyberGrid:
+    """Izgara bir kez karo (tile) olarak çizilir; her karede tek bir kaydırmalı blit yapılır."""
     def __init__(self):
         self.offset_y = 0
         self.speed = 2
         self.grid_size = 60
+        self.surface = None
 
     def update(self, speed_mult=1.0):
         self.offset_y = (self.offset_y + self.speed * speed_mult) % self.grid_size
 
+    def build(self):
+        """Tek karoyu üretip ekran + titreşim payı kadar büyük bir yüzeye döşer."""
+        g = self.grid_size
+        tile = pygame.Surface((g, g))
+        tile.fill(GRID_COLOR)
+        pygame.draw.line(tile, GRID_LINE_COLOR, (0, 0), (0, g), 1)
+        pygame.draw.line(tile, GRID_LINE_COLOR, (0, 0), (g, 0), 1)
+        
+        # Her yönde bir karo fazlası: kaydırma ve screen shake boşluk bırakmasın
+        cols = WIDTH // g + 3; rows = HEIGHT // g + 3
+        self.surface = pygame.Surface((cols * g, rows * g))
+        self.surface.blits([(tile, (cx * g, cy * g)) for cx in range(cols) for cy in range(rows)], doreturn=False)
+        self.built_for = (WIDTH, HEIGHT)
+
+    def line_rects(self, sy=0):
+        """Kayan yatay çizgilerin ekrandaki bantları (dirty-rect için)."""
+        g = self.grid_size
+        return [(0, y, WIDTH, 1) for y in range((int(self.offset_y) + sy) % g, HEIGHT, g)]
+
     def draw(self, surface, sx=0, sy=0):
-        surface.fill(GRID_COLOR)
-        for x in range(0, WIDTH, self.grid_size):
-            pygame.draw.line(surface, GRID_LINE_COLOR, (x + sx, 0), (x + sx, HEIGHT), 1)
-        for y in range(int(self.offset_y), HEIGHT, self.grid_size):
-            pygame.draw.line(surface, GRID_LINE_COLOR, (0, y + sy), (WIDTH, y + sy), 1)
+        if self.surface is None or self.built_for != (WIDTH, HEIGHT): self.build()
+        g = self.grid_size
+        # Kaydırma karo boyuna göre sarılır: yüzey her zaman ekranın sol üst köşesini de örter
+        # (ekran artık önceden doldurulmuyor; titreşimde üstte önceki kare görünmesin)
+        surface.blit(self.surface, (sx % g - g, (int(self.offset_y) + sy) % g - g))
 
 class Star:
     def __init__(self):
@@ -228,11 +354,115 @@ class Star:
         
         pygame.draw.circle(surface, color, (int(self.x + sx), int(self.y + sy)), self.size)
 
+class StarField:
+    """Yıldızlar NumPy dizilerinde tutulur ve surfarray ile toplu halde çizilir (paralaks katmanlı)."""
+    # (oran, hız aralığı, boyut, parlaklık aralığı): uzak -> yakın
+    LAYERS = [
+        (0.5, (3.0, 4.5), 1, (100, 160)),
+        (0.3, (4.5, 6.5), 1, (160, 220)),
+        (0.2, (6.5, 8.0), 2, (200, 255)),
+    ]
+
+    def __init__(self, count):
+        self.count = count
+        self.density = 1.0 # Kalite yöneticisi düşürürse yıldızların bir kısmı çizilmez
+        # NumPy yoksa eski tek tek çizilen yıldızlara düşülür
+        self.fallback = None if DSP_AVAILABLE else [Star() for _ in range(count)]
+        if self.fallback is not None: return
+        
+        speeds = []; sizes = []; bright = []
+        for ratio, (s_min, s_max), size, (b_min, b_max) in self.LAYERS:
+            n = max(1, int(count * ratio))
+            speeds.append(np.random.uniform(s_min, s_max, n))
+            sizes.append(np.full(n, size))
+            bright.append(np.random.randint(b_min, b_max + 1, n))
+        self.speed = np.concatenate(speeds)
+        self.size = np.concatenate(sizes)
+        self.brightness = np.concatenate(bright)
+        total = len(self.speed)
+        self.x = np.random.uniform(0, WIDTH, total)
+        self.y = np.random.uniform(0, HEIGHT, total)
+        self.rank = np.random.uniform(0, 1, total) # Yoğunluk düşünce hangi yıldızların kalacağı (kararlı)
+        
+        # Boyuta göre çizilecek piksel ofsetleri (daire içindeki noktalar)
+        self.offsets = {}
+        for r in (1, 2):
+            self.offsets[r] = [(dx, dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1) if dx*dx + dy*dy <= r*r]
+        self.lut = None; self.lut_format = None
+
+    def update(self, warp_speed=False):
+        if self.fallback is not None:
+            for s in self.fallback: s.update(warp_speed)
+            return
+        self.y += self.speed * (5 if warp_speed else 1)
+        out = self.y > HEIGHT
+        n_out = int(out.sum())
+        if n_out:
+            self.x[out] = np.random.uniform(0, WIDTH, n_out)
+            self.y[out] = 0
+
+    def color_lut(self, surface):
+        """Parlaklık (0-255) -> yüzeyin piksel formatındaki gri renk. Format değişince yeniden hesaplanır."""
+        fmt = (surface.get_bitsize(), surface.get_masks(), surface.get_shifts())
+        if self.lut is None or fmt != self.lut_format:
+            self.lut = np.array([surface.map_rgb((b, b, b)) for b in range(256)], dtype=np.int64)
+            self.lut_format = fmt
+        return self.lut
+
+    def visible(self):
+        """Çizilecek yıldız indeksleri (yoğunluk tamsa None: hepsi)."""
+        if self.density >= 1.0: return None
+        return np.flatnonzero(self.rank < self.density)
+
+    def draw(self, surface, sx=0, sy=0):
+        if self.fallback is not None or surface.get_bytesize() not in (1, 2, 4):
+            # 24 bit yüzeylerde pixels2d çalışmaz: eski yola düş
+            if self.fallback is not None: stars = self.fallback[:int(len(self.fallback) * self.density)]
+            else:
+                vis = self.visible()
+                stars = [self._as_star(i) for i in (range(len(self.x)) if vis is None else vis)]
+            for s in stars: s.draw(surface, sx, sy)
+            return
+        w, h = surface.get_size()
+        x, y, size, brightness = self.x, self.y, self.size, self.brightness
+        vis = self.visible()
+        if vis is not None: x, y, size, brightness = x[vis], y[vis], size[vis], brightness[vis]
+        xs = (x + sx).astype(np.int32); ys = (y + sy).astype(np.int32)
+        colors = self.color_lut(surface)[brightness]
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            for r, offsets in self.offsets.items():
+                sel = size == r
+                bx = xs[sel]; by = ys[sel]; bc = colors[sel]
+                for dx, dy in offsets:
+                    px = bx + dx; py = by + dy
+                    ok = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                    pixels[px[ok], py[ok]] = bc[ok]
+        finally:
+            del pixels # Yüzey kilidini bırak
+
+    def rects(self, sx=0, sy=0):
+        """Yıldızların kapladığı küçük kareler (dirty-rect için)."""
+        if self.fallback is not None:
+            return [(s.x + sx - 2, s.y + sy - 2, 5, 5) for s in self.fallback[:int(len(self.fallback) * self.density)]]
+        x, y = self.x, self.y
+        vis = self.visible()
+        if vis is not None: x, y = x[vis], y[vis]
+        xs = (x + sx - 2).astype(np.int32).tolist(); ys = (y + sy - 2).astype(np.int32).tolist()
+        return [(x, y, 5, 5) for x, y in zip(xs, ys)]
+
+    def _as_star(self, i):
+        s = Star.__new__(Star)
+        s.x, s.y, s.size, s.brightness = self.x[i], self.y[i], int(self.size[i]), int(self.brightness[i])
+        return s
+
 class Particle(pygame.sprite.Sprite):
+    layer = "effects"
+
     def __init__(self, x, y, color, speed_mult=1.0):
         super().__init__()
-        self.image = pygame.Surface((random.randint(4, 8), random.randint(4, 8)))
-        self.image.fill(color)
+        self.color = color
+        self.image = solid_image((random.randint(4, 8), random.randint(4, 8)), color)
         self.rect = self.image.get_rect(center=(x, y))
         angle = random.uniform(0, 2 * math.pi)
         speed = random.uniform(2, 6) * speed_mult
@@ -247,9 +477,11 @@ class Particle(pygame.sprite.Sprite):
         if self.life <= 0:
             self.kill()
         elif self.life < 15:
-            self.image = pygame.transform.scale(self.image, (2, 2))
+            self.image = solid_image((2, 2), self.color)
 
 class FloatingText(pygame.sprite.Sprite):
+    layer = "text"
+
     def __init__(self, text, x, y, color, size=20, life=40, vy=-2):
         super().__init__()
         font = pygame.font.SysFont("Verdana", size, bold=True)
@@ -266,10 +498,11 @@ class FloatingText(pygame.sprite.Sprite):
 
 # --- BULLET VE FÜZE SİSTEMİ ---
 class Bullet(pygame.sprite.Sprite):
+    layer = "projectiles"
+
     def __init__(self, x, y, damage, color, vx=0, vy=-10, size=(6, 15), is_missile=False, target=None):
         super().__init__()
-        self.image = pygame.Surface(size)
-        self.image.fill(color)
+        self.image = solid_image(size, color)
         self.rect = self.image.get_rect(center=(x, y))
         self.vx = vx
         self.vy = vy
@@ -280,9 +513,7 @@ class Bullet(pygame.sprite.Sprite):
         self.target = target
         
         if is_missile:
-             self.image = pygame.Surface((10, 10))
-             pygame.draw.circle(self.image, RED, (5, 5), 5)
-             self.image.set_colorkey(BLACK)
+             self.image = missile_image()
 
     def update(self):
         if self.is_missile and self.target and self.target.alive():
@@ -301,19 +532,21 @@ class Bullet(pygame.sprite.Sprite):
         self.rect.centery = int(self.fy)
         
         margin = 50
-        if self.rect.bottom < -margin or self.rect.top > HEIGHT+margin or self.rect.left < -margin or self.rect.right > WIDTH+margin:
+        if self.rect.bottom < -margin or self.rect.top > ARENA_HEIGHT+margin or self.rect.left < -margin or self.rect.right > ARENA_WIDTH+margin:
             self.kill()
 
 # --- OYUN NESNELERİ ---
 class Player(pygame.sprite.Sprite):
+    layer = "ships"
+
     def __init__(self, type_idx, stats, key_bindings):
         super().__init__()
         self.type = type_idx
         self.keys = key_bindings
         self.image = pygame.Surface((50, 50), pygame.SRCALPHA)
         self.rect = self.image.get_rect()
-        self.rect.centerx = WIDTH // 2
-        self.rect.bottom = HEIGHT - 20
+        self.rect.centerx = ARENA_WIDTH // 2
+        self.rect.bottom = ARENA_HEIGHT - 20
         self.visible = True
         
         # Temel Statlar
@@ -367,7 +600,8 @@ class Player(pygame.sprite.Sprite):
         self.ulti_power = min(self.max_ulti, self.ulti_power + amount)
 
     def draw_ship(self):
-        self.image.fill((0,0,0,0)) # Temizle
+        # Yerinde temizlemek yerine yeni yüzey: doku önbelleği görüntü nesnesine göre çalışır
+        self.image = pygame.Surface((50, 50), pygame.SRCALPHA)
         color = WHITE if self.is_dashing else self.color 
         
         if self.type == 0:
@@ -421,9 +655,9 @@ class Player(pygame.sprite.Sprite):
             
         # MOVEMENT CONTROLS
         if pressed[self.keys["LEFT"]] and self.rect.left > 0: self.rect.x -= self.speed
-        if pressed[self.keys["RIGHT"]] and self.rect.right < WIDTH: self.rect.x += self.speed
+        if pressed[self.keys["RIGHT"]] and self.rect.right < ARENA_WIDTH: self.rect.x += self.speed
         if pressed[self.keys["UP"]] and self.rect.top > 0: self.rect.y -= self.speed
-        if pressed[self.keys["DOWN"]] and self.rect.bottom < HEIGHT: self.rect.y += self.speed
+        if pressed[self.keys["DOWN"]] and self.rect.bottom < ARENA_HEIGHT: self.rect.y += self.speed
             
         if self.cooldown > 0: self.cooldown -= 1
         
@@ -457,6 +691,8 @@ class Player(pygame.sprite.Sprite):
         return bullets
 
 class Enemy(pygame.sprite.Sprite):
+    layer = "ships"
+
     def __init__(self, level_mult=1.0):
         super().__init__()
         self.type = random.choices(["normal", "fast", "tank"], weights=[60, 30, 10])[0]
@@ -485,11 +721,12 @@ class Enemy(pygame.sprite.Sprite):
             self.color = GREEN
             self.can_shoot = False
 
-        self.rect = self.image.get_rect(x=random.randint(0, WIDTH - 40), y=random.randint(-100, -50))
+        # Oyun alanının üstünde doğar; görünene kadar kamera tarafından çizilmez
+        self.rect = self.image.get_rect(x=random.randint(0, ARENA_WIDTH - 40), y=random.randint(-100, -50))
         
     def update(self):
         self.rect.y += self.speed
-        if self.rect.top > HEIGHT: self.kill()
+        if self.rect.top > ARENA_HEIGHT: self.kill()
         
         if self.can_shoot:
             self.shoot_timer += 1
@@ -499,10 +736,12 @@ class Enemy(pygame.sprite.Sprite):
         return None
 
 class Boss(pygame.sprite.Sprite):
+    layer = "ships"
+
     def __init__(self):
         super().__init__()
         self.image = pygame.Surface((240, 150), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(centerx=WIDTH//2, top=-200)
+        self.rect = self.image.get_rect(centerx=ARENA_WIDTH//2, top=-200)
         
         # --- Statlar ---
         self.max_hp = 3000
@@ -532,7 +771,7 @@ class Boss(pygame.sprite.Sprite):
         main_color = (180, 0, 0) if is_enraged else (100, 0, 0)
         core_color = (255, 50, 0) if is_enraged else (255, 0, 0)
         
-        self.image.fill((0,0,0,0))
+        self.image = pygame.Surface((240, 150), pygame.SRCALPHA)
         # Gövde (Agresif üçgen yapı)
         pygame.draw.polygon(self.image, main_color, [(0, 0), (240, 0), (180, 140), (60, 140)])
         pygame.draw.polygon(self.image, (255, 255, 255), [(0, 0), (240, 0), (180, 140), (60, 140)], 3)
@@ -566,7 +805,7 @@ class Boss(pygame.sprite.Sprite):
         # Hafif aşağı yukarı süzülme (Floating effect)
         self.rect.y = 50 + math.sin(now * 0.002) * 20 
         
-        if self.rect.right > WIDTH - 20 or self.rect.left < 20:
+        if self.rect.right > ARENA_WIDTH - 20 or self.rect.left < 20:
             self.move_dir *= -1
 
         # 4. Saldırı Mantığı (Pattern Seçici)
@@ -670,6 +909,8 @@ class Boss(pygame.sprite.Sprite):
         pygame.draw.rect(surface, (255, 255, 255), (WIDTH//2 - 250, 10, 500, 25), 3)
 
 class PowerUp(pygame.sprite.Sprite):
+    layer = "projectiles"
+
     def __init__(self, x, y):
         super().__init__()
         self.type = random.choices(["health", "shield"], weights=[70, 30])[0]
@@ -687,10 +928,11 @@ class PowerUp(pygame.sprite.Sprite):
         
     def update(self):
         self.rect.y += 3
-        if self.rect.top > HEIGHT: self.kill()
+        if self.rect.top > ARENA_HEIGHT: self.kill()
 
 # --- UI ELEMENTS ---
 class Button:
+    """Retained-mode buton: görüntüsü önbellekte tutulur, sadece durumu değişince yeniden çizilir."""
     def __init__(self, text, x, y, w, h, color, hover_color, action_code, cost=0):
         self.rect = pygame.Rect(x, y, w, h)
         self.text = text
@@ -701,37 +943,153 @@ class Button:
         self.selected = False
         self.disabled = False
         self.dynamic_text = False
+        self._surface = None
+        self._cache_key = None
+
+    def current_color(self, money_available=99999):
+        if self.disabled: return GREEN
+        elif self.cost > money_available: return DARK_RED
+        elif self.selected: return self.hover_color
+        return self.base_color
+
+    def state_key(self, font, money_available=99999):
+        """Görüntüyü etkileyen her şey bu anahtarda; anahtar değişmedikçe yüzey yeniden çizilmez."""
+        return (self.text, self.current_color(money_available), self.selected, self.rect.size, id(font))
+
+    def render(self, font, color):
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local = surf.get_rect()
+        pygame.draw.rect(surf, color, local, border_radius=12)
+        border_width = 4 if self.selected else 2
+        border_color = WHITE if self.selected else GRAY
+        pygame.draw.rect(surf, border_color, local, border_width, border_radius=12)
+
+        if self.text:
+            text_surf = font.render(self.text, True, WHITE)
+            surf.blit(text_surf, text_surf.get_rect(center=local.center))
+        return surf
 
     def draw(self, screen, font, money_available=99999):
-        if self.disabled: current_color = GREEN
-        elif self.cost > money_available: current_color = DARK_RED
-        elif self.selected: current_color = self.hover_color
-        else: current_color = self.base_color
+        key = self.state_key(font, money_available)
+        if key != self._cache_key:
+            self._surface = self.render(font, key[1])
+            self._cache_key = key
+        screen.blit(self._surface, self.rect)
+
+class SlotCard(Button):
+    """Slot menüsü kartı: info_text satırları da kartın önbellek yüzeyine gömülür."""
+    def __init__(self, info_text, x, y, w, h, color, hover_color, action_code, header_font, detail_font):
+        super().__init__("", x, y, w, h, color, hover_color, action_code)
+        self.info_text = info_text
+        self.header_font = header_font
+        self.detail_font = detail_font
+
+    def state_key(self, font, money_available=99999):
+        return super().state_key(font, money_available) + (self.info_text,)
+
+    def line_style(self, line):
+        # 1. Başlıklar: Eğer kart seçiliyse BEYAZ, yoksa kendi rengi
+        if "SLOT" in line and "AUTO" not in line: return (WHITE if self.selected else ELECTRIC_CYAN), self.header_font
+        elif "EMPTY" in line: return GRAY, self.header_font
+        elif "AUTO" in line: return (WHITE if self.selected else ORANGE), self.header_font
+        # 2. Detaylar (Score, Cash) -> Küçük ve Bilgi Rengi
+        elif "Score" in line: return GREEN, self.detail_font
+        elif "Cash" in line: return YELLOW, self.detail_font
+        elif "System" in line: return RED, self.detail_font
+        elif "New Game" in line: return (100, 100, 100), self.detail_font
+        elif line[:1].isdigit(): return GRAY, self.detail_font # Kayıt tarihi
+        return WHITE, self.detail_font
+
+    def render(self, font, color):
+        surf = super().render(font, color)
+        lines = self.info_text.split('\n')
+        cx = self.rect.w // 2
+        # 3 satır var, merkezden başlarsak aşağı kayar; bu yüzden biraz yukarıdan başlatılır
+        start_y = self.rect.h // 2 - (len(lines) * 25) // 2 + 10
+        for idx, line in enumerate(lines):
+            col, line_font = self.line_style(line)
+            line_surf = line_font.render(line, True, col)
+            surf.blit(line_surf, line_surf.get_rect(center=(cx, start_y + idx * 28)))
+        return surf
+
+class UILayer:
+    """Bir menü ekranının widget katmanı. Anahtar değişmedikçe tek bir blit ile çizilir."""
+    def __init__(self):
+        self.surface = None
+        self.key = None
 
-        pygame.draw.rect(screen, current_color, self.rect, border_radius=12)
-        border_width = 4 if self.selected else 2
-        border_color = WHITE if self.selected else GRAY
-        pygame.draw.rect(screen, border_color, self.rect, border_width, border_radius=12)
-        
-        text_surf = font.render(self.text, True, WHITE)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+    def get(self, key, size, build):
+        if self.surface is None or key != self.key or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            build(self.surface)
+            self.key = key
+        return self.surface
 
 # --- ANA OYUN MOTORU ---
 class Game:
-    def __init__(self):
+    def __init__(self, options=None):
+        self.options = options or parse_args([])
+        global WIDTH, HEIGHT, ARENA_WIDTH, ARENA_HEIGHT
+        WIDTH, HEIGHT = self.options.resolution
+        ARENA_WIDTH, ARENA_HEIGHT = self.options.arena or (WIDTH, HEIGHT)
         pygame.init()
         # --- EKRAN AYARI ---
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+        # Tüm çizimler sabit mantıksal çözünürlükteki self.screen'e yapılır; pencere boyutu maliyeti etkilemez
+        # --backend texture: sprite'lar pygame._sdl2.video dokuları olarak renderer'da çizilir
+        if self.options.backend == "surface":
+            self.display = RenderTarget((WIDTH, HEIGHT), self.options.scale_mode)
+        else:
+            self.display = TextureTarget((WIDTH, HEIGHT), software=self.options.backend == "texture-sw")
+        self.screen = self.display.surface
         pygame.display.set_caption("NEON DEFENDER")
         try:
             icon_path = resource_path("space.ico")
             program_icon = pygame.image.load(icon_path)
-            pygame.display.set_icon(program_icon)
+            if self.display.textured: self.display.window.set_icon(program_icon)
+            else: pygame.display.set_icon(program_icon)
         except Exception as e:
             print(f"İkon yüklenemedi: {e}")
         self.clock = pygame.time.Clock()
-        self.sound = SoundEngine()
+        # Opsiyonel dirty-rect sunumu (--dirty-rects); kapalıysa her karede tam flip yapılır
+        self.dirty = DirtyRects(self.display, self.options.dirty_rects and not self.display.textured)
+        self.layers = RenderLayers()
+        # Neon parlaması: varsayılan açık; dirty-rect modunda her kareyi kirlettiği için kapalı başlar.
+        # Doku arka ucunda sprite'lar yüzeyde olmadığından parlama yalnızca ızgarayı etkiler: kapalı
+        bloom = self.options.bloom or ("off" if self.dirty.enabled or self.display.textured else "medium")
+        self.bloom = Bloom(bloom, budget_ms=self.options.bloom_budget)
+        self.bloom_setting = bloom # Kalite yöneticisi bunun üstüne çıkmaz
+        # Ölçülen kare süresine göre görsel kademe (--quality auto); simülasyona dokunmaz
+        self.governor = QualityGovernor(FPS, self.options.quality)
+        self.quality_level = self.governor.level # Son uygulanan kademe (yükseltmede parlama tavanı gevşer)
+        # Aşama başına kare süresi (F3 kaplama, F4 CSV); kapalıyken ölçüm yapılmaz
+        self.frame_timer = FrameTimer(enabled=self.options.frame_timing)
+        # Çöp toplama: savaşta eşikler yüksek, toplamalar kare sonundaki boşlukta (--gc default: Python'un kendisi)
+        self.gc_policy = GCPolicy(self.options.gc, FPS, self.frame_timer)
+        # Örneklemeli profilleyici (F6 başlat/durdur); yığınlar oyun durumuna göre gruplanır
+        self.profiler = SamplingProfiler(self.profile_label, rate=self.options.profile_rate)
+        if self.options.profile: self.profiler.start()
+        # Bellek göstergeleri ve sahipsiz sprite tespiti (F7 kaplama); tracemalloc farkları --trace-memory ile
+        memory_log = None
+        if self.options.trace_memory:
+            os.makedirs(self.get_save_path("memory"), exist_ok=True)
+            memory_log = os.path.join(self.get_save_path("memory"), time.strftime("tracemalloc_%Y%m%d_%H%M%S.txt"))
+        self.memory = MemoryMonitor(trace=self.options.trace_memory, log_path=memory_log)
+        # Oynanış kaydı: F9 aç/kapa, F10 son N saniyeyi kaydet (kodlama ayrı süreçte)
+        self.recorder = ClipRecorder(self.get_save_path("captures"), seconds=self.options.clip_seconds,
+                                     game_fps=FPS, fmt=self.options.clip_format)
+        # Kayıtlar arka planda, birleştirilerek ve atomik olarak yazılır (kare kaybı / yarım dosya yok)
+        self.saves = SaveWriter()
+        # Slot kartlarının özeti: menü açılışında kayıtlar okunmaz, sadece (mtime, boyut) kontrol edilir
+        self.slot_index = SlotIndex(self.get_save_path("slot_index.json"), self.saves)
+        # Autosave arasındaki ekonomi olayları (para, satın alma, başarım) küçük satırlar olarak günlüğe eklenir
+        self.journal = EconomyJournal(self.get_save_path("autosave.journal"), self.saves, self.get_save_path("autosave.json"))
+        # Biten oyunların geçmişi (SQLite, arka planda toplu ekleme) ve skor tablosu
+        self.history = RunHistory(self.get_save_path("history.db"))
+        self.leaderboard_view = 0
+        self.last_drawn_state = None
+        self.last_grid_offset = None
+        self.hud_signature = None
+        self.sound = SoundEngine(self.get_save_path("sound_cache"), music=not self.options.no_music)
         
         self.achievement_manager = AchievementManager()
         
@@ -742,14 +1100,21 @@ class Game:
         self.state = "INTRO"
         self.intro_timer = 0
         self.intro_step = 0
-        self.stars = [Star() for _ in range(40)] 
+        self.stars = StarField(int(WIDTH * HEIGHT / 12000)) 
+        if self.options.capture: self.toggle_recording()
         self.grid = CyberGrid() 
         
         self.player_type = 0
-        self.shake_time = 0
         self.paused = False
         
+        # --- PENCERE / BOŞTA DURUMU ---
+        self.window_focused = True
+        self.window_minimized = False
+        self.last_input_time = time.time()
+        self.pause_drawn = False # PAUSED yazısı bir kez çizilince tekrar çizilmez
+        
         self.money = 0
+        self.playtime = 0.0 # Bu kayıtta oyunda geçen süre (saniye, simülasyon zamanı)
         self.stats = {
             'upgrade_hp': 0, 
             'upgrade_dmg': 0, 
@@ -769,6 +1134,11 @@ class Game:
         self.control_buttons = []
         self.binding_key = None 
 
+        # --- RETAINED-MODE UI ÖNBELLEKLERİ ---
+        self.ui_layers = {}   # ekran adı -> UILayer
+        self.text_cache = {}  # (yazı, font, renk) -> render edilmiş yüzey
+        self._store_signature = None
+
         # --- BUTONLARI OLUŞTURMA ---
         # Ekran boyutu değişince butonlar kaymasın diye hepsi fonksiyonda toplandı
         self.create_all_buttons()
@@ -786,11 +1156,13 @@ class Game:
         
         # --- MENÜ BUTONLARI ---
         self.menu_buttons = [
-            Button("START GAME", x_pos, center_y - 50, btn_w, btn_h, GREEN, (100, 255, 100), "GOTO_SLOTS"),
-            Button("WEAPON STORE", x_pos, center_y + 20, btn_w, btn_h, PURPLE, YELLOW, "STORE"),
-            Button("SETTINGS", x_pos, center_y + 90, btn_w, btn_h, GRAY, HOVER_GRAY, "SETTINGS"), 
-            Button("QUIT GAME", x_pos, center_y + 160, btn_w, btn_h, RED, ORANGE, "QUIT")
+            Button("START GAME", x_pos, center_y - 75, btn_w, btn_h, GREEN, (100, 255, 100), "GOTO_SLOTS"),
+            Button("WEAPON STORE", x_pos, center_y - 10, btn_w, btn_h, PURPLE, YELLOW, "STORE"),
+            Button("LEADERBOARD", x_pos, center_y + 55, btn_w, btn_h, BLUE, CYAN, "LEADERBOARD"),
+            Button("SETTINGS", x_pos, center_y + 120, btn_w, btn_h, GRAY, HOVER_GRAY, "SETTINGS"), 
+            Button("QUIT GAME", x_pos, center_y + 185, btn_w, btn_h, RED, ORANGE, "QUIT")
         ]
+        self.leaderboard_buttons = [Button("BACK", x_pos, HEIGHT - 70, btn_w, btn_h, RED, ORANGE, "BACK_MENU")]
         
         # --- SETTINGS BUTONLARI ---
         self.settings_buttons = [
@@ -810,6 +1182,7 @@ class Game:
         col2_x = WIDTH // 2 + 20      # Dinamik Konum
         start_y = 150; gap = 60
         
+        self._store_signature = None # Yeni butonlar: market metinleri tekrar hesaplanacak
         self.store_buttons = [
             Button("DMG UP (+10) - $200", col1_x, start_y, sw, sh, BLUE, CYAN, "BUY_DMG", 200),
             Button("FIRE RATE - $300", col2_x, start_y, sw, sh, BLUE, CYAN, "BUY_RATE", 300),
@@ -880,17 +1253,14 @@ class Game:
             filename = self.get_save_path(f"save_{i}.json")
             x = start_x + (i-1) * (card_w + gap)
             
-            # Değişkenleri hazırla
-            text = "" # <-- KRİTİK: Butonun kendi yazısı silinir
-            
-            if os.path.exists(filename):
-                try:
-                    with open(filename, "r") as f:
-                        data = json.load(f)
-                        # Başlığı (SLOT X) buraya eklenir
-                        info = f"SLOT {i}\nScore: {data.get('score', 0)}\nCash: ${data.get('money', 0)}"
-                        color = (20, 20, 60)
-                except: info = f"SLOT {i}\nCorrupted"; color = RED
+            try: entry = self.slot_index.get(filename)
+            except: entry = False # Bozuk dosya
+            if entry is not None:
+                if entry:
+                    # Başlığı (SLOT X) buraya eklenir
+                    info = f"SLOT {i}\n{self.slot_summary(entry)}"
+                    color = (20, 20, 60)
+                else: info = f"SLOT {i}\nCorrupted"; color = RED
                 
                 if self.slot_operation == "LOAD":
                     del_btn = Button("DELETE", x + card_w//2 - 70, y_pos + card_h + 5, 140, 40, RED, ORANGE, f"DEL_{i}")
@@ -900,8 +1270,7 @@ class Game:
                 info = "EMPTY\nNew Game"
                 color = (20, 20, 20)
             
-            slot_btn = Button(text, x, y_pos, card_w, card_h, color, ELECTRIC_CYAN, f"SLOT_{i}")
-            slot_btn.info_text = info # Tüm yazı burada
+            slot_btn = SlotCard(info, x, y_pos, card_w, card_h, color, ELECTRIC_CYAN, f"SLOT_{i}", self.font_large, self.font_small)
             self.slot_buttons.append(slot_btn)
 
         # --- 2. KISIM: AUTO-SAVE KARTI ---
@@ -910,24 +1279,18 @@ class Game:
         auto_w = card_w; auto_h = 110; auto_x = WIDTH // 2 - auto_w // 2
         
         auto_filename = self.get_save_path("autosave.json")
-        atext = "" 
         
-        if os.path.exists(auto_filename):
-            try:
-                with open(auto_filename, "r") as f:
-                    adata = json.load(f)
-                    ainfo = f"AUTO-SAVE\nScore: {adata.get('score', 0)}\nCash: ${adata.get('money', 0)}"
-            except: ainfo = "AUTO-SAVE\nCorrupted"
-        else:
-            ainfo = "AUTO-SAVE\nEmpty"
+        try:
+            aentry = self.slot_index.get(auto_filename)
+            ainfo = f"AUTO-SAVE\nScore: {aentry['score']}\nCash: ${aentry['cash']}" if aentry else "AUTO-SAVE\nEmpty"
+        except: ainfo = "AUTO-SAVE\nCorrupted"
 
         if self.slot_operation == "SAVE":
             acolor = (30, 30, 30); ainfo = "AUTO-SAVE\n(System Only)" 
         else:
             acolor = (60, 30, 0)
 
-        auto_btn = Button(atext, auto_x, auto_y, auto_w, auto_h, acolor, ORANGE, "SLOT_AUTO")
-        auto_btn.info_text = ainfo
+        auto_btn = SlotCard(ainfo, auto_x, auto_y, auto_w, auto_h, acolor, ORANGE, "SLOT_AUTO", self.font_large, self.font_small)
         self.slot_buttons.append(auto_btn)
 
         # --- 3. KISIM: BACK BUTONU ---
@@ -935,9 +1298,18 @@ class Game:
         if back_y > HEIGHT - 55: back_y = HEIGHT - 55
         self.slot_buttons.append(Button("BACK TO MENU", WIDTH//2 - 130, back_y, 260, 40, GRAY, HOVER_GRAY, "BACK_MENU"))
 
+    def slot_summary(self, entry):
+        """Index özetinden slot kartı satırları (eski kayıtlarda gemi/tarih olmayabilir)."""
+        lines = [f"Score: {entry['score']}", f"Cash: ${entry['cash']}"]
+        ship = SHIP_NAMES[entry["ship"]] if entry.get("ship") is not None else "---"
+        minutes = int(entry.get("playtime") or 0) // 60
+        lines.append(f"{ship}  {minutes // 60}h {minutes % 60:02d}m")
+        if entry.get("timestamp"): lines.append(time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["timestamp"])))
+        return "\n".join(lines)
+
     def wipe_save_data(self, save_to_disk=True):
         """Verileri sıfırlar (New Game)."""
-        self.money = 0; self.score = 0
+        self.money = 0; self.score = 0; self.playtime = 0.0
         self.stats = {
             'upgrade_hp': 0, 'upgrade_dmg': 0, 'upgrade_speed': 0, 'upgrade_firerate': 0,
             
@@ -958,141 +1330,409 @@ class Game:
 
     def load_data(self):
         filename = self.get_save_path(f"save_{self.current_slot}.json")
-        if os.path.exists(filename):
+        if self.saves.exists(filename):
             try:
-                with open(filename, "r") as f:
-                    data = json.load(f)
-                    self.money = data.get("money", 0)
-                    self.score = data.get("score", 0)
-                    self.next_boss_score = (self.score // 2000 + 1) * 2000
-                    self.stats.update(data.get("stats", {}))
-                    self.volume_level = data.get("volume", 1.0)
-                    self.keys.update(data.get("keys", {}))
-                    
-                    # --- BAŞARIMLARI YÜKLEME ---
-                    # 1. Önce hafızadaki tüm başarımları kilitle (Eski slotun kalıntılarını temizle)
-                    for ach in self.achievement_manager.achievements:
-                        ach.unlocked = False
-                    
-                    # 2. Dosyadaki listeyi çek
-                    saved_ids = data.get("achievements", [])
-                    
-                    # 3. Listede olanları aç
-                    for ach in self.achievement_manager.achievements:
-                        if ach.id in saved_ids:
-                            ach.unlocked = True
-                    # ---------------------------
+                data = self.saves.load(filename)
+                self.money = data.get("money", 0)
+                self.score = data.get("score", 0)
+                self.playtime = data.get("playtime", 0)
+                self.next_boss_score = (self.score // 2000 + 1) * 2000
+                self.stats.update(data.get("stats", {}))
+                self.volume_level = data.get("volume", 1.0)
+                self.keys.update(data.get("keys", {}))
+                
+                # --- BAŞARIMLARI YÜKLEME ---
+                # 1. Önce hafızadaki tüm başarımları kilitle (Eski slotun kalıntılarını temizle)
+                for ach in self.achievement_manager.achievements:
+                    ach.unlocked = False
+                
+                # 2. Dosyadaki listeyi çek
+                saved_ids = data.get("achievements", [])
+                
+                # 3. Listede olanları aç
+                for ach in self.achievement_manager.achievements:
+                    if ach.id in saved_ids:
+                        ach.unlocked = True
+                # ---------------------------
 
-                    print(f"Slot {self.current_slot} yüklendi.")
+                print(f"Slot {self.current_slot} yüklendi.")
             except: print("Yükleme Hatası")
         else: self.wipe_save_data(save_to_disk=False)
 
     def save_autosave(self):
         """Sadece otomatik yedekleme dosyasına (autosave.json) kayıt yapar."""
         filename = self.get_save_path("autosave.json")
-        unlocked_ids = [ach.id for ach in self.achievement_manager.achievements if ach.unlocked]
-        data = {
-            "money": self.money, "score": self.score, "stats": self.stats,
-            "volume": self.volume_level, "keys": self.keys,
-            "achievements": unlocked_ids
-        }
-        try:
-            with open(filename, "w") as f:
-                json.dump(data, f)
-            # Konsola yazmaya gerek yok, sessizce halletsin
-        except: pass
+        data = self.save_snapshot()
+        data["journal_seq"] = self.journal.seq # Bu kayıt bu olaya kadar her şeyi içerir (günlük sıkıştırma)
+        self.write_save(filename, data)
 
     def save_data(self):
         filename = self.get_save_path(f"save_{self.current_slot}.json")
+        self.write_save(filename, self.save_snapshot()) # Hatalar SaveWriter.poll() ile bildirilir
+
+    def write_save(self, filename, data):
+        """Kayıt ve silme buradan geçer: slot index'i dosya yazılmadan önce güncellenir."""
+        self.slot_index.record(filename, data)
+        if data is None: self.saves.remove(filename)
+        else: self.saves.submit(filename, data)
+
+    def save_snapshot(self):
+        """Kaydedilecek verinin kopyası: yazıcı iş parçacığı oyun sürerken değişen sözlükleri görmemeli."""
         unlocked_ids = [ach.id for ach in self.achievement_manager.achievements if ach.unlocked]
-        data = {
-            "money": self.money, "score": self.score, "stats": self.stats,
-            "volume": self.volume_level, "keys": self.keys,
-            "achievements": unlocked_ids
+        return {
+            "money": self.money, "score": self.score, "stats": dict(self.stats),
+            "volume": self.volume_level, "keys": dict(self.keys),
+            "achievements": unlocked_ids,
+            "ship": self.player_type, "playtime": round(self.playtime), "saved_at": time.time()
         }
-        try:
-            with open(filename, "w") as f: json.dump(data, f)
-        except: print("Kaydetme Hatası")
 
     def spawn_player(self):
         self.player = Player(self.player_type, self.stats, self.keys)
         self.all_sprites.add(self.player)
 
-    def draw_text(self, text, font, color, x, y, center=True):
-        surf = font.render(text, True, color)
+    def render_text(self, text, font, color):
+        """Aynı yazıyı her karede tekrar render etmemek için önbellekten döner."""
+        key = (text, id(font), color)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            if len(self.text_cache) > 256: self.text_cache.clear() # Skor gibi sürekli değişen yazılar şişirmesin
+            surf = self.text_cache[key] = font.render(text, True, color)
+        return surf
+
+    def draw_text(self, text, font, color, x, y, center=True, surface=None):
+        surf = self.render_text(text, font, color)
         rect = surf.get_rect()
         if center: rect.center = (x, y)
         else: rect.topleft = (x, y)
-        self.screen.blit(surf, rect)
-
-    def screen_shake(self):
-        if self.shake_time > 0:
-            self.shake_time -= 1
-            return random.randint(-8, 8), random.randint(-8, 8)
-        return 0, 0
-
-    def draw_store_screen(self):
-        self.grid.draw(self.screen)
-        self.draw_text("WEAPON STORE", self.font_title, BLUE, WIDTH//2, 60)
-        self.draw_text(f"Money: ${self.money}", self.font_large, YELLOW, WIDTH//2, 110)
-        
+        (surface or self.screen).blit(surf, rect)
+
+    def draw_ui_layer(self, name, key, build):
+        """Menü ekranlarının widget katmanı: sadece hover/seçim/durum değişince yeniden çizilir."""
+        layer = self.ui_layers.get(name)
+        if layer is None: layer = self.ui_layers[name] = UILayer()
+        if key != layer.key: self.dirty.mark_full() # Katman yeniden oluşturulacak
+        self.screen.blit(layer.get(key, self.screen.get_size(), build), (0, 0))
+
+
+    def draw_leaderboard(self):
+        view = self.leaderboard_view
+        name = LEADERBOARD_VIEWS[view]
+        if name == "RECENT RUNS": runs = self.history.top(recent=True)
+        else: runs = self.history.top(ship=None if view == 0 else view - 1) # İndeksten okunur, sonuç önbellekte
+        def build(layer):
+            self.draw_text("LEADERBOARD", self.font_title, WHITE, WIDTH//2, 60, surface=layer)
+            self.draw_text(f"< {name} >", self.font_large, ELECTRIC_CYAN, WIDTH//2, 130, surface=layer)
+            columns = ((60, "#"), (180, "SCORE"), (290, "SHIP"), (400, "COMBO"), (480, "BOSS"), (570, "TIME"), (690, "DATE"))
+            for x, title in columns: self.draw_text(title, self.font_small, GRAY, x, 180, surface=layer)
+            if not runs: self.draw_text("No runs recorded yet", self.font_small, GRAY, WIDTH//2, 300, surface=layer)
+            for i, run in enumerate(runs):
+                minutes, seconds = divmod(int(run["duration"]), 60)
+                cells = (str(i + 1), str(run["score"]), SHIP_NAMES[run["ship"]], f"x{run['max_combo']}", str(run["bosses"]),
+                         f"{minutes}:{seconds:02d}", time.strftime("%d.%m.%y", time.localtime(run["ended_at"])))
+                color = YELLOW if i == 0 and name != "RECENT RUNS" else WHITE
+                for (x, _), text in zip(columns, cells): self.draw_text(text, self.font_small, color, x, 215 + i * 28, surface=layer)
+            for btn in self.leaderboard_buttons: btn.draw(layer, self.font_large)
+        key = (view, self.history.version) + tuple(btn.state_key(self.font_large) for btn in self.leaderboard_buttons)
+        self.draw_ui_layer("LEADERBOARD", key, build)
+
+    def refresh_store_buttons(self):
+        """Market buton metin/renklerini statlara göre ayarlar. Sadece statlar değişince çağrılır."""
+        # action_code -> (sahiplik anahtarı, takılı anahtarı, kısa ad, satın alma yazısı)
+        special_items = {
+            "BUY_DOUBLE": ('double_shot', 'active_double', "DOUBLE", "DOUBLE SHOT - $500"),
+            "BUY_DRONE": ('has_drone', 'active_drone', "DRONE", "ATTACK DRONE - $1000"),
+            "BUY_MISSILE": ('has_missiles', 'active_missile', "MISSILE", "HOMING MISSILES - $1500"),
+        }
         for btn in self.store_buttons:
+            btn.disabled = False
             
             # --- TİP A: TEK SEFERLİK ÖZEL EŞYALAR (Toggle Mantığı) ---
-            if btn.action_code in ["BUY_DOUBLE", "BUY_DRONE", "BUY_MISSILE"]:
-                
-                # 1. DOUBLE SHOT
-                if btn.action_code == "BUY_DOUBLE":
-                    if self.stats['double_shot']: # Satın alınmışsa
-                        btn.disabled = False
-                        if self.stats.get('active_double', True): # Takılıysa
-                            btn.text = "UNEQUIP DOUBLE" 
-                            btn.base_color = (100, 50, 50) 
-                        else:
-                            btn.text = "EQUIP DOUBLE"   
-                            btn.base_color = (50, 100, 50) 
-                    else: 
-                        btn.text = "DOUBLE SHOT - $500"
-                        btn.base_color = PURPLE
-                        btn.disabled = False
-
-                # 2. DRONE
-                elif btn.action_code == "BUY_DRONE":
-                    if self.stats['has_drone']:
-                        btn.disabled = False
-                        if self.stats.get('active_drone', True):
-                            btn.text = "UNEQUIP DRONE" 
-                            btn.base_color = (100, 50, 50)
-                        else:
-                            btn.text = "EQUIP DRONE"  
-                            btn.base_color = (50, 100, 50)
+            if btn.action_code in special_items:
+                owned_key, active_key, short_name, buy_text = special_items[btn.action_code]
+                if self.stats[owned_key]: # Satın alınmışsa
+                    if self.stats.get(active_key, True): # Takılıysa
+                        btn.text = f"UNEQUIP {short_name}"
+                        btn.base_color = (100, 50, 50)
                     else:
-                        btn.text = "ATTACK DRONE - $1000"
-                        btn.base_color = PURPLE
-                        btn.disabled = False
-
-                # 3. MISSILE
-                elif btn.action_code == "BUY_MISSILE":
-                    if self.stats['has_missiles']:
-                        btn.disabled = False
-                        if self.stats.get('active_missile', True):
-                            btn.text = "UNEQUIP MISSILE" 
-                            btn.base_color = (100, 50, 50)
-                        else:
-                            btn.text = "EQUIP MISSILE"   
-                            btn.base_color = (50, 100, 50)
-                    else:
-                        btn.text = "HOMING MISSILES - $1500"
-                        btn.base_color = PURPLE
-                        btn.disabled = False
+                        btn.text = f"EQUIP {short_name}"
+                        btn.base_color = (50, 100, 50)
+                else:
+                    btn.text = buy_text
+                    btn.base_color = PURPLE
             
             # --- TİP B: STANDART GELİŞTİRMELER ---
             else:
-                btn.disabled = False
                 btn.base_color = BLUE 
 
-            # Çizim işlemi
-            btn.draw(self.screen, self.font_small, self.money)
+    def draw_game_screen(self, shake_x, shake_y):
+        """Oyun sahnesi: her şey katmanlara toplanır, katman başına tek blits çağrısıyla çizilir."""
+        layers = self.layers
+        cam = self.camera
+        ox, oy = cam.offset
+        view_rect = cam.view_rect
+        player = self.player
+        
+        # 1. Arka plan: ızgara (kamera kaydırması + titreşim) ve yıldızlar (ekran uzayında)
+        g = self.grid.grid_size
+        layers.add_draw("background", lambda s: self.grid.draw(s, shake_x - int(cam.x) % g, shake_y - int(cam.y) % g))
+        layers.add_draw("background", lambda s: self.stars.draw(s, shake_x, shake_y))
+        
+        # 2. Oyuncu izi (Trail)
+        if player and len(player.trail) > 1:
+            trail = player.trail[-(self.governor.tier["trail"] or len(player.trail)):]
+            shaken_trail = [(tx + ox, ty + oy) for tx, ty in trail]
+            layers.add_draw("trails", lambda s: pygame.draw.lines(s, player.color, False, shaken_trail, 3))
+        
+        # 3. EMP (Ulti) efekti
+        if self.emp_active and player:
+            center_pos = (player.rect.centerx + ox, player.rect.centery + oy)
+            radius = int(self.emp_radius)
+            def draw_emp(s):
+                pygame.draw.circle(s, ELECTRIC_CYAN, center_pos, radius, 5)
+                pygame.draw.circle(s, WHITE, center_pos, radius - 5, 2)
+            layers.add_draw("effects", draw_emp)
+        
+        # 4. Sprite'lar kendi katmanlarına (gemi, mermi, parçacık); görüş alanı dışındakiler hiç eklenmez
+        for spr in self.all_sprites: 
+            if view_rect.colliderect(spr.rect):
+                # Kamera kaydırması konuma eklenir (Sprite'ın kendi rect'ini bozmuyoruz)
+                layers.add(spr.layer, spr.image, (spr.rect.x + ox, spr.rect.y + oy))
+        
+        # 5. Drone
+        if player and player.has_drone and player.visible:
+            dx = player.rect.centerx + math.cos(math.radians(player.drone_angle))*40 + ox
+            dy = player.rect.centery + math.sin(math.radians(player.drone_angle))*40 + oy
+            layers.add_draw("effects", lambda s: pygame.draw.circle(s, CYAN, (int(dx), int(dy)), 5))
+        
+        # 6. Uçan Yazılar (Floating Text)
+        for txt in self.texts: 
+            if view_rect.colliderect(txt.rect):
+                layers.add("text", txt.image, (txt.rect.x + ox, txt.rect.y + oy))
+        
+        # 7. HUD (ekran uzayında, kameradan etkilenmez)
+        if player: layers.add_draw("hud", self.draw_hud)
+        
+        # Dünya katmanları kameranın yüzeyine, HUD doğrudan ekrana.
+        # Bloom zoom'dan önce (küçük yüzeyde) uygulanır; HUD parlamadan etkilenmez
+        timer = self.frame_timer
+        world = cam.begin(self.screen)
+        sink = canvas = None
+        if self.display.textured:
+            # Sprite'lar renderer'da doku kopyası olarak (zoom dahil) çizilir, HUD üstteki saydam katmana;
+            # sprite'lardan sonraki katmanların ilkel çizimleri kendi tuvallerine (katman sırası korunur)
+            sink = lambda batch: self.display.blits(batch, cam.zoom)
+            canvas = self.display.canvas
+        layers.flush(world, ("background",), sink); timer.lap("background")
+        layers.flush(world, RenderLayers.WORLD[1:], sink, canvas); timer.lap("sprites")
+        self.bloom.apply(world); timer.lap("bloom")
+        cam.end(self.screen); timer.lap("sprites")
+        layers.flush(self.display.hud() if self.display.textured else self.screen, ("hud",)); timer.lap("hud")
+
+    def draw_hud(self, surface):
+        player = self.player
+        pygame.draw.rect(surface, GRAY, (20, 20, 200, 20), border_radius=5)
+        hp_pct = max(0, player.hp / player.max_hp)
+        hp_col = GREEN if hp_pct > 0.5 else (ORANGE if hp_pct > 0.2 else RED)
+        pygame.draw.rect(surface, hp_col, (20, 20, 200 * hp_pct, 20), border_radius=5)
+        ulti_pct = player.ulti_power / player.max_ulti
+        pygame.draw.rect(surface, GRAY, (20, 45, 150, 10), border_radius=3)
+        pygame.draw.rect(surface, ULTI_COLOR, (20, 45, 150 * ulti_pct, 10), border_radius=3)
+        if ulti_pct >= 1: u_key = pygame.key.name(self.keys['ULTI']).upper(); self.draw_text(f"ULTI READY [{u_key}]", self.font_small, ULTI_COLOR, 95, 65, surface=surface)
+        if player.shield_active:
+            shield_time_pct = max(0, player.shield_timer / player.max_shield_time)
+            pygame.draw.rect(surface, BLACK, (20, 80, 200, 8)) 
+            pygame.draw.rect(surface, SHIELD_BLUE, (20, 80, 200 * shield_time_pct, 8)) 
+            self.draw_text("SHIELD ACTIVE", self.font_small, SHIELD_BLUE, 120, 95, surface=surface)
+        self.draw_text(f"HP: {int(player.hp)}", self.font_small, WHITE, 230, 30, False, surface=surface)
+        self.draw_text(f"SCORE: {self.score}", self.font_large, WHITE, WIDTH - 120, 30, surface=surface)
+        self.draw_text(f"${self.money}", self.font_large, YELLOW, WIDTH - 120, 70, surface=surface)
+        if self.combo_count > 1: self.draw_text(f"x{self.combo_count}", self.font_title, CYAN, WIDTH - 60, 150, surface=surface)
+        dash_cd_pct = 1 - (player.dash_cooldown / 120)
+        if dash_cd_pct >= 1: d_key = pygame.key.name(self.keys['DASH']).upper(); self.draw_text(f"DASH READY [{d_key}]", self.font_small, CYAN, WIDTH//2, HEIGHT-30, surface=surface)
+        if self.boss: self.boss.draw_health(surface)
+        
+        self.achievement_manager.draw_notification(surface, WIDTH, HEIGHT)
+
+    def draw_store_screen(self):
+        self.grid.draw(self.screen)
+        
+        # Metinler sadece satın alma/tak-çıkar sonrası güncellenir, her karede değil
+        signature = tuple(self.stats.get(k, True) for k in ('double_shot', 'active_double', 'has_drone', 'active_drone', 'has_missiles', 'active_missile'))
+        if signature != self._store_signature:
+            self.refresh_store_buttons()
+            self._store_signature = signature
+
+        def build(layer):
+            self.draw_text("WEAPON STORE", self.font_title, BLUE, WIDTH//2, 60, surface=layer)
+            self.draw_text(f"Money: ${self.money}", self.font_large, YELLOW, WIDTH//2, 110, surface=layer)
+            for btn in self.store_buttons: btn.draw(layer, self.font_small, self.money)
+
+        key = (self.money,) + tuple(btn.state_key(self.font_small, self.money) for btn in self.store_buttons)
+        self.draw_ui_layer("STORE", key, build)
+
+    def mark_background_dirty(self, shake_x, shake_y):
+        """Dirty-rect modu: durum geçişi, titreşim ve kayan ızgara/yıldız bantlarını işaretler."""
+        cam = self.camera
+        bloom = self.bloom.enabled and self.state in ("GAME", "DYING") # Parlama tüm sahneye yayılır
+        if bloom or self.state != self.last_drawn_state or shake_x or shake_y or cam.shake_time > 0 or cam.moved or cam.zoom != 1.0:
+            self.dirty.mark_full()
+            self.last_drawn_state = self.state
+        if self.grid.offset_y != self.last_grid_offset:
+            self.dirty.mark_many(self.grid.line_rects(shake_y))
+            self.last_grid_offset = self.grid.offset_y
+        if self.state in ("MENU", "GAME", "DYING"):
+            self.dirty.mark_many(self.stars.rects(shake_x, shake_y))
+
+    def mark_game_dirty(self):
+        """Dirty-rect modu: sprite'lar, efektler ve sadece değeri değişen HUD bölgeleri."""
+        d = self.dirty
+        ox, oy = self.camera.offset
+        d.mark_many(spr.rect.move(ox, oy) for spr in self.all_sprites)
+        d.mark_many(txt.rect.move(ox, oy) for txt in self.texts)
+        p = self.player
+        if p:
+            if len(p.trail) > 1:
+                # Kademe izi kısaltsa da tüm iz işaretlenir (eski noktaların silinmesi için)
+                xs = [t[0] for t in p.trail]; ys = [t[1] for t in p.trail]
+                d.mark((min(xs) - 3 + ox, min(ys) - 3 + oy, max(xs) - min(xs) + 6, max(ys) - min(ys) + 6))
+            if self.emp_active:
+                r = int(self.emp_radius) + 5
+                d.mark((p.rect.centerx - r + ox, p.rect.centery - r + oy, r * 2, r * 2))
+            if p.has_drone: d.mark(p.rect.inflate(100, 100).move(ox, oy))
+            
+            hud = (int(p.hp), p.ulti_power, p.shield_active, p.shield_timer, self.score, self.money, self.combo_count,
+                   p.dash_cooldown == 0, self.boss.hp if self.boss else None, self.boss.phase if self.boss else None)
+            if hud != self.hud_signature:
+                self.hud_signature = hud
+                d.mark_many([(15, 15, 300, 95), (WIDTH - 260, 0, 260, 200), (WIDTH//2 - 150, HEIGHT - 45, 300, 30)])
+                d.mark((WIDTH//2 - 255, 5, 510, 35)) # Boss barı (belirip kaybolması dahil)
+        if self.achievement_manager.queue: d.mark((WIDTH - 345, HEIGHT - 105, 345, 105))
+
+    def idle_timeout(self):
+        """Boştaysa kare başına beklenecek süre (ms), tam hızda çalışılacaksa 0."""
+        if self.window_minimized: return 500
+        if self.paused or self.state == "GAMEOVER": return 250
+        if self.state in MENU_STATES:
+            if not self.window_focused or time.time() - self.last_input_time > IDLE_DELAY:
+                return 1000 // IDLE_FPS
+        return 0
+
+    def throttle(self):
+        """Kare sonu bekleme: boşta event.wait ile uyur, girdi gelince anında tam hıza döner."""
+        timeout = self.idle_timeout()
+        if timeout:
+            event = pygame.event.wait(timeout)
+            # Uyandıran olayı kaybetmemek için kuyruğa geri koy
+            if event.type != pygame.NOEVENT: pygame.event.post(event)
+            self.clock.tick() # Bekleme süresi bir sonraki karede "gecikme" sanılmasın
+        else:
+            self.clock.tick(FPS)
+
+    def notify(self, text, color, error=False):
+        """Kayıt gibi arka plan işlerinin kısa bildirimi (oyundaysa ekranda); konsola sadece hatalar yazılır."""
+        if error: print(text)
+        if self.state == "GAME": self.texts.add(FloatingText(text, WIDTH//2, 80, color, 18, vy=0, life=90))
+
+    def toggle_recording(self):
+        if self.recorder.recording:
+            self.recorder.stop(); self.notify("RECORDING OFF", GRAY)
+            return
+        # Doku arka ucunda sprite'lar yazılımsal yüzeye hiç çizilmez: kayıt eksik olurdu
+        error = "SURFACE BACKEND REQUIRED" if self.display.textured else self.recorder.start(self.screen)
+        if error: self.notify(f"RECORDING UNAVAILABLE: {error}", RED, error=True)
+        else: self.notify(f"RECORDING (LAST {self.recorder.seconds}s) - F10 TO SAVE", ORANGE)
+
+    def emit(self, *signals):
+        """Başarım sinyalleri; sadece oyun sürerken (menü marketindeki alımlar oyun başında kontrol edilir)."""
+        if self.state not in ("GAME", "MARKET_INGAME"): return
+        for signal in signals: self.achievement_manager.emit(signal, self)
+
+    def dump_frame_times(self):
+        """F4: ölçülen son karelerin aşama sürelerini CSV olarak kayıt klasörüne yazar."""
+        if not self.frame_timer.count: self.notify("FRAME TIMING OFF (F3)", RED); return
+        out_dir = self.get_save_path("timings")
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+        try: self.notify(f"{self.frame_timer.dump_csv(path)} FRAMES -> {os.path.basename(path)}", GREEN)
+        except OSError as e: self.notify(f"CSV FAILED: {e}", RED, error=True)
+
+    def profile_label(self):
+        """Profilleyici iş parçacığından okunur: yığının kökü olan durum adı (boss sırasında faz da eklenir)."""
+        state, boss = self.state, self.boss
+        if boss is not None and state in ("GAME", "DYING", "MARKET_INGAME"): return f"{state};boss_phase_{boss.phase}"
+        return state
+
+    def toggle_profiler(self):
+        """F6: profillemeyi başlatır; ikinci basışta durdurur ve collapsed-stack dosyasını yazar."""
+        if not self.profiler.running:
+            self.profiler.start(); self.notify(f"PROFILING @ {self.options.profile_rate} HZ - F6 TO STOP", ORANGE)
+            return
+        self.profiler.stop()
+        if not self.profiler.samples: self.notify("PROFILE EMPTY", GRAY); return
+        out_dir = self.get_save_path("profiles")
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, time.strftime("profile_%Y%m%d_%H%M%S.folded"))
+        try: self.notify(f"{self.profiler.write(path)} SAMPLES -> {os.path.basename(path)}", GREEN)
+        except OSError as e: self.notify(f"PROFILE FAILED: {e}", RED, error=True)
+
+    def memory_sources(self):
+        """Bellek izleyicisinin ölçtüğü gruplar ve kategorilere ayrılmış yüzeyler."""
+        groups = {"all_sprites": self.all_sprites, "enemies": self.enemies, "bullets": self.bullets,
+                  "boss_bullets": self.boss_bullets, "particles": self.particles, "powerups": self.powerups, "texts": self.texts}
+        logical = (self.enemies, self.bullets, self.boss_bullets, self.particles, self.powerups)
+        surfaces = {
+            "sprites": [spr.image for spr in self.all_sprites],
+            "text": [txt.image for txt in self.texts] + list(self.text_cache.values()),
+            "ui": [layer.surface for layer in self.ui_layers.values()],
+            "frame": [self.screen, self.display.surface, getattr(self.display, "overlay", None), self.camera.view_surface],
+            "bloom": list(self.bloom.buffers[1:]) if self.bloom.buffers else [],
+        }
+        return groups, logical, (self.player, self.boss), surfaces
+
+    def end_run(self):
+        """Süren oyunu geçmişe yazar (GAMEOVER, menüye dönüş veya oyun sırasında çıkış); her oyun bir kez."""
+        if not self.run_open: return
+        self.run_open = False
+        self.history.record(ship=self.player_type, score=self.score - self.run_start_score, max_combo=self.max_combo,
+                            bosses=self.bosses_killed, duration=round(self.run_time, 1),
+                            level_mult=self.level_mult, purchases=self.run_purchases)
+
+    def pan_for(self, x):
+        """Dünya x koordinatını görüş alanına göre stereo konuma (-1 sol .. 1 sağ) çevirir."""
+        view = self.camera.view_rect
+        return max(-1.0, min(1.0, (x - view.x) / view.w * 2 - 1))
+
+    def music_intensity(self):
+        """Müzik yoğunluğu (0..1): seviye çarpanı, combo ve boss (öfke fazı) ile artar."""
+        if self.state not in ("GAME", "DYING"): return 0.1
+        intensity = 0.35 + min(0.25, (self.level_mult - 1) * 0.1) + min(0.2, self.combo_count * 0.02)
+        if self.boss: intensity += 0.35 if self.boss.phase == 2 else 0.2
+        return min(1.0, intensity)
+
+    def apply_quality(self):
+        """Kalite kademesinin görsel ayarlarını yıldızlara, parlamaya ve kameraya uygular."""
+        tier = self.governor.tier
+        if self.governor.level > self.quality_level: self.bloom.raise_ceiling()
+        self.quality_level = self.governor.level
+        self.stars.density = tier["stars"]
+        self.camera.shake_strength = max(2, int(8 * tier["shake"]))
+        levels = Bloom.LEVELS
+        bloom = levels[min(levels.index(self.bloom_setting), levels.index(tier["bloom"]))]
+        if bloom != self.bloom.quality: self.bloom.set_quality(bloom)
+        self.dirty.mark_full()
+
+    def add_effect_text(self, *args, **kwargs):
+        """Savaş yazıları (CRIT, combo, +$) kademenin yazı bütçesi doluysa atlanır; menü mesajları etkilenmez."""
+        limit = self.governor.tier["texts"]
+        if limit is None or len(self.texts) < limit: self.texts.add(FloatingText(*args, **kwargs))
+
+    def spawn_particles(self, x, y, color, count=1, speed_mult=1.0):
+        """Parçacıkları oluştururken bir kez iki gruba da ekler (her karede yeniden eklemek yerine)."""
+        # Parçacıklar tamamen görsel: kalite kademesine göre azaltılır (en az bir tane kalır)
+        count = max(1, round(count * self.governor.tier["particles"]))
+        for _ in range(count):
+            p = Particle(x, y, color, speed_mult)
+            self.particles.add(p); self.all_sprites.add(p)
 
     def get_closest_enemy(self, sprite):
         closest = None
@@ -1117,16 +1757,20 @@ class Game:
         self.texts = pygame.sprite.Group()
         
         self.player = None; self.boss = None
+        # Kamera: kaydırma, titreşim (shake), zoom ve ekran dışı ayıklama
+        self.camera = Camera((WIDTH, HEIGHT), (ARENA_WIDTH, ARENA_HEIGHT), self.options.zoom)
+        self.apply_quality()
         # Skoru koru, yoksa 0 yap
         self.score = getattr(self, 'score', 0) 
         self.level_mult = 1.0; self.kill_counter = 0
         self.game_over_timer = 0; self.paused = False
         self.combo_count = 0; self.combo_timer = 0; self.max_combo = 0 
+        self.bosses_killed = 0; self.run_purchases = 0; self.run_time = 0.0 # Oyun geçmişi için
+        self.run_open = False; self.run_start_score = self.score # SELECT'ten GAME'e geçince açılır, end_run() ile bir kez kaydedilir
         self.emp_active = False; self.emp_radius = 0; self.emp_targets = []
 
         # --- BAŞARIM & OTO-KAYIT ---
-        self.boss_just_killed = False     
-        self.last_shot_time = time.time() 
+        self.last_shot_time = 0.0 # Simülasyon zamanı (run_time), duraklatmada ilerlemez
         self.last_ulti_kill_count = 0     
         self.autosave_timer = 0
         self.autosave_interval = 60 * FPS
@@ -1134,29 +1778,36 @@ class Game:
 
     def run(self):
         running = True
+        self.gc_policy.freeze() # Açılışta yüklenenler (font, ses, buton) tam toplamalarda taranmaz
         while running:
-            mouse_pos = pygame.mouse.get_pos()
+            self.frame_timer.begin(); self.gc_policy.begin()
+            if self.display.update():
+                self.screen = self.display.surface
+                self.dirty.mark_full(); self.pause_drawn = False
+            mouse_pos = self.display.mouse_pos()
             mouse_clicked = False
             
             for event in pygame.event.get():
                 if event.type == pygame.VIDEORESIZE:
-                    # 1. Global genişlik ve yüksekliği güncelle
-                    global WIDTH, HEIGHT
-                    WIDTH, HEIGHT = event.w, event.h
-                    
-                    # 2. Ekranı yeni boyuta göre ayarla
-                    self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
-                    
-                    # 3. Arka plan elemanlarını (Yıldızlar, Izgara) yeni alana yay
-                    self.stars = [Star() for _ in range(int(WIDTH * HEIGHT / 12000))] 
-                    self.grid = CyberGrid() 
-                    
-                    # 4. Butonları yeni merkeze taşı
-                    self.create_all_buttons()
-                    
-                    # 5. Oyuncu ekran dışı kaldıysa içeri çek
-                    if self.player:
-                        self.player.rect.clamp_ip(self.screen.get_rect())
+                    # Mantıksal çözünürlük sabit: sadece sunum ölçeği değişir.
+                    # Sürükleme sırasında gelen onlarca olay birleştirilip bir kez uygulanır.
+                    self.display.request_resize(event.size)
+
+                if event.type in INPUT_EVENTS:
+                    self.last_input_time = time.time()
+
+                # --- PENCERE DURUMU (Odak / Simge durumu) ---
+                if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                    if event.type == pygame.WINDOWFOCUSLOST: self.window_focused = False
+                    else: self.window_minimized = True
+                    # Oyun arka plandayken kendi kendine oynamasın
+                    if self.state == "GAME" and not self.paused:
+                        self.paused = True; self.pause_drawn = False
+                elif event.type == pygame.WINDOWFOCUSGAINED:
+                    self.window_focused = True; self.last_input_time = time.time()
+                elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWEXPOSED):
+                    self.window_minimized = False; self.pause_drawn = False
+                    self.dirty.mark_full()
 
                 if event.type == pygame.QUIT:
                     # Çıkarken sadece oyun içindeysek otomatik kaydedelim
@@ -1167,6 +1818,19 @@ class Game:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     mouse_clicked = True
                 
+                if event.type == pygame.KEYDOWN and self.state != "BINDING_KEY":
+                    # --- OYNANIŞ KAYDI (her ekranda) ---
+                    if event.key == pygame.K_F9: self.toggle_recording()
+                    elif event.key == pygame.K_F10:
+                        if self.recorder.save(): self.notify("SAVING CLIP...", ORANGE)
+                    # --- KARE SÜRESİ ÖLÇÜMÜ ---
+                    elif event.key == pygame.K_F3: self.frame_timer.toggle(); self.dirty.mark_full()
+                    elif event.key == pygame.K_F4: self.dump_frame_times()
+                    # --- PROFİLLEME ---
+                    elif event.key == pygame.K_F6: self.toggle_profiler()
+                    # --- BELLEK ---
+                    elif event.key == pygame.K_F7: self.memory.toggle(); self.dirty.mark_full()
+
                 if event.type == pygame.KEYDOWN:
                     
                     # --- TUŞ ATAMA EKRANI ---
@@ -1195,9 +1859,20 @@ class Game:
                             self.state = "SETTINGS"; self.selected_btn_index = 0; self.sound.play("select")
                             continue
 
+                    # --- SKOR TABLOSU ---
+                    if self.state == "LEADERBOARD":
+                        if event.key in [pygame.K_LEFT, pygame.K_a]:
+                            self.leaderboard_view = (self.leaderboard_view - 1) % len(LEADERBOARD_VIEWS); self.sound.play("hover")
+                        elif event.key in [pygame.K_RIGHT, pygame.K_d]:
+                            self.leaderboard_view = (self.leaderboard_view + 1) % len(LEADERBOARD_VIEWS); self.sound.play("hover")
+                        elif event.key in [pygame.K_ESCAPE, pygame.K_RETURN]:
+                            self.state = "MENU"; self.selected_btn_index = 0; self.sound.play("select")
+                        continue
+
                     # --- PAUSE (OYUN İÇİ) ---
                     if event.key == pygame.K_p and self.state == "GAME":
                         self.paused = not self.paused
+                        self.pause_drawn = False
                         
                     if not self.paused:
                         # Menü navigasyonu için buton listesi seçimi
@@ -1248,6 +1923,7 @@ class Game:
                                     self.state = "SLOT_MENU"
                                     self.selected_btn_index = 0
                                 elif btn.action_code == "STORE": self.state = "MARKET_MENU"
+                                elif btn.action_code == "LEADERBOARD": self.state = "LEADERBOARD"
                                 elif btn.action_code == "SETTINGS": 
                                     self.state = "SETTINGS"; self.selected_btn_index = 0
                                 elif btn.action_code == "QUIT": running = False
@@ -1284,10 +1960,10 @@ class Game:
                                     filename = self.get_save_path(f"save_{slot_num}.json")
                                     
                                     if self.slot_operation == "SAVE":
-                                        if os.path.exists(filename): self.pending_slot = slot_num; self.state = "CONFIRM_OVERWRITE"
+                                        if self.saves.exists(filename): self.pending_slot = slot_num; self.state = "CONFIRM_OVERWRITE"
                                         else: self.save_data(); self.state = "MENU"; self.texts.add(FloatingText("GAME SAVED", WIDTH//2, HEIGHT//2, GREEN, 40))
                                     else: # LOAD
-                                        if os.path.exists(filename): self.load_data()
+                                        if self.saves.exists(filename): self.load_data()
                                         else: self.wipe_save_data()
                                         self.reset_game(); self.state = "SELECT"
                                 
@@ -1301,22 +1977,23 @@ class Game:
                                     # SENARYO 2: YÜKLEME MODU (LOAD)
                                     else:
                                         filename = self.get_save_path("autosave.json")
-                                        if os.path.exists(filename):
+                                        if self.saves.exists(filename):
                                             try:
-                                                with open(filename, "r") as f:
-                                                    data = json.load(f)
-                                                    self.money = data.get("money", 0)
-                                                    self.score = data.get("score", 0)
-                                                    self.stats.update(data.get("stats", {}))
-                                                    self.volume_level = data.get("volume", 1.0)
-                                                    self.keys.update(data.get("keys", {}))
+                                                data = self.saves.load(filename)
+                                                self.journal.replay(data) # Son autosave'den sonraki olaylar
+                                                self.money = data.get("money", 0)
+                                                self.score = data.get("score", 0)
+                                                self.playtime = data.get("playtime", 0)
+                                                self.stats.update(data.get("stats", {}))
+                                                self.volume_level = data.get("volume", 1.0)
+                                                self.keys.update(data.get("keys", {}))
                                                     
-                                                    for ach in self.achievement_manager.achievements:
-                                                        ach.unlocked = False
-                                                    saved_ids = data.get("achievements", [])
-                                                    for ach in self.achievement_manager.achievements:
-                                                        if ach.id in saved_ids:
-                                                            ach.unlocked = True
+                                                for ach in self.achievement_manager.achievements:
+                                                    ach.unlocked = False
+                                                saved_ids = data.get("achievements", [])
+                                                for ach in self.achievement_manager.achievements:
+                                                    if ach.id in saved_ids:
+                                                        ach.unlocked = True
                                                 
                                                 print("Otomatik kayıt başarıyla yüklendi.")
                                                 self.sound.play("select")
@@ -1356,8 +2033,7 @@ class Game:
                             if event.key == pygame.K_y: # YES (Onay)
                                 # Dosyayı sil
                                 f_path = self.get_save_path(f"save_{self.pending_slot}.json")
-                                if os.path.exists(f_path):
-                                    os.remove(f_path)
+                                self.write_save(f_path, None)
         
                                 # UI Güncelle ve Bildirim Ver
                                 self.create_slot_buttons() # Slotları yenile (Empty yazsın)
@@ -1395,6 +2071,9 @@ class Game:
                             elif event.key in [pygame.K_RIGHT, pygame.K_d]: self.player_type = (self.player_type + 1) % 4; self.sound.play("hover")
                             elif event.key == pygame.K_RETURN:
                                 self.sound.play("select"); self.reset_game(); self.spawn_player(); self.state = "GAME"
+                                self.achievement_manager.start(self) # Yüklenen kayda göre indeks + tek seferlik kontrol
+                                self.save_autosave(); self.journal.active = True # Günlüğün üstüne yazılacağı başlangıç kaydı
+                                self.run_open = True; self.run_start_score = self.score # Slot skoru birikimli: sadece bu oyunun payı kaydedilir
                             elif event.key == pygame.K_ESCAPE:
                                 # Geri dönünce Slot ekranına at
                                 self.slot_operation = "LOAD"
@@ -1407,7 +2086,8 @@ class Game:
                                  self.state = "MARKET_INGAME"; self.sound.play("select")
                              
                              if event.key == self.keys["MENU"]:
-                                 self.save_autosave()
+                                 self.save_autosave(); self.journal.active = False
+                                 self.end_run() # Menüye dönülen oyun da geçmişe yazılır
                                  self.slot_operation = "SAVE"
                                  self.create_slot_buttons()
                                  self.state = "SLOT_MENU"
@@ -1415,34 +2095,37 @@ class Game:
                                  self.sound.play("select")
 
                              if event.key == self.keys["SHOOT"]:
-                                self.last_shot_time = time.time()
+                                self.last_shot_time = self.run_time; self.emit("shot_fired")
                                 bullets = self.player.shoot()
                                 for b in bullets:
                                     self.all_sprites.add(b); self.bullets.add(b)
                                     if bullets:
                                         s_name = "sniper" if self.player.type == 3 else "laser"
-                                        self.sound.play(s_name)
+                                        self.sound.play(s_name, self.pan_for(self.player.rect.centerx))
                              
                              if event.key == self.keys["ULTI"]:
                                  if self.player.ulti_power >= self.player.max_ulti:
                                      self.player.ulti_power = 0
                                      self.sound.play("ulti")
-                                     self.boss_bullets.empty(); self.emp_active = True; self.emp_radius = 50
+                                     for b in self.boss_bullets: b.kill()
+                                     self.emp_active = True; self.emp_radius = 50
                                      self.emp_targets = list(self.enemies) + ([self.boss] if self.boss else [])
                                      self.last_ulti_kill_count = 0 
                                      for e in self.enemies:
                                          e.hp -= 100
-                                         self.particles.add(Particle(e.rect.centerx, e.rect.centery, CYAN, 2))
+                                         self.spawn_particles(e.rect.centerx, e.rect.centery, CYAN, 1, 2)
                                          if e.hp <= 0:
-                                             self.last_ulti_kill_count += 1
-                                             e.kill(); self.score += e.score_val; self.sound.play("explosion")
+                                             self.last_ulti_kill_count += 1; self.kill_counter += 1
+                                             e.kill(); self.score += e.score_val; self.sound.play("explosion", self.pan_for(e.rect.centerx))
                                      if self.boss:
                                          self.boss.hp -= 200
-                                         self.particles.add(Particle(self.boss.rect.centerx, self.boss.rect.centery, CYAN, 3))
-                                     self.shake_time = 30
-                                     self.texts.add(FloatingText("STORM UNLEASHED!", WIDTH//2, HEIGHT//2, ELECTRIC_CYAN, 40))
+                                         self.spawn_particles(self.boss.rect.centerx, self.boss.rect.centery, CYAN, 1, 3)
+                                     self.camera.shake(30)
+                                     view_cx, view_cy = self.camera.view_rect.center
+                                     self.texts.add(FloatingText("STORM UNLEASHED!", view_cx, view_cy, ELECTRIC_CYAN, 40))
                                      if self.last_ulti_kill_count >= 3:
-                                         self.texts.add(FloatingText(f"{self.last_ulti_kill_count} KILLS!", WIDTH//2, HEIGHT//2 + 40, YELLOW, 30))
+                                         self.texts.add(FloatingText(f"{self.last_ulti_kill_count} KILLS!", view_cx, view_cy + 40, YELLOW, 30))
+                                     self.emit("ulti_resolved")
 
                         elif "MARKET" in self.state:
                             # --- 1. KLAVYE KISAYOLLARI ---
@@ -1479,6 +2162,7 @@ class Game:
                                     continue 
                                 
                                 processed = False # İşlem yapıldı mı bayrağı
+                                money_before = self.money; stats_before = dict(self.stats)
                                 
                                 # --- TİP A: ÖZEL EŞYALAR (Toggle/Buy) ---
                                 
@@ -1569,6 +2253,12 @@ class Game:
                                     self.sound.play("error")
                                 
                                 self.save_data() # Her işlemden sonra kaydet
+                                changed = {k: v for k, v in self.stats.items() if stats_before.get(k) != v}
+                                if self.money != money_before:
+                                    self.run_purchases += 1
+                                    self.emit("purchase", "money_changed")
+                                    self.journal.record("buy", item=btn.action_code, cost=money_before - self.money, money=self.money, stats=changed)
+                                elif changed: self.journal.record("equip", stats=changed)
 
                         elif self.state == "GAMEOVER":
                             if event.key == pygame.K_r:
@@ -1578,12 +2268,21 @@ class Game:
                                 self.selected_btn_index = 0
                                 self.sound.play("select")
 
+            self.frame_timer.lap("events")
             # --- GÜNCELLEME (UPDATE) ---
-            shake_x, shake_y = self.screen_shake()
+            self.camera.update(self.player.rect if self.player and self.player.visible else None)
+            shake_x, shake_y = self.camera.shake_x, self.camera.shake_y
             
             if self.paused:
-                self.draw_text("PAUSED", self.font_title, WHITE, WIDTH//2, HEIGHT//2)
-                pygame.display.flip(); self.clock.tick(FPS); continue
+                # Ekran değişmiyor: bir kez çiz, sonra girdi gelene kadar bekle
+                if not self.pause_drawn:
+                    # Doku arka ucunda yazı sprite'ların üstünde kalsın diye HUD katmanına
+                    hud = self.display.hud() if self.display.textured else self.screen
+                    self.draw_text("PAUSED", self.font_title, WHITE, WIDTH//2, HEIGHT//2, surface=hud)
+                    self.dirty.mark_full(); self.dirty.present(); self.pause_drawn = True
+                self.sound.update()
+                self.gc_policy.set_state("PAUSED"); self.gc_policy.idle() # Duraklatma boş zaman: bekleyen toplama burada
+                self.throttle(); continue
 
             if self.state == "INTRO":
                 self.intro_timer += 1
@@ -1605,10 +2304,11 @@ class Game:
                             self.state = "SLOT_MENU"
                             self.selected_btn_index = 0
                         elif btn.action_code == "STORE": self.state = "MARKET_MENU"
+                        elif btn.action_code == "LEADERBOARD": self.state = "LEADERBOARD"
                         elif btn.action_code == "SETTINGS": self.state = "SETTINGS"; self.selected_btn_index = 0
                         elif btn.action_code == "QUIT": running = False
                 self.grid.update(0.5); 
-                for s in self.stars: s.update(False)
+                self.stars.update(False)
             
             elif self.state == "SLOT_MENU":
                 self.grid.update(0.5)
@@ -1633,10 +2333,10 @@ class Game:
                             self.current_slot = slot_num
                             filename = self.get_save_path(f"save_{slot_num}.json")
                             if self.slot_operation == "SAVE":
-                                if os.path.exists(filename): self.pending_slot = slot_num; self.state = "CONFIRM_OVERWRITE"
+                                if self.saves.exists(filename): self.pending_slot = slot_num; self.state = "CONFIRM_OVERWRITE"
                                 else: self.save_data(); self.state = "MENU"; self.texts.add(FloatingText("GAME SAVED", WIDTH//2, HEIGHT//2, GREEN, 40))
                             else: # LOAD
-                                if os.path.exists(filename): self.load_data()
+                                if self.saves.exists(filename): self.load_data()
                                 else: self.wipe_save_data()
                                 self.reset_game(); self.state = "SELECT"
 
@@ -1647,21 +2347,22 @@ class Game:
                                 self.texts.add(FloatingText("SYSTEM ONLY", btn.rect.centerx, btn.rect.top, RED))
                             else:
                                 filename = self.get_save_path("autosave.json")
-                                if os.path.exists(filename):
+                                if self.saves.exists(filename):
                                     # Yükleme ve Başlatma Mantığı
                                     try:
-                                        with open(filename, "r") as f:
-                                            data = json.load(f)
-                                            self.money = data.get("money", 0)
-                                            self.score = data.get("score", 0)
-                                            self.stats.update(data.get("stats", {}))
-                                            self.volume_level = data.get("volume", 1.0)
-                                            self.keys.update(data.get("keys", {}))
-                                            for ach in self.achievement_manager.achievements:
-                                                ach.unlocked = False
-                                            saved_ids = data.get("achievements", [])
-                                            for ach in self.achievement_manager.achievements:
-                                                if ach.id in saved_ids: ach.unlocked = True
+                                        data = self.saves.load(filename)
+                                        self.journal.replay(data) # Son autosave'den sonraki olaylar
+                                        self.money = data.get("money", 0)
+                                        self.score = data.get("score", 0)
+                                        self.playtime = data.get("playtime", 0)
+                                        self.stats.update(data.get("stats", {}))
+                                        self.volume_level = data.get("volume", 1.0)
+                                        self.keys.update(data.get("keys", {}))
+                                        for ach in self.achievement_manager.achievements:
+                                            ach.unlocked = False
+                                        saved_ids = data.get("achievements", [])
+                                        for ach in self.achievement_manager.achievements:
+                                            if ach.id in saved_ids: ach.unlocked = True
                                         
                                         self.reset_game()
                                         self.state = "SELECT"
@@ -1683,6 +2384,13 @@ class Game:
                         self.sound.play("select"); self.slot_operation = "LOAD"; self.create_slot_buttons(); self.state = "SLOT_MENU"
                 else: self.btn_select_back.selected = False
 
+            elif self.state == "LEADERBOARD":
+                self.grid.update(0.5)
+                for btn in self.leaderboard_buttons:
+                    btn.selected = btn.rect.collidepoint(mouse_pos)
+                    if btn.selected and mouse_clicked:
+                        self.sound.play("select"); self.state = "MENU"; self.selected_btn_index = 0
+
             elif self.state == "SETTINGS":
                 self.grid.update(0.5)
                 for i, btn in enumerate(self.settings_buttons):
@@ -1730,12 +2438,14 @@ class Game:
 
             elif self.state == "GAME" or self.state == "DYING":
                 self.grid.update(2.0 if self.player and self.player.is_dashing else 1.0)
-                for s in self.stars: s.update(True) 
+                self.stars.update(True) 
                 
                 if self.state == "GAME":
+                    self.frame_timer.lap("logic")
+                    self.playtime += 1 / FPS; self.run_time += 1 / FPS
                     if self.emp_active:
                         self.emp_radius += 25 
-                        if self.emp_radius > WIDTH * 1.2: self.emp_active = False; self.emp_targets = []
+                        if self.emp_radius > max(ARENA_WIDTH, ARENA_HEIGHT) * 1.2: self.emp_active = False; self.emp_targets = []
 
                     if self.combo_timer > 0: self.combo_timer -= 1
                     else: self.combo_count = 0
@@ -1751,7 +2461,7 @@ class Game:
                                            self.player.rect.centery + math.sin(math.radians(self.player.drone_angle))*40, 
                                            10, CYAN, vx, vy, (4, 4))
                                 self.bullets.add(b); self.all_sprites.add(b)
-                                self.player.drone_cooldown = 40; self.sound.play("drone")
+                                self.player.drone_cooldown = 40; self.sound.play("drone", self.pan_for(self.player.rect.centerx))
                     
                     if self.player.has_missiles and self.player.missile_cooldown == 0:
                          target = self.get_closest_enemy(self.player)
@@ -1759,13 +2469,14 @@ class Game:
                              b = Bullet(self.player.rect.centerx, self.player.rect.centery, 30, RED, vx=0, vy=-5, size=(8,8), is_missile=True, target=target)
                              self.bullets.add(b); self.all_sprites.add(b)
                              self.player.missile_cooldown = 90; self.sound.play("missile")
+                    self.frame_timer.lap("player")
 
                     if not self.boss:
                         # EĞER SKOR HEDEFİ GEÇTİYSE BOSS GELSİN
                         if self.score >= self.next_boss_score: 
                             self.boss = Boss()
                             self.all_sprites.add(self.boss)
-                            self.enemies.empty() 
+                            for e in self.enemies: e.kill() # empty() sadece bu gruptan çıkarır, all_sprites'ta sahipsiz kalırlardı
                             
                         # Boss gelmediyse normal düşman üretmeye devam et
                         elif len(self.enemies) < 8 + int(self.level_mult) and random.randint(0, 50) == 0:
@@ -1773,7 +2484,7 @@ class Game:
                     
                     for enemy in self.enemies:
                         bullet = enemy.update()
-                        if bullet: self.boss_bullets.add(bullet); self.all_sprites.add(bullet); self.sound.play("enemy_shoot")
+                        if bullet: self.boss_bullets.add(bullet); self.all_sprites.add(bullet); self.sound.play("enemy_shoot", self.pan_for(enemy.rect.centerx))
 
                     # --- BOSS GÜNCELLEME BLOĞU ---
                     if self.boss:
@@ -1792,20 +2503,25 @@ class Game:
                             
                             # 4. Ses Efektleri
                             if len(boss_created_bullets) > 1:
-                                self.sound.play("enemy_shoot") 
+                                self.sound.play("enemy_shoot", self.pan_for(self.boss.rect.centerx))
                             else:
                                 self.sound.play("sniper")
+                    self.frame_timer.lap("enemies")
 
                     self.all_sprites.update(); self.texts.update()
+                    self.frame_timer.lap("movement")
 
                     # --- BAŞARIM VE OTO-KAYIT ---
-                    self.achievement_manager.update(self)
-                    self.boss_just_killed = False 
+                    self.achievement_manager.update(self) # Sadece zamanlı başarımların vakti geldiyse iş yapar
+                    self.frame_timer.lap("achievements")
                     self.autosave_timer += 1
-                    if self.autosave_timer >= self.autosave_interval:
+                    # Günlük çok uzadıysa da tam kayıt alınır (sıkıştırma)
+                    if self.autosave_timer >= self.autosave_interval or self.journal.needs_compaction():
                         self.save_autosave()
                         self.autosave_timer = 0
-                        self.texts.add(FloatingText("AUTO BACKUP", WIDTH - 80, HEIGHT - 30, ORANGE, 14, vy=0, life=60))
+                        view = self.camera.view_rect
+                        self.texts.add(FloatingText("AUTO BACKUP", view.right - 80, view.bottom - 30, ORANGE, 14, vy=0, life=60))
+                    self.frame_timer.lap("autosave")
 
                     # --- GANİMET SİSTEMİ ---
                     hits = pygame.sprite.groupcollide(self.enemies, self.bullets, False, True)
@@ -1816,15 +2532,16 @@ class Game:
                             is_crit = random.random() < 0.15 
                             if is_crit: 
                                 dmg *= 2; self.sound.play("crit")
-                                self.texts.add(FloatingText("CRIT!", enemy.rect.centerx, enemy.rect.top-20, RED, 24, vy=-4))
+                                self.add_effect_text("CRIT!", enemy.rect.centerx, enemy.rect.top-20, RED, 24, vy=-4)
                             
                             enemy.hp -= dmg
                             # Vuruş efekti
-                            for _ in range(3): self.particles.add(Particle(enemy.rect.centerx, enemy.rect.centery, enemy.color))
+                            self.spawn_particles(enemy.rect.centerx, enemy.rect.centery, enemy.color, 3)
                         
                         # Düşman öldü mü?
                         if enemy.hp <= 0:
-                            enemy.kill(); self.sound.play("explosion")
+                            enemy.kill(); self.sound.play("explosion", self.pan_for(enemy.rect.centerx))
+                            self.kill_counter += 1
                             
                             # 1. KOMBO SİSTEMİ
                             self.player.add_ulti(5)
@@ -1833,7 +2550,7 @@ class Game:
                             self.combo_timer = 120 
                             
                             if self.combo_count > 1:
-                                self.texts.add(FloatingText(f"{self.combo_count}x COMBO!", enemy.rect.centerx, enemy.rect.centery - 20, CYAN, 24))
+                                self.add_effect_text(f"{self.combo_count}x COMBO!", enemy.rect.centerx, enemy.rect.centery - 20, CYAN, 24)
                                 if self.combo_count % 5 == 0: self.sound.play("combo")
 
                             # 2. PARA HESAPLAMA
@@ -1852,16 +2569,18 @@ class Game:
                             # 3. JACKPOT (%5 Şansla 3 Katı Para)
                             if random.random() < 0.05:
                                 coin_amount *= 3
-                                self.texts.add(FloatingText("JACKPOT!", enemy.rect.centerx, enemy.rect.top - 40, YELLOW, 30, vy=-3))
+                                self.add_effect_text("JACKPOT!", enemy.rect.centerx, enemy.rect.top - 40, YELLOW, 30, vy=-3)
                                 self.sound.play("coin") 
 
                             # Parayı Cüzdana Ekle
                             self.money += coin_amount
                             self.sound.play("coin")
-                            self.texts.add(FloatingText(f"+${coin_amount}", enemy.rect.centerx, enemy.rect.centery, YELLOW))
+                            self.add_effect_text(f"+${coin_amount}", enemy.rect.centerx, enemy.rect.centery, YELLOW)
                             
                             # Skoru Ekle
                             self.score += int(enemy.score_val * multiplier)
+                            self.journal.record("coin", amount=coin_amount, money=self.money, score=self.score)
+                            self.emit("kill", "money_changed")
 
                             # 4. POWERUP (Can/Kalkan) Düşürme Şansı
                             if random.random() < 0.15: 
@@ -1874,28 +2593,32 @@ class Game:
                             dmg = b.damage
                             if random.random() < 0.15: 
                                 dmg *= 2; self.sound.play("crit")
-                                self.texts.add(FloatingText("CRIT!", self.boss.rect.centerx + random.randint(-40,40), self.boss.rect.centery, RED, 30, vy=-5))
+                                self.add_effect_text("CRIT!", self.boss.rect.centerx + random.randint(-40,40), self.boss.rect.centery, RED, 30, vy=-5)
                             self.boss.hp -= dmg; self.sound.play("boss_hit")
-                            self.particles.add(Particle(b.rect.centerx, b.rect.y, YELLOW))
+                            self.spawn_particles(b.rect.centerx, b.rect.y, YELLOW)
                         if self.boss.hp <= 0:
+                            boss_center = self.boss.rect.center
                             self.boss.kill()
                             self.boss = None
                             self.score += 5000
                             self.money += 1000
+                            self.journal.record("boss", amount=1000, money=self.money, score=self.score)
+                            self.emit("boss_killed", "money_changed")
                             self.next_boss_score = self.score + 2000
-                            self.boss_just_killed = True # Başarım için
-                            self.level_mult += 0.5; self.shake_time = 40; self.sound.play("explosion")
+                            self.bosses_killed += 1
+                            self.level_mult += 0.5; self.camera.shake(40); self.sound.play("explosion", self.pan_for(boss_center[0]))
                             self.player.add_ulti(50)
-                            for _ in range(50): self.particles.add(Particle(WIDTH//2, 100, ORANGE, speed_mult=2.0))
+                            self.spawn_particles(boss_center[0], boss_center[1], ORANGE, 50, speed_mult=2.0)
 
                     p_hits = pygame.sprite.spritecollide(self.player, self.powerups, True)
                     for p in p_hits:
                         if p.type == "health":
                             self.sound.play("powerup"); self.player.hp = min(self.player.hp + 30, self.player.max_hp)
-                            self.texts.add(FloatingText("+HP", p.rect.centerx, p.rect.top, GREEN))
+                            self.emit("healed")
+                            self.add_effect_text("+HP", p.rect.centerx, p.rect.top, GREEN)
                         elif p.type == "shield":
                             self.sound.play("shield_get"); self.player.activate_shield()
-                            self.texts.add(FloatingText("SHIELD ACTIVATED!", p.rect.centerx, p.rect.top, SHIELD_BLUE))
+                            self.add_effect_text("SHIELD ACTIVATED!", p.rect.centerx, p.rect.top, SHIELD_BLUE)
 
                     total_dmg = 0
                     if pygame.sprite.spritecollide(self.player, self.enemies, True): total_dmg += 30
@@ -1905,14 +2628,15 @@ class Game:
                     if total_dmg > 0:
                         is_hit, hull_damaged, shield_hit = self.player.take_damage(total_dmg)
                         if is_hit:
-                            self.shake_time = 10
+                            self.camera.shake(10)
                             if shield_hit: self.sound.play("shield_hit")
                             if hull_damaged:
-                                self.sound.play("explosion")
+                                pan = self.pan_for(self.player.rect.centerx)
+                                self.sound.play("explosion", pan)
                                 if self.player.hp <= 0:
-                                    self.state = "DYING"; self.player.visible = False; self.sound.play("explosion")
-                                    self.shake_time = 60; self.game_over_timer = 120
-                                    for _ in range(100): self.particles.add(Particle(self.player.rect.centerx, self.player.rect.centery, self.player.color, speed_mult=3.0))
+                                    self.state = "DYING"; self.player.visible = False; self.sound.play("explosion", pan)
+                                    self.camera.shake(60); self.game_over_timer = 120
+                                    self.spawn_particles(self.player.rect.centerx, self.player.rect.centery, self.player.color, 100, speed_mult=3.0)
                     
                     elif self.player.is_dashing and self.player.dash_timer == 9: self.sound.play("dash")
 
@@ -1920,16 +2644,20 @@ class Game:
                     self.all_sprites.update(); self.game_over_timer -= 1
                     if self.game_over_timer <= 0: 
                         self.state = "GAMEOVER"
-                        self.save_autosave()
+                        self.save_autosave(); self.journal.active = False
+                        self.end_run()
 
-                
-                for p in self.particles: 
-                     if p not in self.all_sprites: self.all_sprites.add(p)
 
+            self.frame_timer.lap("collisions" if self.state == "GAME" else "logic")
             # --- ÇİZİM (DRAW) ---
-            self.grid.draw(self.screen)
+            if self.display.textured: self.display.begin_frame()
+            if self.dirty.enabled: self.mark_background_dirty(shake_x, shake_y)
+            
+            # Oyun sırasında ızgara zaten titreşimli olarak aşağıda çiziliyor
+            if self.state not in ("GAME", "DYING"): self.grid.draw(self.screen); self.frame_timer.lap("background")
             
             if self.state == "INTRO":
+                self.dirty.mark_full() # Rastgele "matrix" çizgileri: her kare değişir
                 for i in range(10):
                     c = random.randint(50, 255)
                     pygame.draw.rect(self.screen, (0, c, 0), (random.randint(0, WIDTH), random.randint(0, HEIGHT), 5, 20))
@@ -1940,55 +2668,20 @@ class Game:
                 if self.intro_timer > 50: self.screen.blit(sub, (WIDTH//2 - sub.get_width()//2, 500))
 
             elif self.state == "MENU":
-                for s in self.stars: s.draw(self.screen)
-                self.draw_text("NEON DEFENDER", self.font_title, CYAN, WIDTH//2, 150)
-                for btn in self.menu_buttons: btn.draw(self.screen, self.font_large)
-                self.draw_text("Written by: c005", self.font_small, GRAY, WIDTH - 120, HEIGHT - 20)
+                self.stars.draw(self.screen)
+                def build(layer):
+                    self.draw_text("NEON DEFENDER", self.font_title, CYAN, WIDTH//2, 150, surface=layer)
+                    for btn in self.menu_buttons: btn.draw(layer, self.font_large)
+                    self.draw_text("Written by: c005", self.font_small, GRAY, WIDTH - 120, HEIGHT - 20, surface=layer)
+                self.draw_ui_layer("MENU", tuple(btn.state_key(self.font_large) for btn in self.menu_buttons), build)
 
             elif self.state == "SLOT_MENU":
                 title = getattr(self, 'slot_menu_title', "SELECT SAVE SLOT")
-                self.draw_text(title, self.font_title, WHITE, WIDTH//2, 60)
-                
-                for btn in self.slot_buttons:
-                    btn.draw(self.screen, self.font_large)
-                    
-                    # Kartların içine detay yaz
-                    if hasattr(btn, 'info_text'):
-                        lines = btn.info_text.split('\n')
-                        cy = btn.rect.centery
-                        
-                        # Eğer bu Auto-Save butonuysa, yazıları biraz yukarıdan başlat (Ortalamak için)
-                        # Çünkü 3 satırımız var, merkezden başlarsak aşağı kayar.
-                        total_height = len(lines) * 25
-                        start_y = cy - (total_height // 2) + 10
-                        
-                        for idx, line in enumerate(lines):
-                            # --- RENK VE FONT SEÇİMİ ---
-                            is_header = False
-                            
-                            # 1. Başlıklar: Eğer buton seçiliyse (üzerine gelindiyse) BEYAZ yap, yoksa kendi rengini kullan.
-                            if "SLOT" in line and "AUTO" not in line: 
-                                col = WHITE if btn.selected else ELECTRIC_CYAN
-                                font = self.font_large; is_header = True
-                                
-                            elif "EMPTY" in line: 
-                                col = GRAY; font = self.font_large; is_header = True
-                                
-                            elif "AUTO" in line: 
-                                col = WHITE if btn.selected else ORANGE 
-                                font = self.font_large; is_header = True
-                            
-                            # 2. Detaylar (Score, Cash) -> Küçük ve Bilgi Rengi
-                            elif "Score" in line: col = GREEN; font = self.font_small
-                            elif "Cash" in line: col = YELLOW; font = self.font_small
-                            elif "System" in line: col = RED; font = self.font_small
-                            elif "New Game" in line: col = (100, 100, 100); font = self.font_small
-                            else: col = WHITE; font = self.font_small
-                            
-                            # Satır Aralığı
-                            offset_y = idx * 28 
-                            self.draw_text(line, font, col, btn.rect.centerx, start_y + offset_y)
-                            
+                def build(layer):
+                    self.draw_text(title, self.font_title, WHITE, WIDTH//2, 60, surface=layer)
+                    # Kart detayları (info_text) kartın kendi önbelleğinde çizili
+                    for btn in self.slot_buttons: btn.draw(layer, self.font_large)
+                self.draw_ui_layer("SLOT_MENU", (title,) + tuple(btn.state_key(self.font_large) for btn in self.slot_buttons), build)
 
             elif self.state == "CONFIRM_OVERWRITE":
                 # Arkaplanı biraz karart
@@ -2026,108 +2719,67 @@ class Game:
                 self.draw_text("[Y] DELETE", self.font_large, RED, WIDTH//2 - 90, box_y + 170)
                 self.draw_text("[N] CANCEL", self.font_large, GREEN, WIDTH//2 + 90, box_y + 170)
 
+            elif self.state == "LEADERBOARD":
+                self.draw_leaderboard()
+
             elif self.state == "SETTINGS":
-                self.draw_text("SETTINGS", self.font_title, WHITE, WIDTH//2, 100)
-                for btn in self.settings_buttons: btn.draw(self.screen, self.font_large)
+                def build(layer):
+                    self.draw_text("SETTINGS", self.font_title, WHITE, WIDTH//2, 100, surface=layer)
+                    for btn in self.settings_buttons: btn.draw(layer, self.font_large)
+                self.draw_ui_layer("SETTINGS", tuple(btn.state_key(self.font_large) for btn in self.settings_buttons), build)
 
             elif self.state == "SETTINGS_AUDIO":
-                self.draw_text("AUDIO SETTINGS", self.font_title, WHITE, WIDTH//2, 100)
-                bar_width = 400; bar_height = 40; bar_x = WIDTH//2 - bar_width//2; bar_y = 250
-                pygame.draw.rect(self.screen, GRAY, (bar_x, bar_y, bar_width, bar_height))
-                pygame.draw.rect(self.screen, GREEN, (bar_x, bar_y, bar_width * self.volume_level, bar_height))
-                pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 3)
-                self.draw_text(f"VOLUME: {int(self.volume_level * 100)}%", self.font_large, WHITE, WIDTH//2, 200)
-                self.draw_text("Use Mouse or Arrow Keys to Adjust", self.font_small, GRAY, WIDTH//2, 320)
-                for btn in self.audio_buttons: btn.draw(self.screen, self.font_large)
+                def build(layer):
+                    self.draw_text("AUDIO SETTINGS", self.font_title, WHITE, WIDTH//2, 100, surface=layer)
+                    bar_width = 400; bar_height = 40; bar_x = WIDTH//2 - bar_width//2; bar_y = 250
+                    pygame.draw.rect(layer, GRAY, (bar_x, bar_y, bar_width, bar_height))
+                    pygame.draw.rect(layer, GREEN, (bar_x, bar_y, bar_width * self.volume_level, bar_height))
+                    pygame.draw.rect(layer, WHITE, (bar_x, bar_y, bar_width, bar_height), 3)
+                    self.draw_text(f"VOLUME: {int(self.volume_level * 100)}%", self.font_large, WHITE, WIDTH//2, 200, surface=layer)
+                    self.draw_text("Use Mouse or Arrow Keys to Adjust", self.font_small, GRAY, WIDTH//2, 320, surface=layer)
+                    for btn in self.audio_buttons: btn.draw(layer, self.font_large)
+                key = (self.volume_level,) + tuple(btn.state_key(self.font_large) for btn in self.audio_buttons)
+                self.draw_ui_layer("SETTINGS_AUDIO", key, build)
 
             elif self.state == "SETTINGS_CONTROLS" or self.state == "BINDING_KEY":
-                self.draw_text("CONTROLS", self.font_title, WHITE, WIDTH//2, 60)
                 if self.state == "BINDING_KEY":
                     pygame.draw.rect(self.screen, BLACK, (0, 0, WIDTH, HEIGHT), 0)
                     self.draw_text(f"PRESS NEW KEY FOR: {self.binding_key}", self.font_large, ELECTRIC_CYAN, WIDTH//2, HEIGHT//2)
                     self.draw_text("Press ESC to Cancel", self.font_small, GRAY, WIDTH//2, HEIGHT//2 + 50)
                 else:
-                    for btn in self.control_buttons: btn.draw(self.screen, self.font_small)
+                    def build(layer):
+                        self.draw_text("CONTROLS", self.font_title, WHITE, WIDTH//2, 60, surface=layer)
+                        for btn in self.control_buttons: btn.draw(layer, self.font_small)
+                    self.draw_ui_layer("SETTINGS_CONTROLS", tuple(btn.state_key(self.font_small) for btn in self.control_buttons), build)
 
             elif "MARKET" in self.state:
                 self.draw_store_screen()
 
             elif self.state == "SELECT":
-                self.draw_text("SELECT SHIP", self.font_large, WHITE, WIDTH//2, 50)
-                ships = [
-                    {"name": "INTERCEPTOR", "desc": "Balanced", "col": BLUE},
-                    {"name": "DESTROYER", "desc": "Tanky & Slow", "col": PURPLE},
-                    {"name": "SPEEDER", "desc": "Fast & Fragile", "col": YELLOW},
-                    {"name": "SNIPER", "desc": "One Shot", "col": GREEN}
-                ]
-                sel = ships[self.player_type]
-                pygame.draw.rect(self.screen, sel["col"], (WIDTH//2 - 100, 150, 200, 200), 2)
-                pygame.draw.rect(self.screen, sel["col"], (WIDTH//2 - 50, 200, 100, 100))
-                self.draw_text(f"< {sel['name']} >", self.font_large, sel["col"], WIDTH//2, 400)
-                self.draw_text(sel["desc"], self.font_small, WHITE, WIDTH//2, 450)
-                shoot_key = pygame.key.name(self.keys['SHOOT']).upper(); ulti_key = pygame.key.name(self.keys['ULTI']).upper()
-                self.draw_text(f"Shoot: {shoot_key} | Ulti: {ulti_key}", self.font_small, GRAY, WIDTH//2, 550)
-                
-                # Geri Butonunu Çiz
-                self.btn_select_back.draw(self.screen, self.font_small)
+                def build(layer):
+                    self.draw_text("SELECT SHIP", self.font_large, WHITE, WIDTH//2, 50, surface=layer)
+                    ships = [
+                        {"name": "INTERCEPTOR", "desc": "Balanced", "col": BLUE},
+                        {"name": "DESTROYER", "desc": "Tanky & Slow", "col": PURPLE},
+                        {"name": "SPEEDER", "desc": "Fast & Fragile", "col": YELLOW},
+                        {"name": "SNIPER", "desc": "One Shot", "col": GREEN}
+                    ]
+                    sel = ships[self.player_type]
+                    pygame.draw.rect(layer, sel["col"], (WIDTH//2 - 100, 150, 200, 200), 2)
+                    pygame.draw.rect(layer, sel["col"], (WIDTH//2 - 50, 200, 100, 100))
+                    self.draw_text(f"< {sel['name']} >", self.font_large, sel["col"], WIDTH//2, 400, surface=layer)
+                    self.draw_text(sel["desc"], self.font_small, WHITE, WIDTH//2, 450, surface=layer)
+                    shoot_key = pygame.key.name(self.keys['SHOOT']).upper(); ulti_key = pygame.key.name(self.keys['ULTI']).upper()
+                    self.draw_text(f"Shoot: {shoot_key} | Ulti: {ulti_key}", self.font_small, GRAY, WIDTH//2, 550, surface=layer)
+                    
+                    # Geri Butonunu Çiz
+                    self.btn_select_back.draw(layer, self.font_small)
+                key = (self.player_type, self.keys['SHOOT'], self.keys['ULTI'], self.btn_select_back.state_key(self.font_small))
+                self.draw_ui_layer("SELECT", key, build)
 
             elif self.state == "GAME" or self.state == "DYING":
-                # 1. Izgarayı titret
-                self.grid.draw(self.screen, shake_x, shake_y) 
-                
-                # 2. Yıldızları titret
-                for s in self.stars: s.draw(self.screen, shake_x, shake_y)
-                
-                # 3. Oyuncu izini (Trail) titret
-                if self.player and len(self.player.trail) > 1:
-                    shaken_trail = [(tx + shake_x, ty + shake_y) for tx, ty in self.player.trail]
-                    pygame.draw.lines(self.screen, self.player.color, False, shaken_trail, 3)
-                
-                # 4. EMP (Ulti) efektini titret
-                if self.emp_active and self.player:
-                    center_pos = (self.player.rect.centerx + shake_x, self.player.rect.centery + shake_y)
-                    pygame.draw.circle(self.screen, ELECTRIC_CYAN, center_pos, int(self.emp_radius), 5)
-                    pygame.draw.circle(self.screen, WHITE, center_pos, int(self.emp_radius)-5, 2)
-                    # Yıldırım efektleri için hedef koordinatları da kaydırmak gerekir ama karmaşık olmaması için merkez yeterli
-                    
-                # 5. Tüm Sprite'ları (Gemi, Mermi, Düşman) titret
-                for spr in self.all_sprites: 
-                    # blit yaparken koordinata shake ekliyoruz (Sprite'ın kendi rect'ini bozmuyoruz)
-                    self.screen.blit(spr.image, (spr.rect.x + shake_x, spr.rect.y + shake_y))
-                
-                # 6. Drone'u titret
-                if self.player and self.player.has_drone and self.player.visible:
-                    dx = self.player.rect.centerx + math.cos(math.radians(self.player.drone_angle))*40 + shake_x
-                    dy = self.player.rect.centery + math.sin(math.radians(self.player.drone_angle))*40 + shake_y
-                    pygame.draw.circle(self.screen, CYAN, (int(dx), int(dy)), 5)
-                
-                # 7. Uçan Yazıları (Floating Text) titret
-                for txt in self.texts: 
-                    self.screen.blit(txt.image, (txt.rect.x + shake_x, txt.rect.y + shake_y))
-                
-                if self.player:
-                    pygame.draw.rect(self.screen, GRAY, (20, 20, 200, 20), border_radius=5)
-                    hp_pct = max(0, self.player.hp / self.player.max_hp)
-                    hp_col = GREEN if hp_pct > 0.5 else (ORANGE if hp_pct > 0.2 else RED)
-                    pygame.draw.rect(self.screen, hp_col, (20, 20, 200 * hp_pct, 20), border_radius=5)
-                    ulti_pct = self.player.ulti_power / self.player.max_ulti
-                    pygame.draw.rect(self.screen, GRAY, (20, 45, 150, 10), border_radius=3)
-                    pygame.draw.rect(self.screen, ULTI_COLOR, (20, 45, 150 * ulti_pct, 10), border_radius=3)
-                    if ulti_pct >= 1: u_key = pygame.key.name(self.keys['ULTI']).upper(); self.draw_text(f"ULTI READY [{u_key}]", self.font_small, ULTI_COLOR, 95, 65)
-                    if self.player.shield_active:
-                        shield_time_pct = max(0, self.player.shield_timer / self.player.max_shield_time)
-                        pygame.draw.rect(self.screen, BLACK, (20, 80, 200, 8)) 
-                        pygame.draw.rect(self.screen, SHIELD_BLUE, (20, 80, 200 * shield_time_pct, 8)) 
-                        self.draw_text("SHIELD ACTIVE", self.font_small, SHIELD_BLUE, 120, 95)
-                    self.draw_text(f"HP: {int(self.player.hp)}", self.font_small, WHITE, 230, 30, False)
-                    self.draw_text(f"SCORE: {self.score}", self.font_large, WHITE, WIDTH - 120, 30)
-                    self.draw_text(f"${self.money}", self.font_large, YELLOW, WIDTH - 120, 70)
-                    if self.combo_count > 1: self.draw_text(f"x{self.combo_count}", self.font_title, CYAN, WIDTH - 60, 150)
-                    dash_cd_pct = 1 - (self.player.dash_cooldown / 120)
-                    if dash_cd_pct >= 1: d_key = pygame.key.name(self.keys['DASH']).upper(); self.draw_text(f"DASH READY [{d_key}]", self.font_small, CYAN, WIDTH//2, HEIGHT-30)
-                    if self.boss: self.boss.draw_health(self.screen)
-                    
-                    self.achievement_manager.draw_notification(self.screen, WIDTH, HEIGHT)
+                if self.dirty.enabled: self.mark_game_dirty()
+                self.draw_game_screen(shake_x, shake_y)
 
             elif self.state == "GAMEOVER":
                 self.draw_text("MISSION FAILED", self.font_title, RED, WIDTH//2, 200)
@@ -2136,11 +2788,94 @@ class Game:
                 self.draw_text(f"Money Kept: ${self.money}", self.font_small, YELLOW, WIDTH//2, 400)
                 self.draw_text("Press 'R' to Return to Menu", self.font_small, GRAY, WIDTH//2, 500)
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
+            if self.frame_timer.enabled:
+                rect = self.frame_timer.draw(self.display.hud() if self.display.textured else self.screen)
+                if self.dirty.enabled: self.dirty.mark(rect)
+            if self.memory.enabled:
+                rect = self.memory.draw(self.display.hud() if self.display.textured else self.screen, (self.screen.get_width() - 10, 110))
+                if self.dirty.enabled: self.dirty.mark(rect)
+            self.frame_timer.lap("hud") # Menü arayüzü ve kaplama
+
+            if self.state != "INTRO": self.sound.set_music_intensity(self.music_intensity())
+            self.sound.update()
+            self.frame_timer.lap("audio")
+            self.journal.update()
+            if self.state != self.memory.state: self.memory.transition(self.state)
+            self.gc_policy.set_state(self.state)
+            self.memory.update(self.memory_sources)
+            self.recorder.grab(self.screen)
+            for status, info in self.recorder.poll():
+                self.notify(f"CLIP SAVED: {os.path.basename(info)}" if status == "ok" else f"CLIP FAILED: {info}",
+                            GREEN if status == "ok" else RED, error=status != "ok")
+            for path, error in self.saves.poll(): self.notify(f"SAVE FAILED: {os.path.basename(path)}: {error}", RED, error=True)
+            self.frame_timer.lap("logic")
+            if not self.window_minimized: self.dirty.present()
+            self.frame_timer.lap("flip")
+            self.gc_policy.idle(); self.gc_policy.end(self.state) # Planlı toplama kare sonundaki boşlukta
+            self.frame_timer.end() # Bekleme (throttle) ölçülmez
+            self.throttle()
+            # Sadece oyun sırasındaki iş süresi ölçülür (menü/boşta bekleme kademeyi etkilemez)
+            if self.state in ("GAME", "DYING") and self.governor.record(self.clock.get_rawtime()): self.apply_quality()
+
+        if self.profiler.running: self.toggle_profiler() # Açık profil çıkışta yazılır
+        self.end_run() # Pencere oyun sırasında kapatıldıysa
+        self.recorder.close()
+        self.saves.close() # Bekleyen kayıtlar pencere beklenmeden diske yazılır
+        self.journal.close()
+        self.history.close()
+        for path, error in self.saves.poll(): print(f"Kayıt başarısız: {path}: {error}") # Çıkıştaki son yazımlar
+        if self.options.gc_log:
+            os.makedirs(self.get_save_path("gc"), exist_ok=True)
+            try: self.gc_policy.write_log(os.path.join(self.get_save_path("gc"), time.strftime("gc_%Y%m%d_%H%M%S.txt")))
+            except OSError as e: print(f"GC günlüğü yazılamadı: {e}")
+        self.sound.close()
         pygame.quit()
         sys.exit()
 
+def parse_resolution(text):
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("format: GENISLIKxYUKSEKLIK (ör. 800x600)")
+    return w, h
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NEON DEFENDER")
+    parser.add_argument("--arena", type=parse_resolution, default=None,
+                        help="Oyun alanı boyutu (varsayılan: çözünürlükle aynı); büyükse kamera oyuncuyu takip eder")
+    parser.add_argument("--zoom", type=float, default=1.0, help="Kamera yakınlaştırması (>= 1.0)")
+    parser.add_argument("--resolution", type=parse_resolution, default=(WIDTH, HEIGHT),
+                        help="Mantıksal çizim çözünürlüğü (varsayılan 800x600)")
+    parser.add_argument("--scale-mode", choices=RenderTarget.MODES, default="scaled",
+                        help="Pencereye ölçekleme: scaled (SDL), integer (keskin) veya smooth")
+    parser.add_argument("--backend", choices=("surface", "texture", "texture-sw"), default="surface",
+                        help="Çizim arka ucu: surface (yazılımsal blit), texture (pygame._sdl2 dokuları) veya texture-sw (SDL yazılım renderer'ı)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="Sadece değişen bölgeleri ekrana bas (yazılımsal ekranlarda hızlı)")
+    parser.add_argument("--quality", choices=("auto",) + QualityGovernor.NAMES, default="auto",
+                        help="Görsel kalite: auto (kare süresine göre ayarlanır) veya sabit low/medium/high")
+    parser.add_argument("--bloom", choices=Bloom.LEVELS, default=None,
+                        help="Neon parlama kalitesi (varsayılan: medium, --dirty-rects ile off)")
+    parser.add_argument("--bloom-budget", type=float, default=3.0,
+                        help="Parlama için kare başına ms bütçesi; sürekli aşılırsa kalite düşer")
+    parser.add_argument("--frame-timing", action="store_true",
+                        help="Aşama başına kare süresi kaplamasını açık başlat (F3 aç/kapa, F4 CSV'ye yaz)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Örneklemeli profilleyiciyi açık başlat (F6 ile durdurulunca collapsed-stack dosyası yazılır)")
+    parser.add_argument("--profile-rate", type=int, default=200, help="Profilleyici örnekleme hızı (Hz)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="tracemalloc'u aç: her durum geçişinde en çok büyüyen satırları kayıt klasöründeki memory/ günlüğüne yaz")
+    parser.add_argument("--gc", choices=GCPolicy.MODES, default="managed",
+                        help="Çöp toplama: managed (savaşta eşikler yüksek, toplama kare sonundaki boşlukta ve menülerde) veya default (Python)")
+    parser.add_argument("--gc-log", action="store_true",
+                        help="Çıkışta GC özetini ve GC'li bütçe aşımlarını kayıt klasöründeki gc/ altına yaz")
+    parser.add_argument("--no-music", action="store_true", help="Prosedürel müziği kapat")
+    parser.add_argument("--capture", action="store_true", help="Oynanış kaydını (halka tampon) açık başlat; F9 aç/kapa, F10 kaydet")
+    parser.add_argument("--clip-seconds", type=int, default=15, help="Kaydedilen klibin uzunluğu (saniye)")
+    parser.add_argument("--clip-format", choices=("gif", "png"), default=None,
+                        help="Klip formatı: gif (Pillow gerekir) veya png dizisi (varsayılan: Pillow varsa gif)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    Game().run()
+    multiprocessing.freeze_support() # PyInstaller exe'sinde kayıt işçisi süreci için
+    Game(parse_args()).run()
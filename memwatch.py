@@ -0,0 +1,120 @@
+import time
+import tracemalloc
+from collections import deque
+import pygame
+
+# tracemalloc farkında gürültü yapan kendi ayak izi
+TRACE_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                 tracemalloc.Filter(False, "<unknown>"))
+
+
+def surface_bytes(surface):
+    """Yüzeyin piksel belleği (satır hizalaması dahil)."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class MemoryMonitor:
+    """Bellek göstergeleri ve sızıntı tespiti.
+
+    `interval` saniyede bir: her sprite grubunun boyutu, kategoriye göre Surface bayt toplamı
+    ve sahipsiz sprite'lar (all_sprites içinde olup hiçbir mantıksal grupta olmayanlar:
+    güncellenmeye ve çizilmeye devam eder ama oyun onları artık görmez) ölçülür. Son `window`
+    saniyelik örnekler tutulur; kaplama her göstergenin bu süredeki değişimini gösterir,
+    sürekli artan değer sızıntıdır. trace=True ise tracemalloc açılır ve her durum geçişinde
+    alınan anlık görüntü bir öncekiyle karşılaştırılır (en çok büyüyen `top` satır günlüğe yazılır).
+    """
+    def __init__(self, interval=1.0, window=300, top=10, trace=False, log_path=None):
+        self.interval = interval
+        self.top = top
+        self.enabled = False # Kaplama; ölçüm her zaman açık (saniyede bir, ucuz)
+        self.samples = deque(maxlen=max(2, int(window / interval))) # (zaman, {gösterge: değer})
+        self.last_sample = 0.0
+        self.orphans = {} # sınıf adı -> adet (son örnek)
+        self.orphans_reported = 0
+        self.state = None
+        self.log_path = log_path
+        self.trace = trace
+        self.snapshot = None
+        if trace and not tracemalloc.is_tracing(): tracemalloc.start()
+        self.panel = None; self.panel_sample = -1
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.panel = None
+
+    def update(self, sources):
+        """Karede bir kez; aralık dolmadıysa sadece zaman kontrolüdür.
+
+        sources() -> (groups, logical, owned, surfaces). groups: ad -> grup (göstergeler),
+        logical: sahiplik sayılan gruplar, owned: gruba ihtiyaç duymayan tekil sprite'lar
+        (oyuncu, boss), surfaces: kategori -> yüzeyler (aynı yüzey bir kez sayılır).
+        """
+        now = time.perf_counter()
+        if now - self.last_sample < self.interval: return
+        self.last_sample = now
+        groups, logical, owned, surfaces = sources()
+        values = {f"group {name}": len(group) for name, group in groups.items()}
+        seen = set()
+        for category, items in surfaces.items():
+            total = 0
+            for surface in items:
+                if surface is None or id(surface) in seen: continue
+                seen.add(id(surface)); total += surface_bytes(surface)
+            values[f"bytes {category}"] = total
+        orphans = {}
+        for sprite in groups.get("all_sprites", ()):
+            if sprite in owned or any(sprite in group for group in logical): continue
+            name = type(sprite).__name__; orphans[name] = orphans.get(name, 0) + 1
+        self.orphans = orphans
+        count = values["orphans"] = sum(orphans.values())
+        if count > self.orphans_reported:
+            print(f"Bellek: {count} sahipsiz sprite ({', '.join(f'{n} x{c}' for n, c in sorted(orphans.items()))})")
+        self.orphans_reported = count
+        if self.trace: values["traced"] = tracemalloc.get_traced_memory()[0]
+        self.samples.append((now, values))
+
+    def trend(self):
+        """Her göstergenin son değeri ve pencere başından beri değişimi."""
+        if not self.samples: return {}
+        (t0, first), (t1, last) = self.samples[0], self.samples[-1]
+        return {name: (value, value - first.get(name, 0)) for name, value in last.items()}
+
+    def transition(self, state):
+        """Oyun durumu değişti: tracemalloc açıksa anlık görüntü al, öncekiyle farkı günlüğe yaz."""
+        previous, self.state = self.state, state
+        if not self.trace or previous is None: return
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        if self.snapshot is not None:
+            stats = snapshot.compare_to(self.snapshot, "lineno")[:self.top]
+            lines = [f"--- {previous} -> {state} ({time.strftime('%H:%M:%S')}) traced "
+                     f"{tracemalloc.get_traced_memory()[0] / 1024:.0f} KiB"] + [f"  {stat}" for stat in stats]
+            if stats and stats[0].size_diff > 0: print(f"Bellek: {previous} -> {state} en çok büyüyen: {stats[0]}")
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a") as f: f.write("\n".join(lines) + "\n")
+                except OSError: pass
+        self.snapshot = snapshot
+
+    def draw(self, surface, pos):
+        """Kaplama; panel sadece yeni örnek geldiğinde yeniden oluşturulur."""
+        if not self.enabled: return None
+        if self.panel is None or self.panel_sample != self.last_sample:
+            self.panel = self.build_panel(); self.panel_sample = self.last_sample
+        return surface.blit(self.panel, (pos[0] - self.panel.get_width(), pos[1]))
+
+    def build_panel(self):
+        if self.font is None: self.font = pygame.font.SysFont("Verdana", 11)
+        rows = sorted(self.trend().items())
+        span = self.samples[-1][0] - self.samples[0][0] if len(self.samples) > 1 else 0
+        lines = [(f"MEMORY (change over {span:.0f}s)", (255, 255, 255))]
+        for name, (value, delta) in rows:
+            if name.startswith("bytes") or name == "traced": text = f"{name} {value / 1024:.0f} KiB ({delta / 1024:+.0f})"
+            else: text = f"{name} {value} ({delta:+d})"
+            color = (255, 80, 80) if (name == "orphans" and value) else (255, 215, 0) if delta > 0 else (220, 220, 220)
+            lines.append((text, color))
+        for name, count in sorted(self.orphans.items()): lines.append((f"  orphan {name} x{count}", (255, 80, 80)))
+        panel = pygame.Surface((250, 16 * len(lines) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, (text, color) in enumerate(lines): panel.blit(self.font.render(text, True, color), (8, 5 + i * 16))
+        return panel
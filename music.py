@@ -0,0 +1,126 @@
+import threading
+import queue
+import pygame
+import synth
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# La minör: Am - F - C - G (kök notaların frekansları, bas oktavında)
+PROGRESSION = [
+    (110.00, (220.00, 261.63, 329.63)), # Am
+    (87.31, (174.61, 220.00, 261.63)),  # F
+    (130.81, (261.63, 329.63, 392.00)), # C
+    (98.00, (196.00, 246.94, 293.66)),  # G
+]
+
+
+class Soundtrack:
+    """Arka plan iş parçacığında parça parça üretilen uyarlanabilir müzik.
+
+    İşçi, synth.py patch'leriyle yarım ölçülük (8 adım) PCM parçaları üretip küçük bir
+    ileri tampona (lookahead) koyar. Ana döngü karede bir update() çağırır: kanalın sırası
+    boşsa hazır parçayı Channel.queue ile sıraya ekler. Ana iş parçacığı hiçbir zaman
+    sentez yapmaz ve beklemez; hazır parça yokken kanal susarsa bu bir "underrun"dır ve sayılır.
+
+    Yoğunluk (0..1) katmanları ve temposu belirler: bas her zaman, arpej > 0.3,
+    hi-hat > 0.5, kick ve 16'lık arpej > 0.7.
+    """
+    def __init__(self, channel, sample_rate, channels, lookahead=2, volume=0.5):
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.volume = volume
+        self.intensity = 0.0 # İşçi her parçanın başında okur (float ataması atomik)
+        self.ready = queue.Queue(maxsize=lookahead)
+        self.renderer = synth.PatchRenderer(sample_rate) # Aynı notalar parçalar arasında tekrar kullanılır
+        self.step = 0 # Akordun ve desenin ilerlediği global adım sayacı
+        self.tail = None # Önceki parçanın sınırından taşan sesler (bir sonraki parçanın başına eklenir)
+        self.running = False
+        self.started = False
+        self.thread = None
+        self.chunks = 0; self.underruns = 0
+
+    def start(self):
+        if self.running or np is None: return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="soundtrack", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.channel.stop()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self.channel.set_volume(volume)
+
+    def update(self):
+        """Karede bir kez: kanalın sırası boşsa bir sonraki parçayı kuyruğa ekler (beklemeden)."""
+        if not self.running: return
+        if self.channel.get_queue() is not None: return # Sırada zaten bir parça var
+        try:
+            pcm = self.ready.get_nowait()
+        except queue.Empty:
+            # Çalan da yoksa müzik kesildi demektir
+            if self.started and not self.channel.get_busy(): self.underruns += 1; self.started = False
+            return
+        sound = pygame.sndarray.make_sound(pcm)
+        if self.channel.get_busy(): self.channel.queue(sound)
+        else:
+            self.channel.play(sound); self.channel.set_volume(self.volume)
+            self.started = True
+
+    def _worker(self):
+        while self.running:
+            pcm = self.render_chunk(self.intensity)
+            while self.running:
+                try:
+                    self.ready.put(pcm, timeout=0.1)
+                    break
+                except queue.Full: pass
+
+    def render_chunk(self, intensity):
+        """8 adımlık (yarım ölçü) PCM parçası üretir."""
+        bpm = 110 + 30 * intensity
+        step_len = 60.0 / bpm / 4 # 16'lık nota
+        sr = self.sample_rate
+        n_step = int(step_len * sr)
+        n = n_step * 8
+        # Parçadan uzun tampon: 7. adımdaki 1.5 adımlık arpej ve basın sönümü kesilmez (kesik = tık sesi),
+        # taşan kısım bir sonraki parçaya devredilir
+        out = np.zeros(n * 2, dtype=np.float32)
+        if self.tail is not None: out[:len(self.tail)] += self.tail[:len(out)]
+        used = [n if self.tail is None else max(n, len(self.tail))]
+        r = self.renderer
+        if len(r.memo) > 512: r.memo.clear()
+
+        def add(p, at):
+            pcm = r.render(p[1], int(p[2] * sr)) * p[3]
+            start = at * n_step
+            end = min(len(out), start + len(pcm))
+            out[start:end] += pcm[:end - start]
+            used[0] = max(used[0], end)
+
+        root, chord = PROGRESSION[(self.step // 16) % len(PROGRESSION)]
+        for i in range(8):
+            s = self.step + i
+            if s % 8 == 0: # Bas: yarım ölçüde bir, alçak geçiren testere
+                add(synth.patch(synth.lowpass(synth.decay(synth.osc("sawtooth", root)), 600), step_len * 8, 0.25), i)
+            if intensity > 0.3 and (s % 2 == 0 or intensity > 0.7): # Arpej: 8'lik, yoğunlukta 16'lık
+                note = chord[(s // (1 if intensity > 0.7 else 2)) % 3] * 2
+                add(synth.patch(synth.decay(synth.osc("square", note)), step_len * 1.5, 0.06), i)
+            if intensity > 0.5 and s % 2 == 1: # Hi-hat: ara vuruşlarda kısa gürültü
+                add(synth.patch(synth.decay(synth.noise(7), "exp", 8), 0.04, 0.08), i)
+            if intensity > 0.7 and s % 4 == 0: # Kick: hızla düşen sinüs
+                add(synth.patch(synth.decay(synth.osc("sine", 120, 40), "exp", 6), 0.15, 0.5), i)
+        self.step += 8
+        self.chunks += 1
+        self.tail = out[n:used[0]].copy() if used[0] > n else None
+        out = out[:n]
+
+        audio = (np.clip(out, -1, 1) * 32767).astype(np.int16)
+        if self.channels == 2: audio = np.column_stack((audio, audio))
+        return audio
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import threading
+
+
+class SamplingProfiler:
+    """Örneklemeli profilleyici.
+
+    Arka plan iş parçacığı `rate` Hz ile ana iş parçacığının o anki yığınını
+    sys._current_frames() ile okur ve sayar. cProfile gibi her çağrıya kanca takmadığı için
+    karede binlerce küçük update() çağrısı ölçümü bozmaz. Yığınlar `label()` ile dönen oyun
+    durumunun (ör. "GAME;boss_phase_2") altında toplanır; çıktı flamegraph araçlarının okuduğu
+    "collapsed stack" biçimindedir: her satır "kök;çağıran;...;çağrılan sayı".
+    """
+    def __init__(self, label=None, rate=200, max_depth=64):
+        self.label = label or (lambda: "main")
+        self.interval = 1.0 / rate
+        self.max_depth = max_depth
+        self.target = threading.main_thread().ident
+        self.counts = {}
+        self.samples = 0
+        self.running = False
+        self.thread = None
+        self.started_at = 0.0
+
+    def start(self):
+        if self.running: return
+        self.counts = {}; self.samples = 0
+        self.running = True
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running: return
+        self.running = False
+        self.thread.join(timeout=1)
+
+    def _sample_loop(self):
+        names = {} # code nesnesi -> "dosya:fonksiyon" (her örnekte yeniden biçimlendirmemek için)
+        while self.running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self.target)
+            if frame is None: continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                name = names.get(code)
+                if name is None: name = names[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                stack.append(name)
+                frame = frame.f_back
+            del frame
+            try: root = self.label()
+            except Exception: root = "unknown" # Ana iş parçacığı durumu değiştirirken okunduysa
+            key = root + ";" + ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.samples += 1
+
+    def write(self, path):
+        """Collapsed stack çıktısı (flamegraph.pl, speedscope, inferno vb. doğrudan okur)."""
+        counts = dict(self.counts)
+        with open(path, "w") as f:
+            for stack, count in sorted(counts.items()):
+                f.write(f"{stack} {count}\n")
+        return sum(counts.values())
@@ -0,0 +1,489 @@
+import random
+import time
+import weakref
+from collections import deque
+import pygame
+
+class RenderTarget:
+    """Oyun sabit bir mantıksal çözünürlükte çizilir, pencereye ölçeklenerek sunulur.
+
+    Modlar:
+      scaled  -> pygame.SCALED: ölçeklemeyi SDL yapar (varsayılan, en hızlı)
+      integer -> ekran dışı yüzey, tam sayı katlarıyla keskin (piksel) ölçekleme
+      smooth  -> ekran dışı yüzey, pencereye sığacak şekilde smoothscale
+    Pencere ne kadar büyürse büyüsün oyun alanı ve çizim maliyeti sabit kalır.
+    """
+    MODES = ("scaled", "integer", "smooth")
+    textured = False
+
+    def __init__(self, size, mode="scaled", resize_delay=150):
+        self.size = tuple(size)
+        self.mode = mode
+        self.resize_delay = resize_delay # ms: sürükleyerek boyutlandırmada olaylar birleştirilir
+        self.pending_size = None
+        self.pending_since = 0
+        self.open(self.size)
+
+    def open(self, window_size):
+        if self.mode == "scaled":
+            try:
+                self.window = pygame.display.set_mode(self.size, pygame.SCALED | pygame.RESIZABLE)
+                self.surface = self.window
+                self.dest = self.window.get_rect(); self.scale = 1
+                return
+            except pygame.error:
+                self.mode = "smooth" # SCALED desteklenmiyorsa yazılımsal ölçeklemeye düş
+        self.window = pygame.display.set_mode(window_size, pygame.RESIZABLE)
+        if not hasattr(self, 'surface') or self.surface is self.window:
+            self.surface = pygame.Surface(self.size).convert()
+        self.layout()
+
+    def layout(self):
+        """Pencere boyutuna göre hedef dikdörtgeni (letterbox) hesaplar."""
+        win_w, win_h = self.window.get_size(); w, h = self.size
+        if self.mode == "integer" and win_w >= w and win_h >= h:
+            self.scale = min(win_w // w, win_h // h)
+            dw, dh = w * self.scale, h * self.scale
+        else:
+            f = min(win_w / w, win_h / h)
+            dw, dh = max(1, int(w * f)), max(1, int(h * f))
+            self.scale = 1 if (dw, dh) == self.size else None # None: tam sayı olmayan ölçek
+        self.dest = pygame.Rect((win_w - dw) // 2, (win_h - dh) // 2, dw, dh)
+        self.window.fill((0, 0, 0)) # Kenar boşlukları bir kez boyanır
+
+    def request_resize(self, size):
+        """VIDEORESIZE hemen uygulanmaz; olaylar durulunca update() içinde bir kez uygulanır."""
+        self.pending_size = tuple(size)
+        self.pending_since = pygame.time.get_ticks()
+
+    def update(self):
+        """Bekleyen boyutlandırmayı uygular. Uygulandıysa True döner (tam yeniden çizim gerekir)."""
+        if self.pending_size is None or pygame.time.get_ticks() - self.pending_since < self.resize_delay:
+            return False
+        size = self.pending_size; self.pending_size = None
+        if self.mode != "scaled": self.open(size)
+        return True
+
+    def mouse_pos(self):
+        """Pencere koordinatlarını mantıksal koordinatlara çevirir."""
+        mx, my = pygame.mouse.get_pos()
+        if self.mode == "scaled": return mx, my # SDL zaten dönüştürüyor
+        w, h = self.size
+        return (int((mx - self.dest.x) * w / self.dest.w), int((my - self.dest.y) * h / self.dest.h))
+
+    def present(self, rects=None):
+        """rects None ise tüm kare, liste ise sadece o (mantıksal) bölgeler sunulur."""
+        if self.mode == "scaled":
+            if rects is None: pygame.display.flip()
+            else: pygame.display.update(rects)
+            return
+
+        if rects is None or self.scale is None:
+            # Tam kare: doğrudan pencerenin hedef bölgesine ölçekle (ara yüzey yok)
+            if self.scale == 1: self.window.blit(self.surface, self.dest)
+            elif self.scale is None: pygame.transform.smoothscale(self.surface, self.dest.size, self.window.subsurface(self.dest))
+            else: pygame.transform.scale(self.surface, self.dest.size, self.window.subsurface(self.dest))
+            pygame.display.flip()
+            return
+
+        # Tam sayı ölçekte sadece kirli bölgeler ölçeklenip sunulur
+        k = self.scale; out = []
+        for r in rects:
+            dst = pygame.Rect(self.dest.x + r.x * k, self.dest.y + r.y * k, r.w * k, r.h * k)
+            if k == 1: self.window.blit(self.surface, dst, r)
+            else: pygame.transform.scale(self.surface.subsurface(r), dst.size, self.window.subsurface(dst))
+            out.append(dst)
+        pygame.display.update(out)
+
+class TextureTarget:
+    """pygame._sdl2.video tabanlı donanım dokusu arka ucu (--backend texture).
+
+    Sahne yine mantıksal çözünürlükteki `surface`'e çizilir ve her karede tek bir akış
+    (streaming) dokusuna yüklenir; ölçekleme ve letterbox renderer'ın logical_size'ı ile yapılır.
+    Oyun sprite'ları ise yüzeye blit edilmez: görüntüleri bir kez dokuya yüklenir (görüntü
+    nesnesine göre önbellek) ve her karede dokudan kopya olarak çizilir; zoom, döndürme ve
+    alfa renderer'da uygulanır. HUD, sprite'ların üstünde kalması için ayrı bir saydam
+    katmana (`overlay`) çizilir. GPU yoksa SDL'in yazılım renderer'ı kullanılır.
+    """
+    textured = True
+
+    def __init__(self, size, software=False, title="NEON DEFENDER"):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        self.Texture = Texture
+        self.size = tuple(size)
+        self.mode = "texture"
+        self.window = Window(title, self.size, resizable=True)
+        self.renderer = None; self.software = software
+        if not software:
+            try: self.renderer = Renderer(self.window, accelerated=1)
+            except RuntimeError: self.software = True # Donanım hızlandırması yok (pygame._sdl2 hatası)
+        if self.renderer is None: self.renderer = Renderer(self.window, accelerated=0)
+        self.renderer.logical_size = self.size
+
+        self.surface = pygame.Surface(self.size)
+        self.frame = Texture(self.renderer, self.size, streaming=True)
+        self.overlay = pygame.Surface(self.size, pygame.SRCALPHA)
+        self.overlay_texture = Texture(self.renderer, self.size, streaming=True)
+        self.overlay_texture.blend_mode = 1 # SDL_BLENDMODE_BLEND
+        self.overlay_used = False
+        self.textures = weakref.WeakKeyDictionary() # Görüntü yok olunca dokusu da bırakılır
+        self.canvases = {} # katman adı -> [saydam yüzey, akış dokusu]
+        self.queue = []
+        self.uploads = 0
+
+    def texture(self, image):
+        tex = self.textures.get(image)
+        if tex is None:
+            tex = self.textures[image] = self.Texture.from_surface(self.renderer, image)
+            self.uploads += 1
+        return tex
+
+    def begin_frame(self):
+        """Yeni karenin sprite kuyruğunu ve HUD katmanını sıfırlar (duraklatmada çağrılmaz)."""
+        self.queue.clear()
+        if self.overlay_used:
+            self.overlay.fill((0, 0, 0, 0))
+            self.overlay_used = False
+
+    def blits(self, batch, scale=1.0):
+        """(görüntü, konum) çiftlerini doku kopyası olarak sıraya alır; scale kamera zoom'udur."""
+        texture = self.texture
+        for image, (x, y) in batch:
+            w, h = image.get_size()
+            self.queue.append((texture(image), (x * scale, y * scale, w * scale, h * scale)))
+
+    def canvas(self, name, size):
+        """Katmanın ilkel çizimleri (EMP halkası, drone) için saydam yüzey; dokusu kuyruğa o katmanın
+        sırasında girer, böylece daha önce sıraya alınmış sprite'ların üstünde kalır. Kuyruk boşsa
+        çizim çerçeve yüzeyine yapılabilir (sıra zaten doğru): None döner."""
+        if not self.queue: return None
+        entry = self.canvases.get(name)
+        if entry is None or entry[0].get_size() != size:
+            texture = self.Texture(self.renderer, size, streaming=True)
+            texture.blend_mode = 1 # SDL_BLENDMODE_BLEND
+            entry = self.canvases[name] = [pygame.Surface(size, pygame.SRCALPHA), texture]
+        surface, texture = entry
+        surface.fill((0, 0, 0, 0))
+        self.queue.append((texture, surface)) # present() sırasında yüklenir
+        return surface
+
+    def hud(self):
+        """Sprite'ların üstüne çizilecek saydam ekran katmanı."""
+        self.overlay_used = True
+        return self.overlay
+
+    def request_resize(self, size):
+        pass # Renderer pencere boyutuna kendisi uyar
+
+    def update(self):
+        return False
+
+    def mouse_pos(self):
+        mx, my = pygame.mouse.get_pos()
+        win_w, win_h = self.window.size; w, h = self.size
+        f = min(win_w / w, win_h / h)
+        return int((mx - (win_w - w * f) / 2) / f), int((my - (win_h - h * f) / 2) / f)
+
+    def present(self, rects=None):
+        r = self.renderer
+        self.frame.update(self.surface)
+        r.draw_color = (0, 0, 0, 255); r.clear()
+        self.frame.draw()
+        for tex, dst in self.queue:
+            if isinstance(dst, pygame.Surface): tex.update(dst); tex.draw() # Katman tuvali, tüm ekran
+            else: tex.draw(dstrect=dst)
+        if self.overlay_used:
+            self.overlay_texture.update(self.overlay)
+            self.overlay_texture.draw()
+        r.present()
+
+class DirtyRects:
+    """Dirty-rectangle sunucu: sadece değişen bölgeleri pygame.display.update(rects) ile ekrana basar.
+
+    Her karede çizilen (değişebilecek) bölgeler mark() ile bildirilir. Bir önceki karenin
+    bölgeleri de otomatik eklenir; böylece hareket eden bir nesnenin eski yeri de temizlenir.
+    Kirli alan ekranın `threshold` oranını geçerse (ör. screen shake) tam flip'e düşülür.
+    """
+    def __init__(self, target, enabled=False, threshold=0.5, max_rects=300):
+        self.target = target
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_rects = max_rects
+        self.rects = []
+        self.prev_rects = []
+        self.full = True
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def mark(self, rect):
+        if self.enabled: self.rects.append(pygame.Rect(rect))
+
+    def mark_many(self, rects):
+        if self.enabled: self.rects.extend(pygame.Rect(r) for r in rects)
+
+    def mark_full(self):
+        self.full = True
+
+    def present(self):
+        if not self.enabled:
+            self.target.present()
+            return
+
+        screen_rect = self.target.surface.get_rect()
+        rects = [r.clip(screen_rect) for r in self.rects + self.prev_rects]
+        rects = [r for r in rects if r.w and r.h]
+
+        # Kaba alan tahmini (çakışmalar iki kez sayılır -> güvenli tarafta kalır)
+        area = sum(r.w * r.h for r in rects)
+        if self.full or len(rects) > self.max_rects or area > screen_rect.w * screen_rect.h * self.threshold:
+            self.target.present()
+            self.full_flips += 1
+        elif rects:
+            self.target.present(rects)
+            self.partial_updates += 1
+        # Hiç değişiklik yoksa hiçbir şey sunulmaz (statik menü / GAMEOVER)
+
+        self.prev_rects = self.rects
+        self.rects = []
+        self.full = False
+
+class Camera:
+    """Dünya (oyun alanı) ile ekran arasındaki tek dönüşüm noktası.
+
+    Kaydırma (oyuncuyu takip), screen shake ve zoom burada tutulur. Çizimden önce
+    visible() ile görüş alanı dışındaki nesneler elenir; bu sayede oyun alanı
+    pencereden büyük olabilir (kayan arenalar) ve ekran dışı nesneler çizimde hiç maliyet yaratmaz.
+    """
+    def __init__(self, view_size, world_size, zoom=1.0, shake_strength=8):
+        self.view_w, self.view_h = view_size
+        self.world_w, self.world_h = world_size
+        self.zoom = max(1.0, zoom) # Uzaklaştırma desteklenmez: arka plan ekranı doldurmalı
+        self.shake_strength = shake_strength
+        self.x = 0.0; self.y = 0.0 # Görüş alanının dünyadaki sol üst köşesi
+        self.shake_time = 0
+        self.shake_x = 0; self.shake_y = 0
+        self.moved = False
+        self.view_surface = None
+
+    @property
+    def view_size(self):
+        """Zoom uygulanmış halde dünyadan görünen alanın boyutu."""
+        return int(self.view_w / self.zoom), int(self.view_h / self.zoom)
+
+    @property
+    def view_rect(self):
+        w, h = self.view_size
+        return pygame.Rect(int(self.x), int(self.y), w, h)
+
+    @property
+    def offset(self):
+        """Dünya koordinatına eklenince çizim yüzeyi koordinatını veren kaydırma (shake dahil)."""
+        return self.shake_x - int(self.x), self.shake_y - int(self.y)
+
+    def shake(self, frames):
+        self.shake_time = frames
+
+    def update(self, target=None, follow=0.15):
+        """Hedefi (oyuncu rect'i) yumuşakça takip eder, dünyanın dışına taşmaz; titreşimi ilerletir."""
+        old = (int(self.x), int(self.y))
+        w, h = self.view_size
+        if target is not None:
+            self.x += (target.centerx - w / 2 - self.x) * follow
+            self.y += (target.centery - h / 2 - self.y) * follow
+        self.x = max(0.0, min(self.x, self.world_w - w))
+        self.y = max(0.0, min(self.y, self.world_h - h))
+        self.moved = (int(self.x), int(self.y)) != old
+
+        if self.shake_time > 0:
+            self.shake_time -= 1
+            s = self.shake_strength
+            self.shake_x, self.shake_y = random.randint(-s, s), random.randint(-s, s)
+        else:
+            self.shake_x = self.shake_y = 0
+
+    def begin(self, screen):
+        """Dünya çizimi için yüzey döner: zoom yoksa doğrudan ekran, varsa küçük bir ara yüzey."""
+        if self.zoom == 1.0: return screen
+        size = self.view_size
+        if self.view_surface is None or self.view_surface.get_size() != size:
+            self.view_surface = pygame.Surface(size, 0, screen) # Ekranla aynı format (set_mode olmadan da)
+        return self.view_surface
+
+    def end(self, screen):
+        if self.zoom != 1.0:
+            pygame.transform.scale(self.view_surface, screen.get_size(), screen)
+
+class RenderLayers:
+    """Sabit sıralı çizim katmanları.
+
+    Kare boyunca (görüntü, konum) çiftleri katmanlarına toplanır ve her katman tek bir
+    Surface.fblits/blits çağrısıyla basılır. Blit'lenemeyen ilkel çizimler (çizgi, daire,
+    HUD) add_draw() ile katmana fonksiyon olarak eklenir ve o katmanın blit'lerinden önce çalışır.
+    Çizim sırası her zaman ORDER'dır: sprite'ların gruba eklenme sırasına bağlı değildir.
+    """
+    ORDER = ("background", "trails", "projectiles", "ships", "effects", "text", "hud")
+    WORLD = ORDER[:-1] # Kameradan geçen katmanlar; "hud" ekran uzayında
+
+    def __init__(self):
+        self.blits = {name: [] for name in self.ORDER}
+        self.draws = {name: [] for name in self.ORDER}
+        self.use_fblits = hasattr(pygame.Surface, "fblits") # pygame 2.4+
+
+    def add(self, layer, image, pos):
+        self.blits[layer].append((image, pos))
+
+    def add_draw(self, layer, func):
+        self.draws[layer].append(func)
+
+    def flush(self, surface, names=ORDER, sink=None, canvas=None):
+        """sink verilirse blit'ler yüzeye değil sink(batch)'e gider (doku arka ucu). canvas(ad, boyut)
+        verilirse ilkel çizimler de o katmanın saydam yüzeyine gider; None dönerse doğrudan `surface`'e."""
+        for name in names:
+            draws = self.draws[name]
+            if draws:
+                target = (canvas(name, surface.get_size()) if canvas else None) or surface
+                for func in draws: func(target)
+                draws.clear()
+            batch = self.blits[name]
+            if batch:
+                if sink: sink(batch)
+                elif self.use_fblits: surface.fblits(batch)
+                else: surface.blits(batch, doreturn=False)
+                batch.clear()
+
+class Bloom:
+    """Ucuz neon parlaması (bloom) son işlemi.
+
+    Sahne küçültülür (smoothscale aynı zamanda kutu filtresi görevi görür), eşik altı pikseller
+    çıkarılır (BLEND_RGB_SUB), daha da küçültülüp büyütülerek bulanıklaştırılır ve tam boyuta
+    açılıp BLEND_RGB_ADD ile sahneye eklenir. Kalite kademeleri:
+      (küçültme oranı, bulanıklaştırma geçişi, kaç karede bir yeniden hesaplanır)
+    Ölçülen maliyet bütçeyi sürekli aşarsa kendiliğinden bir alt kademeye iner.
+    """
+    TIERS = {"off": None, "low": (8, 1, 2), "medium": (4, 1, 1), "high": (4, 2, 1)}
+    LEVELS = ("off", "low", "medium", "high")
+
+    def __init__(self, quality="medium", threshold=90, budget_ms=3.0, patience=30):
+        self.threshold = threshold
+        self.budget_ms = budget_ms
+        self.patience = patience # Bütçe aşımı kaç kare sürerse kademe düşer
+        self.cost_ms = 0.0 # Üstel ortalama maliyet
+        self.ceiling = "high" # Bütçe aşımıyla inilen en yüksek kademe: dışarıdan set_quality bunu aşamaz
+        self.set_quality(quality)
+
+    def set_quality(self, quality):
+        quality = self.LEVELS[min(self.LEVELS.index(quality), self.LEVELS.index(self.ceiling))]
+        if quality == getattr(self, "quality", None): return # Aşım sayacı ve tamponlar korunur
+        self.quality = quality
+        self.over_budget = 0
+        self.frame = 0
+        self.buffers = None # Boyut/kademe değişince tamponlar yeniden oluşturulur
+
+    @property
+    def enabled(self):
+        return self.TIERS[self.quality] is not None
+
+    def downgrade(self):
+        i = self.LEVELS.index(self.quality)
+        if i > 0: self.ceiling = self.LEVELS[i - 1]; self.set_quality(self.ceiling)
+
+    def raise_ceiling(self):
+        """Kalite yöneticisi kademe yükseltti: kare süresinde yer açıldı, bütçe tavanı bir kademe gevşer
+        (tek bir ani yavaşlama parlamayı oturumun geri kalanında kısıtlamasın)."""
+        i = self.LEVELS.index(self.ceiling)
+        if i < len(self.LEVELS) - 1: self.ceiling = self.LEVELS[i + 1]
+
+    def _buffers(self, surface, factor):
+        size = surface.get_size()
+        if self.buffers is None or self.buffers[0] != size:
+            w, h = max(2, size[0] // factor), max(2, size[1] // factor)
+            self.buffers = (size, pygame.Surface((w, h), 0, surface), pygame.Surface((w // 2, h // 2), 0, surface),
+                            pygame.Surface(size, 0, surface))
+        return self.buffers[1:]
+
+    def apply(self, surface):
+        tier = self.TIERS[self.quality]
+        if tier is None: return
+        factor, passes, every = tier
+        start = time.perf_counter()
+        small, tiny, glow = self._buffers(surface, factor)
+
+        if self.frame % every == 0:
+            pygame.transform.smoothscale(surface, small.get_size(), small)
+            t = self.threshold
+            small.fill((t, t, t), special_flags=pygame.BLEND_RGB_SUB) # Sadece parlak pikseller kalır
+            for _ in range(passes):
+                pygame.transform.smoothscale(small, tiny.get_size(), tiny)
+                pygame.transform.smoothscale(tiny, small.get_size(), small)
+            pygame.transform.smoothscale(small, glow.get_size(), glow)
+        self.frame += 1
+        surface.blit(glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+        cost = (time.perf_counter() - start) * 1000
+        self.cost_ms += (cost - self.cost_ms) * 0.1
+        if self.cost_ms > self.budget_ms:
+            self.over_budget += 1
+            if self.over_budget >= self.patience:
+                self.downgrade(); self.cost_ms = 0.0
+        else:
+            self.over_budget = 0
+
+class QualityGovernor:
+    """Ölçülen kare süresine göre görsel kalite kademesini ayarlar.
+
+    Son `window` karenin iş süresi (clock.get_rawtime: bekleme hariç) tutulur ve her `interval`
+    karede bir yüzdelik (varsayılan p90) hesaplanır. Bütçe aşılırsa hemen bir kademe düşülür;
+    yükseltmek için ise `patience` ardışık değerlendirmede belirgin boşluk gerekir (histerezis),
+    böylece kalite iki kademe arasında gidip gelmez. Kademeler yalnızca görsel ayarları taşır:
+    oyun simülasyonu (hasar, çarpışma, doğma, skor) hiçbir kademede değişmez.
+    """
+    TIERS = (
+        {"name": "low", "particles": 0.25, "stars": 0.4, "texts": 6, "trail": 4, "bloom": "off", "shake": 0.5},
+        {"name": "medium", "particles": 0.5, "stars": 0.7, "texts": 12, "trail": 7, "bloom": "low", "shake": 0.75},
+        {"name": "high", "particles": 1.0, "stars": 1.0, "texts": None, "trail": None, "bloom": "high", "shake": 1.0},
+    )
+    NAMES = tuple(t["name"] for t in TIERS)
+
+    def __init__(self, fps, quality="auto", percentile=0.9, window=120, interval=60,
+                 down_ratio=0.9, up_ratio=0.6, patience=3):
+        self.budget_ms = 1000.0 / fps
+        self.auto = quality == "auto"
+        self.level = len(self.TIERS) - 1 if self.auto else self.NAMES.index(quality)
+        self.percentile = percentile
+        self.samples = deque(maxlen=window)
+        self.interval = interval
+        self.down_ms = self.budget_ms * down_ratio
+        self.up_ms = self.budget_ms * up_ratio
+        self.patience = patience
+        self.good_evals = 0
+        self.frames = 0
+        self.last_ms = 0.0 # Son hesaplanan yüzdelik (teşhis için)
+        self.changes = 0
+
+    @property
+    def tier(self):
+        return self.TIERS[self.level]
+
+    def record(self, frame_ms):
+        """Bir karenin iş süresini ekler. Kademe değiştiyse True döner."""
+        if not self.auto: return False
+        self.samples.append(frame_ms)
+        self.frames += 1
+        if self.frames % self.interval or len(self.samples) < self.interval: return False
+
+        ordered = sorted(self.samples)
+        self.last_ms = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+        if self.last_ms > self.down_ms and self.level > 0:
+            return self._set_level(self.level - 1)
+        if self.last_ms < self.up_ms and self.level < len(self.TIERS) - 1:
+            self.good_evals += 1
+            if self.good_evals >= self.patience: return self._set_level(self.level + 1)
+        else:
+            self.good_evals = 0
+        return False
+
+    def _set_level(self, level):
+        self.level = level
+        self.samples.clear() # Yeni kademe taze ölçülür
+        self.good_evals = 0; self.changes += 1
+        return True
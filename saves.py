@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import threading
+
+
+class SaveWriter:
+    """Kayıt dosyalarını arka plan iş parçacığında, atomik olarak yazar.
+
+    Oyun döngüsü sadece submit(yol, veri) çağırır ve beklemez. Aynı dosyaya `window` saniye
+    içinde gelen istekler birleştirilir (son yazan kazanır): tuş atama ekranı veya market
+    alışverişi gibi art arda gelen kayıtlar diske tek yazım olarak iner. Her yazım önce
+    geçici dosyaya yapılır, fsync edilir, sonra os.replace ile yerine konur; yazım ortasında
+    çökme olsa bile slotta ya eski ya yeni kayıt kalır, yarım dosya kalmaz.
+
+    Henüz diske inmemiş kayıtlar load()/exists() ile okunabilir, böylece oyunun geri kalanı
+    kaydın ne zaman yazıldığını bilmek zorunda değildir.
+    """
+    def __init__(self, window=0.5):
+        self.window = window
+        self.pending = {} # yol -> (veri veya silme için None, ilk istek zamanı)
+        self.cond = threading.Condition()
+        self.running = True
+        self.busy = False # İşçi şu an bir grup yazıyor
+        self.errors = [] # poll() ile ana iş parçacığına iletilir
+        self.listeners = [] # Başarılı yazım/silme sonrası işçide çağrılır: f(yol, veri)
+        self.submitted = 0; self.written = 0; self.coalesced = 0
+        self.write_ms = 0.0 # Dosya başına yazma + fsync süresi (son)
+        self.latency_ms = 0.0; self.max_latency_ms = 0.0 # İlk istekten diske inişe kadar
+        self.thread = threading.Thread(target=self._worker, name="save-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data):
+        """Veri anlık görüntüsü (snapshot) olmalı: çağıran sonradan değiştirmemeli."""
+        with self.cond:
+            self.submitted += 1
+            old = self.pending.get(path)
+            if old is not None: self.coalesced += 1
+            self.pending[path] = (data, old[1] if old else time.perf_counter())
+            self.cond.notify()
+
+    def remove(self, path):
+        """Silme de sıraya girer; aynı dosya için bekleyen yazımı iptal eder."""
+        self.submit(path, None)
+
+    def load(self, path):
+        """Bekleyen kayıt varsa onu, yoksa diskteki dosyayı döner (dosya yoksa None)."""
+        with self.cond:
+            if path in self.pending:
+                data = self.pending[path][0]
+                return None if data is None else json.loads(json.dumps(data)) # Kopya: çağıran değiştirebilir
+        if not os.path.exists(path): return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def exists(self, path):
+        with self.cond:
+            if path in self.pending: return self.pending[path][0] is not None
+        return os.path.exists(path)
+
+    def poll(self):
+        """Biten yazımlardaki hataların listesi; beklemez."""
+        with self.cond:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def flush(self, timeout=5.0):
+        """Bekleyen her şeyi pencereyi beklemeden yazdırır (çıkışta çağrılır)."""
+        deadline = time.perf_counter() + timeout
+        with self.cond:
+            self.window = 0
+            self.cond.notify()
+            while (self.pending or self.busy) and time.perf_counter() < deadline:
+                self.cond.wait(0.05)
+
+    def close(self):
+        self.flush()
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=1)
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending: self.cond.wait()
+                if not self.pending: return
+                # Pencere dolana kadar bekle: bu sürede gelen istekler aynı yazıma birleşir
+                first = min(t for _, t in self.pending.values())
+                while self.running and self.window and time.perf_counter() - first < self.window:
+                    self.cond.wait(self.window - (time.perf_counter() - first))
+                batch, self.pending = self.pending, {}
+                self.busy = True
+            for path, (data, since) in batch.items():
+                try:
+                    start = time.perf_counter()
+                    if data is None:
+                        if os.path.exists(path): os.remove(path)
+                    else: self.write(path, data)
+                    end = time.perf_counter()
+                    self.write_ms = (end - start) * 1000
+                    self.latency_ms = (end - since) * 1000
+                    self.max_latency_ms = max(self.max_latency_ms, self.latency_ms)
+                    self.written += 1
+                    for listener in self.listeners: listener(path, data)
+                except Exception as e:
+                    with self.cond: self.errors.append((path, str(e)))
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+    @staticmethod
+    def write(path, data):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno()) # Veri diske inmeden yer değiştirme yapılmaz
+        os.replace(tmp, path) # Atomik: okuyan ya eski ya yeni dosyayı görür
+
+
+class SlotIndex:
+    """Slot menüsü için kayıt özetleri (skor, para, zaman, gemi, oynama süresi).
+
+    Özetler kayıt yolunda (SaveWriter) güncellenir ve küçük bir index dosyasında saklanır.
+    Her özet dosyanın (mtime, boyut) ikilisiyle doğrulanır: slot menüsü açılırken kayıt
+    dosyaları sadece stat edilir, tam JSON okuma yalnızca dosya bizim dışımızda
+    değiştiyse (veya index'te yoksa) yapılır.
+    """
+    def __init__(self, path, writer):
+        self.path = path
+        self.writer = writer
+        self.lock = threading.Lock() # Yazıcı iş parçacığı da günceller
+        self.entries = {} # dosya adı -> özet (+ "mtime", "size"; bekleyen kayıtta None)
+        self.requested = {} # dosya adı -> en son istenen veri (silmede None); written() eskisini tanır
+        self.parses = 0 # Index dışı tam okuma sayısı
+        try:
+            with open(path, "r") as f: self.entries = json.load(f)
+        except (OSError, ValueError): pass # Yok ya da bozuk: dosyalardan yeniden kurulur
+        writer.listeners.append(self.written)
+
+    @staticmethod
+    def summary(data):
+        return {
+            "score": data.get("score", 0), "cash": data.get("money", 0),
+            "timestamp": data.get("saved_at"), "ship": data.get("ship"),
+            "playtime": data.get("playtime", 0),
+        }
+
+    def record(self, path, data):
+        """Kayıt istendiği an (ana iş parçacığı): dosya henüz yazılmamış olsa da özet hazır."""
+        with self.lock:
+            self.requested[os.path.basename(path)] = data
+            # Silmede mezar taşı: dosya pencere dolana kadar diskte durur, get() onu yeniden okumamalı
+            if data is None: self.entries[os.path.basename(path)] = {"deleted": True, "mtime": None}
+            else: self.entries[os.path.basename(path)] = dict(self.summary(data), mtime=None, size=None)
+
+    def written(self, path, data):
+        """Yazıcı iş parçacığı: dosya diske indi, doğrulama damgasını ekle ve index'i kaydet."""
+        if path == self.path: return
+        key = os.path.basename(path)
+        with self.lock:
+            # Daha yeni bir kayıt/silme istendiyse bu (eski) yazım bekleyen özeti ezmesin
+            if key in self.requested and self.requested[key] is not data: return
+            self.requested.pop(key, None)
+            if data is None: self.entries.pop(key, None)
+            else:
+                st = os.stat(path)
+                self.entries[key] = dict(self.summary(data), mtime=st.st_mtime_ns, size=st.st_size)
+            snapshot = {k: dict(v) for k, v in self.entries.items() if v["mtime"] is not None}
+        self.writer.submit(self.path, snapshot)
+
+    def get(self, path):
+        """Dosyanın özeti; dosya yoksa None. Bozuk dosyada ValueError/OSError yükselir."""
+        key = os.path.basename(path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry["mtime"] is None: # Yazılmayı/silinmeyi bekliyor
+                return None if entry.get("deleted") else entry
+        try: st = os.stat(path)
+        except OSError:
+            with self.lock: self.entries.pop(key, None)
+            return None
+        if entry is not None and (entry["mtime"], entry["size"]) == (st.st_mtime_ns, st.st_size): return entry
+        # Dosya dışarıdan değişmiş ya da index'te yok: bir kez tam oku
+        self.parses += 1
+        with open(path, "r") as f: data = json.load(f)
+        entry = dict(self.summary(data), mtime=st.st_mtime_ns, size=st.st_size)
+        with self.lock: self.entries[key] = entry
+        return entry
+
+
+class EconomyJournal:
+    """Otomatik kaydın (autosave.json) üstüne eklenen, sadece sona yazılan ekonomi günlüğü.
+
+    Para kazanma, satın alma, tak/çıkar ve başarım açılması küçük JSON satırları olarak
+    tamponlu dosyaya eklenir ve `flush_interval` saniyede bir işletim sistemine bırakılır:
+    çökmede en fazla o kadarlık ilerleme kaybolur, tam kayıt maliyeti ödenmez. Her olayın
+    artan bir sıra numarası (seq) vardır; autosave kaydı hangi seq'e kadar olanları
+    içerdiğini "journal_seq" ile taşır. Yüklerken sadece daha yeni olaylar kayda uygulanır.
+
+    Günlük `compact_events` olaya ulaşınca oyun yeni bir autosave yazar (sıkıştırma); kayıt
+    diske indikten sonra günlük, içinde kalan daha yeni olaylarla yeniden başlatılır.
+    """
+    def __init__(self, path, writer, snapshot_path, flush_interval=1.0, compact_events=256):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.flush_interval = flush_interval
+        self.compact_events = compact_events
+        self.active = False # Sadece bir oyun sürerken kayıt tutulur
+        self.seq = 0
+        self.tail = [] # Son kalıcı kayıttan sonraki olaylar: (seq, satır)
+        self.durable_seq = 0 # Diske inmiş en yeni autosave'in içerdiği seq (yazıcı iş parçacığı günceller)
+        self.rotated_seq = 0
+        self.last_flush = time.perf_counter()
+        self.appended = 0
+        for event in self.read():
+            self.seq = event["seq"]; self.tail.append((event["seq"], json.dumps(event, separators=(",", ":"))))
+        self.file = open(path, "a")
+        writer.listeners.append(self.written)
+
+    def read(self):
+        """Günlükteki geçerli olaylar. Yarım kalmış (çökmede kesilmiş) son satırda durur."""
+        events = []
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try: events.append(json.loads(line))
+                    except ValueError: break
+        except OSError: pass
+        return events
+
+    def record(self, event, **fields):
+        if not self.active: return
+        self.seq += 1
+        line = json.dumps(dict(seq=self.seq, ev=event, **fields), separators=(",", ":"))
+        self.file.write(line + "\n") # Tamponlu: diske update() içinde toplu iner
+        self.tail.append((self.seq, line))
+        self.appended += 1
+
+    def needs_compaction(self):
+        return self.active and len(self.tail) >= self.compact_events
+
+    def written(self, path, data):
+        """Yazıcı iş parçacığı: autosave diske indi, içerdiği olaylar artık günlükte gereksiz."""
+        if path == self.snapshot_path and data is not None:
+            self.durable_seq = max(self.durable_seq, data.get("journal_seq", 0))
+
+    def update(self):
+        """Karede bir kez (ana iş parçacığı): aralıklı flush ve gerekiyorsa günlüğü yeniden başlatma."""
+        if self.durable_seq > self.rotated_seq: self.rotate()
+        now = time.perf_counter()
+        if now - self.last_flush >= self.flush_interval:
+            self.file.flush(); self.last_flush = now
+
+    def rotate(self):
+        durable = self.durable_seq
+        self.tail = [(s, line) for s, line in self.tail if s > durable]
+        self.file.close()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            # İlk satır seq'i taşır: günlük boşalsa bile numaralar geri sayılmaz
+            f.write(json.dumps({"seq": durable, "ev": "base"}, separators=(",", ":")) + "\n")
+            for _, line in self.tail: f.write(line + "\n")
+        os.replace(tmp, self.path)
+        self.file = open(self.path, "a")
+        self.rotated_seq = durable
+
+    def replay(self, data):
+        """Autosave verisinin üstüne ondan yeni olayları uygular (yerinde). Uygulanan olay sayısını döner."""
+        self.file.flush()
+        base = data.get("journal_seq", 0)
+        stats = data.setdefault("stats", {}); achievements = data.setdefault("achievements", [])
+        applied = 0
+        for event in self.read():
+            kind = event["ev"]
+            if event["seq"] <= base or kind == "base": continue
+            if "money" in event: data["money"] = event["money"]
+            if "score" in event: data["score"] = event["score"]
+            if kind in ("buy", "equip"): stats.update(event.get("stats", {}))
+            elif kind == "ach" and event["id"] not in achievements: achievements.append(event["id"])
+            applied += 1
+        return applied
+
+    def close(self):
+        self.file.close()
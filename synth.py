@@ -0,0 +1,133 @@
+# Patch tanımları NumPy olmadan da yapılabilir; sadece render için gerekir
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- BİLDİRİMSEL SENTEZ MOTORU ---
+# Bir ses "patch"i veri olarak tanımlanır: düğümler iç içe demetlerdir (tuple), bu yüzden
+# hash'lenebilirler. Aynı alt grafik (ör. aynı osilatör) birden fazla seste geçse bile
+# bir toplu render içinde tek kez hesaplanır. Her düğüm tüm örnekler üzerinde tek seferde
+# NumPy ile hesaplanır; örnek başına Python döngüsü yoktur.
+
+WAVES = ("sine", "square", "sawtooth", "triangle")
+
+def osc(wave, freq, freq_end=None):
+    """Osilatör. freq_end verilirse frekans ses boyunca doğrusal kayar (pitch slide)."""
+    return ("osc", wave, float(freq), float(freq if freq_end is None else freq_end))
+
+def noise(seed=0):
+    """Beyaz gürültü (-1..1). Tohum sabit: aynı patch her zaman aynı sesi üretir (önbellek için)."""
+    return ("noise", seed)
+
+def mix(*parts):
+    """Kaynakların toplamı. Her parça bir düğüm ya da (düğüm, kazanç) çiftidir."""
+    return ("mix",) + tuple(p if isinstance(p[0], tuple) else (p, 1.0) for p in parts)
+
+def decay(node, curve="linear", rate=5.0):
+    """Zarf: linear -> 1'den 0'a doğrusal, exp -> exp(-rate * t/T)."""
+    return ("decay", node, curve, float(rate))
+
+def adsr(node, attack, decay_time, sustain, release):
+    """ADSR zarfı (süreler saniye, sustain 0..1). Sustain, ses süresinden release çıkınca biter."""
+    return ("adsr", node, float(attack), float(decay_time), float(sustain), float(release))
+
+def lowpass(node, cutoff):
+    """Pencereli sinc FIR alçak geçiren filtre (np.convolve ile vektörel)."""
+    return ("lowpass", node, float(cutoff))
+
+def gain(node, amount):
+    return ("gain", node, float(amount))
+
+def patch(node, duration, level=0.3):
+    """Çalınabilir ses: grafik + süre + çıkış seviyesi (int16 tam ölçeğe oranı)."""
+    return ("patch", node, float(duration), float(level))
+
+def tone(wave, freq, duration, slide=0, level=0.3):
+    """Oyundaki klasik kısa efekt: kayan osilatör + doğrusal sönüm."""
+    return patch(decay(osc(wave, freq, freq + slide)), duration, level)
+
+
+class PatchRenderer:
+    """Bir örnekleme hızında patch'leri render eder; alt grafik sonuçlarını paylaşır."""
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.memo = {}
+        self.nodes_rendered = 0
+
+    def render(self, node, n):
+        key = (node, n)
+        out = self.memo.get(key)
+        if out is None:
+            out = self.memo[key] = getattr(self, "_" + node[0])(node, n)
+            out.setflags(write=False) # Paylaşılan sonuç yanlışlıkla değiştirilmesin
+            self.nodes_rendered += 1
+        return out
+
+    def _osc(self, node, n):
+        _, wave, f0, f1 = node
+        sr = self.sample_rate
+        # Faz (tur cinsinden) float64 biriktirilir, kesir kısmı float32'ye iner:
+        # dalga fonksiyonları yarı bellekle ve belirgin şekilde daha hızlı çalışır
+        cycles = np.cumsum(np.linspace(f0 / sr, f1 / sr, n)) if f0 != f1 else np.arange(1, n + 1) * (f0 / sr)
+        cycles -= np.floor(cycles)
+        frac = cycles.astype(np.float32)
+        if wave == "sine": return np.sin(np.float32(2 * np.pi) * frac)
+        if wave == "square": return np.where(frac < 0.5, np.float32(1), np.float32(-1))
+        if wave == "sawtooth": return 2 * frac - 2 * (frac >= 0.5) # 2*(c - floor(0.5 + c))
+        if wave == "triangle": return np.abs(4 * frac - 2) - 1
+        raise ValueError(f"Bilinmeyen dalga: {wave}")
+
+    def _noise(self, node, n):
+        return np.random.default_rng(node[1]).uniform(-1, 1, n).astype(np.float32)
+
+    def _mix(self, node, n):
+        out = np.zeros(n, dtype=np.float32)
+        for part, amount in node[1:]: out += self.render(part, n) * np.float32(amount)
+        return out
+
+    def _decay(self, node, n):
+        _, src, curve, rate = node
+        env = self.envelope(curve, rate, n)
+        return self.render(src, n) * env
+
+    def envelope(self, curve, rate, n):
+        """Zarflar da paylaşılır: aynı uzunluktaki sesler aynı zarf dizisini kullanır."""
+        key = ("env", curve, rate, n)
+        env = self.memo.get(key)
+        if env is None:
+            env = np.linspace(1, 0, n, dtype=np.float32) if curve == "linear" else np.exp(-np.linspace(0, rate, n, dtype=np.float32))
+            self.memo[key] = env
+        return env
+
+    def _adsr(self, node, n):
+        _, src, a, d, s, r = node
+        sr = self.sample_rate
+        na, nd, nr = int(a * sr), int(d * sr), int(r * sr)
+        ns = max(0, n - na - nd - nr)
+        env = np.concatenate((np.linspace(0, 1, na, False), np.linspace(1, s, nd, False),
+                              np.full(ns, s), np.linspace(s, 0, nr))).astype(np.float32)
+        env = np.pad(env[:n], (0, max(0, n - len(env))))
+        return self.render(src, n) * env
+
+    def _lowpass(self, node, n):
+        _, src, cutoff = node
+        fc = min(cutoff / self.sample_rate, 0.5)
+        taps = np.arange(-32, 33)
+        kernel = np.sinc(2 * fc * taps) * np.hamming(len(taps))
+        kernel /= kernel.sum()
+        return np.convolve(self.render(src, n), kernel.astype(np.float32), mode="same")
+
+    def _gain(self, node, n):
+        return self.render(node[1], n) * np.float32(node[2])
+
+    def patch(self, p):
+        """Patch -> int16 mono PCM."""
+        _, node, duration, level = p
+        n = int(self.sample_rate * duration)
+        return (self.render(node, n) * np.float32(32767 * level)).astype(np.int16)
+
+def render_batch(patches, sample_rate):
+    """{isim: patch} -> {isim: int16 dizi}. Tüm patch'ler tek Renderer'ı (ve önbelleği) paylaşır."""
+    r = PatchRenderer(sample_rate)
+    return {name: r.patch(p) for name, p in patches.items()}
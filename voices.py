@@ -0,0 +1,100 @@
+import math
+import pygame
+
+# Ses önceliği (yüksek = önemli). Listede olmayan sesler DEFAULT_PRIORITY alır.
+PRIORITIES = {
+    "shield_hit": 100, "ulti": 100,
+    "select": 80, "error": 80, "intro": 80,
+    "powerup": 70, "shield_get": 70,
+    "explosion": 60,
+    "crit": 50, "combo": 50, "dash": 50,
+    "coin": 40,
+    "boss_hit": 30, "sniper": 30, "missile": 25,
+    "laser": 20, "hover": 20,
+    "enemy_shoot": 15, "drone": 10,
+}
+DEFAULT_PRIORITY = 30
+
+# Aynı anda en fazla kaç kopyası çalabilir (listede yoksa DEFAULT_LIMIT)
+LIMITS = {"laser": 3, "enemy_shoot": 3, "explosion": 4, "boss_hit": 2, "coin": 2, "drone": 2, "hover": 1}
+DEFAULT_LIMIT = 2
+
+# Ayrılmış kanallar: kritik uyarılar genel havuz dolu olsa bile hiç düşmez; "music" müziğin kanalı
+RESERVED = ("shield_hit", "ulti", "music")
+
+
+class VoiceManager:
+    """Çalma isteklerini kare boyunca toplar, karenin sonunda tek seferde kanallara dağıtır.
+
+    - Aynı karede aynı ses birden fazla istenirse bir kez çalınır (ör. boss mermi yağmuru).
+    - Ses başına ve toplam ses (kanal) sınırı vardır; sınır dolunca o sesin en eski kopyası
+      yeniden başlatılır.
+    - Genel havuz doluysa daha düşük (veya eşit) öncelikli en eski ses çalınır (voice stealing),
+      yoksa istek düşürülür.
+    - RESERVED sesler kendi kanallarında çalar, asla düşmez.
+    - pan (-1 sol .. 1 sağ) verilirse kanal sesi Channel.set_volume(sol, sağ) ile konumlanır.
+    """
+    def __init__(self, channels=16, reserved=RESERVED, priorities=PRIORITIES, limits=LIMITS):
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(len(reserved)) # Sound.play()'in otomatik kanal seçimi bunlara dokunmaz
+        self.reserved = {name: pygame.mixer.Channel(i) for i, name in enumerate(reserved)}
+        self.pool = [pygame.mixer.Channel(i) for i in range(len(reserved), channels)]
+        self.priorities = priorities
+        self.limits = limits
+        self.pending = {} # isim -> (Sound, pan) (bu karenin istekleri)
+        self.voices = {} # havuz kanal indeksi -> (isim, öncelik, başlama sırası)
+        self.serial = 0
+        self.played = 0; self.deduped = 0; self.stolen = 0; self.dropped = 0
+
+    def request(self, name, sound, pan=None):
+        if name in self.pending: self.deduped += 1
+        else: self.pending[name] = (sound, pan)
+
+    def priority(self, name):
+        return self.priorities.get(name, DEFAULT_PRIORITY)
+
+    def update(self):
+        """Karede bir kez: bekleyen istekleri öncelik sırasıyla çalar."""
+        if not self.pending: return
+        requests = sorted(self.pending.items(), key=lambda item: -self.priority(item[0]))
+        self.pending = {}
+
+        # Bitmiş sesleri unut
+        self.voices = {i: v for i, v in self.voices.items() if self.pool[i].get_busy()}
+
+        for name, (sound, pan) in requests:
+            channel = self.reserved.get(name)
+            if channel is not None:
+                self.start(channel, sound, pan)
+                continue
+            index = self.pick_channel(name)
+            if index is None:
+                self.dropped += 1
+                continue
+            self.serial += 1
+            self.voices[index] = (name, self.priority(name), self.serial)
+            self.start(self.pool[index], sound, pan)
+
+    def start(self, channel, sound, pan):
+        channel.play(sound); self.played += 1
+        # Kanal ses ayarı kalıcıdır: pan'sız seste de sıfırlanmalı
+        if pan is None: channel.set_volume(1.0)
+        else:
+            angle = (max(-1.0, min(1.0, pan)) + 1) * math.pi / 4 # Sabit güç (constant power) pan
+            channel.set_volume(math.cos(angle), math.sin(angle))
+
+    def pick_channel(self, name):
+        same = [(serial, i) for i, (n, _, serial) in self.voices.items() if n == name]
+        if len(same) >= self.limits.get(name, DEFAULT_LIMIT):
+            return min(same)[1] # Ses başı sınır: en eski kopyayı yeniden başlat
+
+        for i in range(len(self.pool)):
+            if i not in self.voices: return i
+
+        # Havuz dolu: önceliği en düşük (eşitse en eski) sesi çal, ama daha önemli olanı değil
+        prio = self.priority(name)
+        victim = min(((p, serial, i) for i, (_, p, serial) in self.voices.items()), default=None)
+        if victim is not None and victim[0] <= prio:
+            self.stolen += 1
+            return victim[2]
+        return None